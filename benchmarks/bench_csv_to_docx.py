@@ -0,0 +1,65 @@
+"""
+Benchmark de regressão CSV → DOCX: tabela célula a célula com python-docx
+(antigo) vs XML montado em lote (src.utils.docx_table), em 1k, 10k e 100k linhas.
+
+O caminho antigo fica de fora acima de --legacy-max linhas, pois leva minutos.
+
+Uso:
+  python -m benchmarks.bench_csv_to_docx
+  python -m benchmarks.bench_csv_to_docx --sizes 1000 10000 --legacy-max 10000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from docx import Document
+
+from benchmarks.bench_utils import print_table, workdir
+from src.utils.docx_table import dataframe_to_docx
+
+
+def legacy_table(df, output_path):
+    """Implementação anterior do csv_to_docx, a partir do DataFrame."""
+    doc = Document()
+    table = doc.add_table(rows=1, cols=len(df.columns))
+    for i, col in enumerate(df.columns): table.cell(0,i).text = col
+    for row in df.itertuples(index=False):
+        cells = table.add_row().cells
+        for i, val in enumerate(row): cells[i].text = str(val)
+    doc.save(output_path)
+
+
+def make_frame(rows, cols=6):
+    rnd = np.random.default_rng(42)
+    return pd.DataFrame({
+        f"col_{c}": (rnd.integers(0, 100000, rows) if c % 2 else [f"texto {i} & <x>" for i in rnd.integers(0, 999, rows)])
+        for c in range(cols)
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=10000, help="maior tamanho medido no caminho antigo")
+    args = parser.parse_args(argv)
+
+    base = workdir("csv_to_docx")
+    results = []
+    for rows in args.sizes:
+        df = make_frame(rows)
+        variants = [("lote XML", dataframe_to_docx)]
+        if rows <= args.legacy_max:
+            variants.insert(0, ("célula a célula (antigo)", legacy_table))
+        for name, func in variants:
+            started = time.perf_counter()
+            func(df, os.path.join(base, f"saida_{rows}_{func.__name__}.docx"))
+            secs = time.perf_counter() - started
+            results.append((rows, name, f"{secs:.2f}", f"{rows / secs:,.0f}"))
+
+    print_table(["linhas", "variante", "tempo (s)", "linhas/s"], results)
+
+
+if __name__ == "__main__":
+    main()
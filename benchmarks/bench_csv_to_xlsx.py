@@ -0,0 +1,51 @@
+"""
+Benchmark CSV → XLSX: caminho pandas (atual) vs streaming write-only.
+
+Cada variante roda num processo novo; mede tempo de parede e pico de RSS.
+
+Uso:
+  python -m benchmarks.bench_csv_to_xlsx --rows 200000 --cols 10
+"""
+import argparse
+import csv
+import os
+import random
+
+from benchmarks.bench_utils import print_table, run_isolated, workdir
+from src.utils.file_converters import csv_to_xlsx_pandas
+from src.utils.xlsx_streaming import csv_to_xlsx_streaming
+
+
+def make_csv(path, rows, cols):
+    rnd = random.Random(42)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow([f"col_{c}" for c in range(cols)])
+        for r in range(rows):
+            w.writerow([r if c == 0 else (rnd.random() * 1000 if c % 2 else f"texto {rnd.randint(0, 99999)}")
+                        for c in range(cols)])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--cols", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    base = workdir("csv_to_xlsx")
+    src = os.path.join(base, f"entrada_{args.rows}x{args.cols}.csv")
+    if not os.path.exists(src):
+        make_csv(src, args.rows, args.cols)
+
+    results = []
+    for name, func in [("pandas (atual)", csv_to_xlsx_pandas), ("streaming", csv_to_xlsx_streaming)]:
+        out = os.path.join(base, f"saida_{name.split()[0]}.xlsx")
+        secs, peak, _ = run_isolated(func, src, out)
+        results.append((name, f"{secs:.2f}", f"{peak:.0f}", f"{args.rows / secs:.0f}"))
+
+    print(f"CSV → XLSX: {args.rows} linhas x {args.cols} colunas")
+    print_table(["variante", "tempo (s)", "pico RSS (MB)", "linhas/s"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Utilitários comuns dos benchmarks: execução isolada em processo novo
+(para medir pico de memória sem contaminação) e impressão de tabelas.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+
+def peak_rss_mb():
+    """Pico de memória residente do processo atual, em MB."""
+    if sys.platform == "win32":
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 1024 ** 2
+        except ImportError:
+            return float("nan")
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux devolve KB; macOS devolve bytes
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(func, args, kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - started, peak_rss_mb(), result
+
+
+def run_isolated(func, *args, **kwargs):
+    """Executa func num processo novo e devolve (segundos, pico_rss_mb, resultado)."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(_measure, func, args, kwargs).result()
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
+
+
+def workdir(name):
+    path = os.path.join(os.getcwd(), "bench_tmp", name)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,72 @@
+"""
+Benchmark da latência de início dos scripts: processo novo por execução
+(runner.run, como o orquestrador fazia) vs pool de processos aquecidos
+(src.app.warm_pool), com as mesmas dependências pesadas.
+
+O script de teste só importa os módulos e imprime uma linha, então o tempo
+medido é praticamente só o custo de subir o Python e importar. Módulos
+não instalados são ignorados.
+
+Uso:
+  python -m benchmarks.bench_warm_pool
+  python -m benchmarks.bench_warm_pool --runs 20 --modules pandas docx openpyxl
+"""
+import argparse
+import importlib.util
+import os
+import statistics
+import time
+
+from benchmarks.bench_utils import print_table, workdir
+from src.app import runner
+from src.app.warm_pool import DEFAULT_MODULES, WarmPool
+
+
+def make_script(base, modules):
+    path = os.path.join(base, "script_teste.py")
+    with open(path, "w", encoding="utf-8") as f:
+        for name in modules:
+            f.write(f"import {name}\n")
+        f.write("import sys\nprint('ok', sys.argv[1:])\n")
+    return path
+
+
+def measure(run, path, runs):
+    times = []
+    for i in range(runs):
+        started = time.perf_counter()
+        result = run(path, [str(i)])
+        times.append(time.perf_counter() - started)
+        assert result.returncode == 0, f"falhou com código {result.returncode}"
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--modules", nargs="*", default=DEFAULT_MODULES)
+    args = parser.parse_args(argv)
+    modules = [m for m in args.modules if importlib.util.find_spec(m) is not None]
+    path = make_script(workdir("warm_pool"), modules)
+
+    started = time.perf_counter()
+    pool = WarmPool(size=1, modules=modules, max_jobs=args.runs + 1).start(wait=True)
+    warmup = time.perf_counter() - started
+    try:
+        results = {
+            "processo novo": measure(lambda p, a: runner.run(p, a), path, args.runs),
+            "pool aquecido": measure(lambda p, a: pool.run(p, a), path, args.runs),
+        }
+    finally:
+        pool.close()
+
+    cold = statistics.median(results["processo novo"])
+    rows = [(name, f"{statistics.median(t) * 1000:.1f}", f"{min(t) * 1000:.1f}", f"{max(t) * 1000:.1f}",
+             f"{cold / statistics.median(t):.1f}x") for name, t in results.items()]
+    print(f"Módulos: {', '.join(modules) or '(nenhum)'}; {args.runs} execuções; "
+          f"aquecimento do pool: {warmup:.2f}s (uma vez)")
+    print_table(["modo", "mediana (ms)", "mín (ms)", "máx (ms)", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
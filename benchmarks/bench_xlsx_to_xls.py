@@ -0,0 +1,68 @@
+"""
+Benchmark da gravação XLS: loop célula a célula com ws.write (antigo) vs
+gravação em lote por coluna (src.utils.xls_writer). Mede células/s só da
+etapa de gravação, com o mesmo DataFrame nas duas variantes.
+
+Uso:
+  python -m benchmarks.bench_xlsx_to_xls --rows 60000 --cols 10
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import xlwt
+
+from benchmarks.bench_utils import print_table, workdir
+from src.utils.xls_writer import write_dataframe_xls
+
+
+def write_cell_loop(df, output_path):
+    """Implementação anterior do xlsx_to_xls (sem cabeçalho nem divisão de abas)."""
+    wb = xlwt.Workbook(); ws = wb.add_sheet('Sheet1')
+    for r, row in enumerate(df.values):
+        for c, val in enumerate(row): ws.write(r, c, val)
+    wb.save(output_path)
+
+
+def make_frame(rows, cols):
+    rnd = np.random.default_rng(42)
+    data = {}
+    for c in range(cols):
+        kind = c % 4
+        if kind == 0: data[f"int_{c}"] = rnd.integers(0, 1_000_000, rows)
+        elif kind == 1: data[f"float_{c}"] = rnd.random(rows) * 1000
+        elif kind == 2: data[f"texto_{c}"] = [f"valor {i}" for i in rnd.integers(0, 5000, rows)]
+        else: data[f"data_{c}"] = pd.Timestamp("2024-01-01") + pd.to_timedelta(rnd.integers(0, 365, rows), unit="D")
+    return pd.DataFrame(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=60000)
+    parser.add_argument("--cols", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    base = workdir("xlsx_to_xls")
+    df = make_frame(args.rows, args.cols)
+    cells = args.rows * args.cols
+    results = []
+    variants = [("ws.write por célula (antigo)", write_cell_loop), ("lote por coluna", write_dataframe_xls)]
+    for i, (name, func) in enumerate(variants):
+        # o loop antigo não divide abas; limita a entrada ao que cabe numa aba
+        frame = df.iloc[:65535] if func is write_cell_loop else df
+        started = time.perf_counter()
+        try:
+            func(frame, os.path.join(base, f"saida_{i}.xls"))
+        except Exception as e:
+            results.append((name, "-", f"falhou: {e}")); continue
+        secs = time.perf_counter() - started
+        results.append((name, f"{secs:.2f}", f"{len(frame) * args.cols / secs:,.0f}"))
+
+    print(f"XLS: {args.rows} linhas x {args.cols} colunas ({cells:,} células)")
+    print_table(["variante", "tempo (s)", "células/s"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark da compactação ZIP: zipfile sequencial (antigo) vs compactação
+paralela (src.utils.parallel_zip) com 1, 2, 4, ... threads, em MB/s.
+
+Gera uma pasta sintética com arquivos de texto (compressíveis), binários
+aleatórios (incompressíveis) e alguns arquivos grandes, divididos em blocos.
+Cada ZIP gerado é validado com zipfile.testzip().
+
+Uso:
+  python -m benchmarks.bench_zip_parallel
+  python -m benchmarks.bench_zip_parallel --total-mb 1024 --workers 1 4 8 16
+"""
+import argparse
+import os
+import random
+import time
+import zipfile
+
+from benchmarks.bench_utils import print_table, workdir
+from src.utils.parallel_zip import compress_folder
+
+WORDS = [b"cliente", b"contrato", b"margem", b"consulta", b"2024", b"PI", b"valor", b"\n"]
+
+
+def make_tree(base, total_mb, seed=42):
+    """Cria (uma vez) a árvore sintética: 60% texto, 25% binário, 15% em 2 arquivos grandes."""
+    marker = os.path.join(base, f".pronto_{total_mb}")
+    src = os.path.join(base, "origem")
+    if os.path.exists(marker):
+        return src
+    rnd = random.Random(seed)
+    total = total_mb * 1024 ** 2
+    plan = [("texto", 0.60, 256 * 1024), ("binario", 0.25, 1024 * 1024), ("grandes", 0.15, total * 0.075)]
+    for folder, share, avg in plan:
+        os.makedirs(os.path.join(src, folder), exist_ok=True)
+        remaining, i = int(total * share), 0
+        while remaining > 0:
+            size = min(remaining, max(1, int(rnd.uniform(0.5, 1.5) * avg)))
+            with open(os.path.join(src, folder, f"arq_{i:05d}.dat"), "wb") as f:
+                if folder == "binario":
+                    f.write(os.urandom(size))
+                else:
+                    line = b" ".join(rnd.choice(WORDS) for _ in range(4096))
+                    for _ in range(size // len(line)): f.write(line)
+                    f.write(line[: size % len(line)])
+            remaining -= size; i += 1
+    open(marker, "w").close()
+    return src
+
+
+def legacy_zip(folder, out):
+    """Implementação anterior do CompactadorDeArquivos."""
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        for root, dirs, files in os.walk(folder):
+            for file in files:
+                abs_path = os.path.join(root, file)
+                zf.write(abs_path, os.path.relpath(abs_path, folder))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--total-mb", type=int, default=256, help="tamanho da pasta sintética")
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="padrão: 1, 2, 4... até cpu_count")
+    args = parser.parse_args(argv)
+    cpus = os.cpu_count() or 1
+    counts = args.workers or sorted({1, *(2 ** i for i in range(1, cpus.bit_length())), cpus})
+
+    base = workdir("zip_parallel")
+    src = make_tree(base, args.total_mb)
+    size_mb = sum(os.path.getsize(os.path.join(r, f)) for r, _, fs in os.walk(src) for f in fs) / 1024 ** 2
+    out = os.path.join(base, "saida.zip")
+
+    results = []
+    variants = [("zipfile (antigo)", lambda: legacy_zip(src, out))]
+    variants += [(f"paralelo x{n}", lambda n=n: compress_folder(src, out, workers=n)) for n in counts]
+    base_secs = None
+    for name, func in variants:
+        started = time.perf_counter()
+        func()
+        secs = time.perf_counter() - started
+        with zipfile.ZipFile(out) as zf:
+            assert zf.testzip() is None, f"{name}: ZIP inválido"
+        base_secs = base_secs or secs
+        results.append((name, f"{secs:.2f}", f"{size_mb / secs:.1f}", f"{base_secs / secs:.2f}x",
+                        f"{os.path.getsize(out) / 1024 ** 2:.1f}"))
+
+    print(f"Pasta: {size_mb:.0f} MB, {cpus} CPUs")
+    print_table(["variante", "tempo (s)", "MB/s", "speedup", "zip (MB)"], results)
+
+
+if __name__ == "__main__":
+    main()
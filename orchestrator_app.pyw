@@ -3,19 +3,33 @@
 # pip install customtkinter
 
 import os
-import subprocess
-import threading
-import json
+import sys
+import logging
+import time
 import customtkinter as ctk
-from tkinter import messagebox, filedialog
+from tkinter import messagebox, filedialog, ttk
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from src.app import registry
+from src.app.jobs import JobManager, RUNNING
+from src.app.log_pipeline import LogPipeline
+from src.app.metrics import DEFAULT_DB as METRICS_DB, MetricsStore
+from src.app.warm_pool import WarmPool
+from src.core.logger import setup_logging
+from src.utils.sizes import format_size
 
 # Tema Dark Mode com verde de destaque
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("green")
 
 VALID_CREDENTIALS = {"Renan": "senha"}
-SCRIPTS_DIR = os.path.join(os.getcwd(), "scripts")
-CONFIG_FILE = os.path.join(os.getcwd(), "scripts_config.json")
+# mesmas pastas/config do CLI e do agendador (registry.BASE_DIR), de onde quer que a GUI seja aberta
+LOG_DIR = os.path.join(registry.BASE_DIR, "logs")
+JOB_LOG_DIR = os.path.join(LOG_DIR, "execucoes")
+MAX_LOG_LINES = 5000   # linhas mantidas na tela e na memória por execução; o arquivo tem tudo
+LOG_POLL_MS = 50
+
+log = logging.getLogger("orquestrador")
 
 class LoginWindow(ctk.CTk):
     def __init__(self):
@@ -60,14 +74,33 @@ class MainApp(ctk.CTk):
         self.grid_columnconfigure(0, weight=1)
 
         # carrega config
-        self.config = self._load_config()
+        self.config = registry.load_config()
+
+        # fila de execuções: limites global e por script vêm do scripts_config.json
+        self.logs = LogPipeline()
+        self.metrics = MetricsStore(METRICS_DB)
+        # com "warm_pool": {"enabled": true} no config, os scripts rodam em processos já aquecidos
+        self.warm_pool = WarmPool.from_config(self.config)
+        if self.warm_pool: self.warm_pool.start()
+        self.jobs = JobManager.from_config(self.config, on_event=self.logs.publish, log_dir=JOB_LOG_DIR,
+                                           cwd=registry.BASE_DIR, buffer_lines=MAX_LOG_LINES, metrics=self.metrics, backend=self.warm_pool)
+        self.current_job = None
+        self.job_choices = {}
+        self._history_dirty = False
 
         # tabview responsiva
-        tabview = ctk.CTkTabview(self)
+        tabview = ctk.CTkTabview(self, command=self._on_tab_change)
         tabview.grid(row=0, column=0, sticky="nsew", padx=20, pady=20)
-        tabview.add("Scripts"); tabview.add("Logs")
+        tabview.add("Scripts"); tabview.add("Execuções"); tabview.add("Logs"); tabview.add("Histórico")
+        self.tabview = tabview
         scripts_tab = tabview.tab("Scripts")
+        jobs_tab = tabview.tab("Execuções")
         logs_tab = tabview.tab("Logs")
+        history_tab = tabview.tab("Histórico")
+        history_tab.grid_rowconfigure(1, weight=1)
+        history_tab.grid_columnconfigure(0, weight=1)
+        jobs_tab.grid_rowconfigure(1, weight=1)
+        jobs_tab.grid_columnconfigure(0, weight=1)
         scripts_tab.grid_rowconfigure(1, weight=1);
         scripts_tab.grid_columnconfigure(0, weight=1)
         logs_tab.grid_rowconfigure(1, weight=1);
@@ -84,25 +117,64 @@ class MainApp(ctk.CTk):
         ctk.CTkButton(btn_bar, text="➖ Remover", fg_color="#e74c3c", hover_color="#c0392b", command=self.remove_script).grid(row=0, column=1, padx=5, pady=5, sticky="ew")
         ctk.CTkButton(btn_bar, text="🔄 Atualizar", fg_color="#3498db", hover_color="#2980b9", command=self.load_scripts).grid(row=0, column=2, padx=5, pady=5, sticky="ew")
 
+        # Execuções tab
+        ctk.CTkLabel(jobs_tab, text="Execuções", font=ctk.CTkFont(size=18, weight="bold")).grid(row=0, column=0, pady=(0,10))
+        style = ttk.Style(self); style.theme_use("default")
+        style.configure("Jobs.Treeview", background="#1e1e1e", fieldbackground="#1e1e1e", foreground="white", rowheight=24)
+        style.configure("Jobs.Treeview.Heading", background="#2c3e50", foreground="white")
+        columns = ("script", "status", "inicio", "duracao", "codigo")
+        self.jobs_tree = ttk.Treeview(jobs_tab, columns=columns, style="Jobs.Treeview", selectmode="browse")
+        for col, text, width in (("#0", "#", 50), ("script", "Script", 260), ("status", "Status", 120),
+                                 ("inicio", "Início", 90), ("duracao", "Duração", 90), ("codigo", "Código", 70)):
+            self.jobs_tree.heading(col, text=text)
+            self.jobs_tree.column(col, width=width, stretch=(col == "script"))
+        self.jobs_tree.grid(row=1, column=0, sticky="nsew")
+        self.jobs_tree.bind("<Double-1>", lambda e: self.view_selected_log())
+        jobs_bar = ctk.CTkFrame(jobs_tab, fg_color="#1e1e1e")
+        jobs_bar.grid(row=2, column=0, pady=10, sticky="ew")
+        jobs_bar.grid_columnconfigure((0,1,2), weight=1)
+        ctk.CTkButton(jobs_bar, text="⛔ Cancelar", fg_color="#e74c3c", hover_color="#c0392b", command=self.cancel_selected).grid(row=0, column=0, padx=5, pady=5, sticky="ew")
+        ctk.CTkButton(jobs_bar, text="📄 Ver Log", fg_color="#3498db", hover_color="#2980b9", command=self.view_selected_log).grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        ctk.CTkButton(jobs_bar, text="🧹 Limpar Finalizadas", fg_color="#7f8c8d", hover_color="#636e72", command=self.clear_finished).grid(row=0, column=2, padx=5, pady=5, sticky="ew")
+
         # Logs tab
-        ctk.CTkLabel(logs_tab, text="Log de Execução", font=ctk.CTkFont(size=18, weight="bold")).grid(row=0, column=0, pady=(0,10))
+        log_header = ctk.CTkFrame(logs_tab, fg_color="transparent")
+        log_header.grid(row=0, column=0, pady=(0,10), sticky="ew")
+        log_header.grid_columnconfigure(0, weight=1)
+        ctk.CTkLabel(log_header, text="Log de Execução", font=ctk.CTkFont(size=18, weight="bold")).grid(row=0, column=0)
+        self.job_selector = ctk.CTkOptionMenu(log_header, values=["(nenhuma execução)"], width=260,
+                                              command=lambda choice: self.show_job(self.job_choices.get(choice)))
+        self.job_selector.grid(row=0, column=1, sticky="e")
         self.log_text = ctk.CTkTextbox(logs_tab, state="disabled", wrap="word")
         self.log_text.grid(row=1, column=0, sticky="nsew")
+
+        # Histórico tab: uma linha por script, a partir do registro de métricas
+        ctk.CTkLabel(history_tab, text="Histórico por Script", font=ctk.CTkFont(size=18, weight="bold")).grid(row=0, column=0, pady=(0,10))
+        columns = ("execucoes", "falhas", "p50", "p95", "memoria", "cpu", "ultima")
+        self.history_tree = ttk.Treeview(history_tab, columns=columns, style="Jobs.Treeview", selectmode="browse")
+        for col, text, width in (("#0", "Script", 240), ("execucoes", "Execuções", 80), ("falhas", "Falhas", 70),
+                                 ("p50", "Duração p50", 100), ("p95", "Duração p95", 100), ("memoria", "Pico de memória", 120),
+                                 ("cpu", "CPU média", 90), ("ultima", "Última", 130)):
+            self.history_tree.heading(col, text=text)
+            self.history_tree.column(col, width=width, stretch=(col == "#0"))
+        self.history_tree.grid(row=1, column=0, sticky="nsew")
+        history_bar = ctk.CTkFrame(history_tab, fg_color="#1e1e1e")
+        history_bar.grid(row=2, column=0, pady=10, sticky="ew")
+        history_bar.grid_columnconfigure((0,1,2), weight=1)
+        ctk.CTkButton(history_bar, text="🔄 Atualizar", fg_color="#3498db", hover_color="#2980b9", command=self.load_history).grid(row=0, column=0, padx=5, pady=5, sticky="ew")
+        ctk.CTkButton(history_bar, text="📊 Exportar CSV", fg_color="#2ecc71", hover_color="#27ae60", command=self.export_history_csv).grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        ctk.CTkButton(history_bar, text="📈 Exportar Prometheus", fg_color="#7f8c8d", hover_color="#636e72", command=self.export_history_prometheus).grid(row=0, column=2, padx=5, pady=5, sticky="ew")
         ctk.CTkButton(logs_tab, text="🗑 Limpar Log", fg_color="#e67e22", hover_color="#d35400", command=self.clear_log).grid(row=2, column=0, pady=10, sticky="e")
 
         self.load_scripts()
-
-    def _load_config(self):
-        try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {"manual_scripts": []}
+        self.load_history()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(1000, self._tick)
+        self.after(LOG_POLL_MS, self._drain_logs)
 
     def _save_config(self):
         try:
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2)
+            registry.save_config(self.config)
         except Exception as e:
             messagebox.showerror("Erro", f"Falha ao salvar config: {e}")
 
@@ -114,7 +186,7 @@ class MainApp(ctk.CTk):
 
     def remove_script(self):
         # escolhe manualmente o script para remover
-        path = filedialog.askopenfilename(title="Remover Script Python", initialdir=os.getcwd(), filetypes=[("Python Files", "*.py")])
+        path = filedialog.askopenfilename(title="Remover Script Python", initialdir=registry.BASE_DIR, filetypes=[("Python Files", "*.py")])
         if path:
             if path in self.config.get("manual_scripts", []):
                 self.config["manual_scripts"].remove(path)
@@ -124,13 +196,7 @@ class MainApp(ctk.CTk):
 
     def load_scripts(self):
         for w in self.scripts_frame.winfo_children(): w.destroy()
-        entries = []
-        if os.path.isdir(SCRIPTS_DIR):
-            for f in sorted(os.listdir(SCRIPTS_DIR)):
-                if f.endswith('.py'):
-                    entries.append((f, os.path.join(SCRIPTS_DIR, f)))
-        for p in self.config.get("manual_scripts", []):
-            if os.path.isfile(p): entries.append((os.path.basename(p), p))
+        entries = registry.discover_scripts(registry.SCRIPTS_DIR, self.config)
         if not entries:
             ctk.CTkLabel(self.scripts_frame, text="Nenhum módulo disponível.").pack(pady=20)
             return
@@ -143,22 +209,162 @@ class MainApp(ctk.CTk):
 
     def run_script(self, path, label):
         if not messagebox.askyesno("Confirmação", f"Executar '{label}'?" ): return
-        self.clear_log(); threading.Thread(target=self._exec_thread, args=(path, label), daemon=True).start()
+        job = self.jobs.submit(path, label)
+        self.show_job(job.id)
+
+    # eventos do JobManager chegam das threads de execução pela LogPipeline;
+    # a tela só é tocada aqui, em lotes, na thread da GUI
+    def _drain_logs(self):
+        for kind, job, text in self.logs.drain():
+            if kind == "lines":
+                if job.id == self.current_job: self.append_log(text)
+            else:
+                self._handle_job_event(kind, job)
+        self.after(LOG_POLL_MS, self._drain_logs)
+
+    def _handle_job_event(self, kind, job):
+        if kind == "finished":
+            status = job.status if job.returncode in (0, None) else f'{job.status} ({job.returncode})'
+            summary = f"\n{job.label} finalizado com {status}.\n"
+            if job.metrics and job.metrics["cpu_seconds"] is not None:
+                summary += (f"Duração {job.metrics['wall_seconds']:.1f}s, CPU {job.metrics['cpu_seconds']:.1f}s, "
+                            f"pico de memória {format_size(job.metrics['peak_rss'] or 0)}\n")
+            if job.log_path: summary += f"Log completo: {job.log_path}\n"
+            job.lines.append(summary)
+            if job.id == self.current_job: self.append_log(summary)
+            log.info("%s finalizado com %s (código %s)", job.label, job.status, job.returncode,
+                     extra={"job_id": job.id, "script_id": job.label})
+            # o histórico lê o SQLite: só recarrega com a aba visível (ou quando ela for aberta)
+            if self.tabview.get() == "Histórico": self.load_history()
+            else: self._history_dirty = True
+        self._update_job_row(job)
+
+    def _on_tab_change(self):
+        if self.tabview.get() == "Histórico" and self._history_dirty: self.load_history()
+
+    def load_history(self):
+        self._history_dirty = False
+        try:
+            summary = self.metrics.summary()
+        except Exception as e:
+            log.exception("falha ao ler o histórico")
+            messagebox.showerror("Erro", f"Falha ao ler o histórico: {e}"); return
+        self.history_tree.delete(*self.history_tree.get_children())
+        secs = lambda v: "" if v is None else f"{v:.1f}s"
+        for s in summary:
+            self.history_tree.insert("", "end", text=s["script"], values=(
+                s["runs"], s["failures"], secs(s["p50_seconds"]), secs(s["p95_seconds"]),
+                format_size(s["peak_rss"]) if s["peak_rss"] else "", secs(s["avg_cpu_seconds"]),
+                time.strftime("%d/%m %H:%M:%S", time.localtime(s["last_started"]))))
+
+    def export_history_csv(self):
+        path = filedialog.asksaveasfilename(title="Exportar execuções", defaultextension=".csv", filetypes=[("CSV", "*.csv")])
+        if not path: return
+        try:
+            count = self.metrics.export_csv(path)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Falha ao exportar: {e}"); return
+        messagebox.showinfo("Exportado", f"{count} execuções em {path}")
 
-    def _exec_thread(self, path, label):
-        proc = subprocess.Popen(['python', path], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        for line in proc.stdout: self.append_log(line)
-        proc.wait(); status = 'sucesso' if proc.returncode == 0 else f'erro ({proc.returncode})'
-        self.append_log(f"\n{label} finalizado com {status}.\n")
+    def export_history_prometheus(self):
+        path = filedialog.asksaveasfilename(title="Exportar métricas", defaultextension=".prom", filetypes=[("Prometheus", "*.prom")])
+        if not path: return
+        try:
+            with open(path, "w", encoding="utf-8") as f: f.write(self.metrics.export_prometheus())
+        except Exception as e:
+            messagebox.showerror("Erro", f"Falha ao exportar: {e}"); return
+        messagebox.showinfo("Exportado", f"Métricas em {path}")
+
+    def _update_job_row(self, job):
+        iid = str(job.id)
+        if not self.jobs_tree.exists(iid):
+            if job.id not in self.jobs.jobs: return
+            self.jobs_tree.insert("", 0, iid=iid, text=f"#{job.id}")
+            self._refresh_job_selector()
+        started = time.strftime("%H:%M:%S", time.localtime(job.started)) if job.started else ""
+        duration = f"{job.duration:.1f}s" if job.duration is not None else ""
+        code = "" if job.returncode is None else job.returncode
+        self.jobs_tree.item(iid, values=(job.label, job.status, started, duration, code))
+
+    def _tick(self):
+        for job in list(self.jobs.jobs.values()):
+            if job.status == RUNNING: self._update_job_row(job)
+        self.after(1000, self._tick)
+
+    def _refresh_job_selector(self):
+        self.job_choices = {f"#{j.id} {j.label}": j.id for j in reversed(self.jobs.jobs.values())}
+        self.job_selector.configure(values=list(self.job_choices) or ["(nenhuma execução)"])
+
+    def _selected_job(self):
+        sel = self.jobs_tree.selection()
+        return int(sel[0]) if sel else None
+
+    def cancel_selected(self):
+        job_id = self._selected_job()
+        if job_id is None: return
+        job = self.jobs.jobs[job_id]
+        if job.done:
+            messagebox.showinfo("Aviso", f"'{job.label}' já terminou."); return
+        if messagebox.askyesno("Confirmação", f"Cancelar '{job.label}' (#{job.id})?"):
+            self.jobs.cancel(job_id)
+
+    def view_selected_log(self):
+        job_id = self._selected_job()
+        if job_id is not None:
+            self.show_job(job_id)
+
+    def clear_finished(self):
+        self.jobs.clear_finished()
+        for iid in self.jobs_tree.get_children():
+            if int(iid) not in self.jobs.jobs: self.jobs_tree.delete(iid)
+        if self.current_job not in self.jobs.jobs:
+            self.current_job = None; self._set_log("")
+        self._refresh_job_selector()
+        if self.current_job is None: self.job_selector.set("(nenhuma execução)")
+
+    def show_job(self, job_id):
+        job = self.jobs.jobs.get(job_id)
+        if job is None: return
+        self.current_job = job_id
+        self._refresh_job_selector()
+        self.job_selector.set(f"#{job.id} {job.label}")
+        hidden = job.line_count - len(job.lines)
+        header = f"... {hidden} linhas anteriores em {job.log_path}\n" if hidden > 0 and job.log_path else ""
+        self._set_log(header + job.output)
+        self.tabview.set("Logs")
+
+    def on_close(self):
+        if self.jobs.running and not messagebox.askyesno(
+                "Confirmação", f"{self.jobs.running} execução(ões) em andamento serão canceladas. Sair?"):
+            return
+        self.logs.close()
+        self.jobs.cancel_all()
+        if self.warm_pool: self.warm_pool.close()
+        self.destroy()
+
+    def _set_log(self, text):
+        self.log_text.configure(state="normal")
+        self.log_text.delete('0.0', ctk.END)
+        self.log_text.insert(ctk.END, text)
+        self.log_text.see(ctk.END)
+        self.log_text.configure(state="disabled")
 
     def append_log(self, text):
         self.log_text.configure(state="normal")
         self.log_text.insert(ctk.END, text)
+        # mantém só as últimas MAX_LOG_LINES linhas no widget
+        lines = int(self.log_text.index("end-1c").split(".")[0])
+        if lines > MAX_LOG_LINES:
+            self.log_text.delete("1.0", f"{lines - MAX_LOG_LINES + 1}.0")
         self.log_text.see(ctk.END)
         self.log_text.configure(state="disabled")
 
     def clear_log(self):
+        job = self.jobs.jobs.get(self.current_job)
+        if job is not None: job.lines.clear()
         self.log_text.configure(state="normal"); self.log_text.delete('0.0', ctk.END); self.log_text.configure(state="disabled")
 
 if __name__ == '__main__':
+    # pythonw não tem console: o log do orquestrador vai só para logs/orquestrador.log
+    setup_logging("orquestrador", LOG_DIR, console=False, file_name="orquestrador")
     LoginWindow().mainloop()
\ No newline at end of file
@@ -3,8 +3,12 @@
 Zip/Unzip Automatizado com GUI em CustomTkinter
 
 Funcionalidades:
- - Compactar uma pasta em .zip
- - Descompactar um .zip em pasta de destino
+ - Compactar uma pasta em .zip (compressão em paralelo, usando todos os núcleos)
+ - Perfil de compressão por arquivo: store para formatos já comprimidos,
+   deflate ou LZMA/BZIP2 para texto (fastest, balanced, smallest)
+ - Modo incremental: atualiza o .zip existente recomprimindo só o que mudou
+ - Descompactar um .zip em pasta de destino (em paralelo, com filtros glob,
+   conferência de CRC e bloqueio de caminhos fora do destino)
 
 Uso:
   python zip_unzip_app.py
@@ -12,11 +16,18 @@ Uso:
 UI limpa, com seleção de arquivos/pastas, spinner e log em tempo real
 """
 import os
+import sys
 import threading
-import zipfile
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils.parallel_zip import compress_folder, describe
+from src.utils.zip_policy import PROFILES, CompressionPolicy
+from src.utils.sizes import format_size
+from src.utils.zip_extract import UnsafeMemberError, extract_archive, parse_filters
+from src.utils.zip_incremental import update_archive
+
 # Configura tema CustomTkinter
 ctk.set_appearance_mode("System")  # System, Light, Dark
 ctk.set_default_color_theme("green")  # blue, dark-blue, green
@@ -25,16 +36,30 @@ class ZipUnzipApp(ctk.CTk):
     def __init__(self):
         super().__init__()
         self.title("Zip/Unzip Automático")
-        self.geometry("600x450")
+        self.geometry("640x500")
         self.minsize(500, 400)
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(8, weight=1)
 
         # Modo: Compactar ou Descompactar
-        ctk.CTkLabel(self, text="Modo:", anchor="w").grid(row=0, column=0, sticky="ew", padx=20, pady=(20,5))
-        self.mode_combo = ctk.CTkComboBox(self, values=["Compactar (Zip)", "Descompactar (Unzip)"], state="readonly")
+        ctk.CTkLabel(self, text="Modo / Perfil de compressão:", anchor="w").grid(row=0, column=0, sticky="ew", padx=20, pady=(20,5))
+        frame_mode = ctk.CTkFrame(self, fg_color="transparent")
+        frame_mode.grid(row=1, column=0, sticky="ew", padx=20)
+        frame_mode.grid_columnconfigure(0, weight=1)
+        self.mode_combo = ctk.CTkComboBox(frame_mode, values=["Compactar (Zip)", "Descompactar (Unzip)"], state="readonly")
         self.mode_combo.set("Compactar (Zip)")
-        self.mode_combo.grid(row=1, column=0, sticky="ew", padx=20)
+        self.mode_combo.grid(row=0, column=0, sticky="ew")
+        # Perfil de compressão e método para arquivos de texto
+        self.profile_combo = ctk.CTkComboBox(frame_mode, values=list(PROFILES), width=110, state="readonly")
+        self.profile_combo.set("balanced")
+        self.profile_combo.grid(row=0, column=1, padx=(10,0))
+        self.text_method_combo = ctk.CTkComboBox(frame_mode, values=["texto: perfil", "texto: deflate", "texto: lzma", "texto: bzip2"],
+                                                 width=130, state="readonly")
+        self.text_method_combo.set("texto: perfil")
+        self.text_method_combo.grid(row=0, column=2, padx=(10,0))
+        self.incremental_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(frame_mode, text="Incremental (atualiza o .zip existente, recomprime só o que mudou)",
+                        variable=self.incremental_var).grid(row=1, column=0, columnspan=3, sticky="w", pady=(8,0))
 
         # Input
         ctk.CTkLabel(self, text="Arquivo/Pasta de entrada:", anchor="w").grid(row=2, column=0, sticky="ew", padx=20, pady=(15,5))
@@ -53,6 +78,8 @@ class ZipUnzipApp(ctk.CTk):
         self.entry_output = ctk.CTkEntry(frame_out, placeholder_text="Selecione destino (arquivo zip ou pasta)...")
         self.entry_output.grid(row=0, column=0, sticky="ew")
         ctk.CTkButton(frame_out, text="Browse", width=80, command=self.browse_output).grid(row=0, column=1, padx=(10,0))
+        self.entry_filters = ctk.CTkEntry(frame_out, placeholder_text="Filtros da extração (ex.: *.pdf; docs/*; !*.tmp)")
+        self.entry_filters.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(8,0))
 
         # Botões de ação (Executar e Iniciar)
         btn_frame = ctk.CTkFrame(self)
@@ -98,6 +125,10 @@ class ZipUnzipApp(ctk.CTk):
                 self.entry_output.insert(0, folder)
 
     def log(self, msg):
+        # chamado também das threads de trabalho: o Tk só pode ser tocado na thread principal
+        self.after(0, self._append_log, msg)
+
+    def _append_log(self, msg):
         self.logbox.configure(state="normal")
         self.logbox.insert(ctk.END, msg + "\n")
         self.logbox.see(ctk.END)
@@ -129,18 +160,43 @@ class ZipUnzipApp(ctk.CTk):
     def _process_thread(self, mode, inp, out):
         try:
             if mode.startswith("Compactar"):
-                self.log(f"Compactando '{inp}' em '{out}'...")
-                with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zf:
-                    for root, dirs, files in os.walk(inp):
-                        for file in files:
-                            abs_path = os.path.join(root, file)
-                            rel_path = os.path.relpath(abs_path, inp)
-                            zf.write(abs_path, rel_path)
+                workers = os.cpu_count() or 1
+                text_method = self.text_method_combo.get().split(": ")[1]
+                policy = CompressionPolicy(self.profile_combo.get(), text_method=None if text_method == "perfil" else text_method)
+                self.log(f"Compactando '{inp}' em '{out}' ({workers} threads, perfil {policy})...")
+                on_file = lambda e, d: self.log(describe(e, d))
+                if self.incremental_var.get():
+                    stats = update_archive(inp, out, workers=workers, policy=policy, on_file=on_file)
+                    self.log(f"Incremental: {stats['reused']} copiado(s), {stats['added']} novo(s), "
+                             f"{stats['changed']} alterado(s), {stats['removed']} removido(s)")
+                else:
+                    stats = compress_folder(inp, out, workers=workers, policy=policy, on_file=on_file)
+                secs = stats["seconds"] or 1e-9
+                self.log(f"{stats['files']} arquivo(s): {format_size(stats['bytes_in'])} → "
+                         f"{format_size(stats['bytes_out'])} em {secs:.1f}s "
+                         f"({stats['bytes_in'] / secs / 1024 ** 2:.1f} MB/s) — "
+                         + ", ".join(f"{m}: {n}" for m, n in sorted(stats["methods"].items())))
                 self.log("Compactação concluída!")
             else:
+                include, exclude = parse_filters(self.entry_filters.get())
                 self.log(f"Descompactando '{inp}' em '{out}'...")
-                with zipfile.ZipFile(inp, 'r') as zf:
-                    zf.extractall(out)
+
+                def on_member(info, seconds, error):
+                    if error: self.log(f"❌ {info.filename}: {error}")
+                    else: self.log(f"✔ {info.filename} ({format_size(info.file_size)}, {seconds:.2f}s)")
+
+                def on_progress(done, total, mb_s):
+                    self.log(f"   {format_size(done)} de {format_size(total)} ({mb_s:.1f} MB/s)")
+
+                try:
+                    stats = extract_archive(inp, out, workers=os.cpu_count(), include=include, exclude=exclude,
+                                            on_member=on_member, on_progress=on_progress)
+                except UnsafeMemberError as e:
+                    self.log(f"❌ Extração recusada: {e}")
+                    return
+                secs = stats["seconds"] or 1e-9
+                self.log(f"{stats['members']} membro(s), {format_size(stats['bytes'])} em {secs:.1f}s "
+                         f"({stats['bytes'] / secs / 1024 ** 2:.1f} MB/s), {len(stats['errors'])} erro(s)")
                 self.log("Descompactação concluída!")
         except Exception as e:
             self.log(f"❌ Erro: {e}")
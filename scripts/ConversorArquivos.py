@@ -3,13 +3,17 @@
 GUI para conversão de arquivos via Convertio API
 """
 import os
+import sys
 import threading
-import time
-import requests
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 
-API_BASE = "https://api.convertio.co"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.integracoes.convertio.cache import ResultCache
+from src.integracoes.convertio.client import ConvertioClient, build_options
+
+# conversões simultâneas permitidas pela conta na API
+MAX_CONCURRENCY = 4
 
 class ConvertioGUI(ctk.CTk):
     def __init__(self):
@@ -31,12 +35,12 @@ class ConvertioGUI(ctk.CTk):
         self.entry_api.grid(row=row+1, column=0, sticky="ew", padx=20)
         row += 2
 
-        # Input file
-        ctk.CTkLabel(self, text="Arquivo de entrada:", anchor="w").grid(row=row, column=0, sticky="ew", padx=20, pady=(10,5))
+        # Input file(s)
+        ctk.CTkLabel(self, text="Arquivo(s) de entrada:", anchor="w").grid(row=row, column=0, sticky="ew", padx=20, pady=(10,5))
         frame_in = ctk.CTkFrame(self)
         frame_in.grid(row=row+1, column=0, sticky="ew", padx=20)
         frame_in.grid_columnconfigure(0, weight=1)
-        self.entry_input = ctk.CTkEntry(frame_in, placeholder_text="Selecione um arquivo...")
+        self.entry_input = ctk.CTkEntry(frame_in, placeholder_text="Selecione um ou mais arquivos (separados por ;)...")
         self.entry_input.grid(row=0, column=0, sticky="ew")
         ctk.CTkButton(frame_in, text="Browse", width=80, command=self.browse_input).grid(row=0, column=1, padx=(10,0))
         row += 2
@@ -89,10 +93,12 @@ class ConvertioGUI(ctk.CTk):
         else: self.frame_ocr.grid_remove()
 
     def browse_input(self):
-        p = filedialog.askopenfilename()
-        if p: self.entry_input.delete(0, ctk.END); self.entry_input.insert(0, p)
+        p = filedialog.askopenfilenames()
+        if p: self.entry_input.delete(0, ctk.END); self.entry_input.insert(0, ";".join(p))
 
     def log(self, msg):
+        if threading.current_thread() is not threading.main_thread():
+            self.after(0, self.log, msg); return
         self.logbox.configure(state="normal")
         self.logbox.insert(ctk.END, msg + "\n")
         self.logbox.see(ctk.END)
@@ -106,64 +112,43 @@ class ConvertioGUI(ctk.CTk):
 
     def start_conversion(self):
         apikey = self.entry_api.get().strip()
-        infile = self.entry_input.get().strip()
+        infiles = [p.strip() for p in self.entry_input.get().split(";") if p.strip()]
         outfmt = self.combo_format.get()
-        if not apikey or not infile or not outfmt:
+        if not apikey or not infiles or not outfmt:
             messagebox.showwarning("Faltando dados", "Preencha API Key, input e formato!")
             return
-        if not os.path.isfile(infile):
-            messagebox.showerror("Erro", "Arquivo de entrada não encontrado.")
+        missing = [p for p in infiles if not os.path.isfile(p)]
+        if missing:
+            messagebox.showerror("Erro", f"Arquivo de entrada não encontrado: {missing[0]}")
             return
         self.btn_convert.configure(state="disabled")
         self.logbox.configure(state="normal"); self.logbox.delete('0.0', ctk.END); self.logbox.configure(state="disabled")
         self._running = True
         self.animate()
-        threading.Thread(target=self._convert_thread, args=(apikey, infile, outfmt), daemon=True).start()
+        threading.Thread(target=self._convert_thread, args=(apikey, infiles, outfmt), daemon=True).start()
 
-    def _convert_thread(self, apikey, infile, outfmt):
+    def _convert_thread(self, apikey, infiles, outfmt):
+        cache = None
         try:
-            # iniciar
-            self.log("Iniciando conversão...")
-            data = {"apikey":apikey, "input":"upload","outputformat":outfmt}
-            if self.var_ocr.get():
-                opts={"ocr_enabled":True, "ocr_settings":{}}
-                langs=self.entry_langs.get().strip()
-                pages=self.entry_pages.get().strip()
-                if langs: opts['ocr_settings']['langs']=langs.split(',')
-                if pages: opts['ocr_settings']['page_nums']=pages
-                data['options']=opts
-            r = requests.post(f"{API_BASE}/convert", json=data)
-            r.raise_for_status(); js=r.json()
-            cid = js['data']['id'] if js.get('status')=='ok' else (_ for _ in ()).throw(Exception(js.get('error')))
-            self.log(f"Conversion ID: {cid}")
-            # upload
-            fname=os.path.basename(infile)
-            with open(infile,'rb') as f:
-                up=requests.put(f"{API_BASE}/convert/{cid}/{fname}", data=f)
-            up.raise_for_status(); self.log("Arquivo enviado...")
-            # polling
-            while True:
-                s=requests.get(f"{API_BASE}/convert/{cid}/status", params={"apikey":apikey})
-                s.raise_for_status(); st=s.json()['data']
-                step=st['step']; pct=st.get('step_percent',0)
-                self.log(f"[{step}] {pct}%")
-                if step=='finish': break
-                if step=='failed': raise Exception("Conversão falhou.")
-                time.sleep(1)
-            # download via URL
-            url=st['output']['url']
-            outpath=os.path.splitext(infile)[0]+f"_conv.{outfmt}"
-            self.log(f"Baixando para {outpath}...")
-            dl=requests.get(url, stream=True); dl.raise_for_status()
-            with open(outpath,'wb') as f:
-                for chunk in dl.iter_content(8192): f.write(chunk)
-            self.log("Concluído com sucesso!")
+            opts = build_options(self.var_ocr.get(), self.entry_langs.get().strip(), self.entry_pages.get().strip())
+            multi = len(infiles) > 1
+            on_event = lambda path, msg: self.log(f"[{os.path.basename(path)}] {msg}" if multi else msg)
+            cache = ResultCache()
+            with ConvertioClient(apikey, max_concurrency=MAX_CONCURRENCY, cache=cache) as client:
+                results = client.convert_many(infiles, outfmt, opts, on_event=on_event)
+                m = client.poll_metrics()
+            if m["jobs"]:
+                self.log(f"Polling: {m['polls_per_job']:.1f} consultas/job, "
+                         f"tempo até terminar p50 {m['time_to_finish_p50']:.1f}s / p95 {m['time_to_finish_p95']:.1f}s")
+            if multi:
+                falhas = sum(1 for _, _, err in results if err)
+                self.log(f"{len(results) - falhas} convertido(s), {falhas} com erro.")
         except Exception as e:
             self.log(f"❌ Erro: {e}")
         finally:
+            if cache is not None: cache.close()
             self._running=False
-            self.btn_convert.configure(state="normal")
-            self.lbl_spinner.configure(text="")
+            self.after(0, lambda: (self.btn_convert.configure(state="normal"), self.lbl_spinner.configure(text="")))
 
 if __name__ == '__main__':
     app = ConvertioGUI()
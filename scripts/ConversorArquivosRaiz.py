@@ -1,15 +1,16 @@
 # converter_app.py
 # pip install pandas openpyxl xlwt python-docx docx2pdf pdf2docx customtkinter
 
+import os
+import sys
 import customtkinter as ctk
 import threading
-import pandas as pd
-import xlwt
-from docx import Document
-from docx2pdf import convert as docx2pdf_convert
-from pdf2docx import Converter as PDF2DOCXConverter
 from tkinter import filedialog, messagebox
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils import file_converters
+from src.utils.batch_convert import collect_inputs, run_batch
+
 # Configura tema moderno
 ctk.set_appearance_mode("System")  # System, Light, Dark
 ctk.set_default_color_theme("green")  # blue (default), dark-blue, green
@@ -44,7 +45,7 @@ class ConverterApp(ctk.CTk):
     def __init__(self):
         super().__init__()
         self.title("Bang Top Converter")
-        self.geometry("600x400")
+        self.geometry("600x680")
         self.grid_rowconfigure(0, weight=1); self.grid_columnconfigure(0, weight=1)
 
         # Frame principal sem 'padding' no construtor
@@ -53,9 +54,7 @@ class ConverterApp(ctk.CTk):
         frame.grid_columnconfigure((0,1), weight=1)
 
         ctk.CTkLabel(frame, text="Escolha a conversão:", font=ctk.CTkFont(size=16)).grid(row=0, column=0, columnspan=2, sticky="w")
-        self.combo = ctk.CTkComboBox(frame, values=[
-            "CSV → XLSX","CSV → DOCX","DOCX → PDF","XLSX → XLS","XLS → XLSX","PDF → DOCX"
-        ])
+        self.combo = ctk.CTkComboBox(frame, values=list(file_converters.CONVERSIONS))
         self.combo.set("CSV → XLSX")
         self.combo.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(10,10))
 
@@ -67,11 +66,28 @@ class ConverterApp(ctk.CTk):
         self.output_entry.grid(row=3, column=0, sticky="ew", padx=(0,10), pady=(10,0))
         ctk.CTkButton(frame, text="Selecionar", command=self.select_output).grid(row=3, column=1, sticky="ew", pady=(10,0))
 
+        # PDF → DOCX: páginas opcionais, analisadas em paralelo
+        self.pages_entry = ctk.CTkEntry(frame, placeholder_text="Páginas do PDF (opcional, ex.: 1-10,15)")
+        self.pages_entry.grid(row=4, column=0, columnspan=2, sticky="ew", pady=(10,0))
+
         self.convert_btn = ctk.CTkButton(frame, text="Converter", command=self.start)
-        self.convert_btn.grid(row=4, column=0, columnspan=2, pady=(20,0), sticky="ew")
+        self.convert_btn.grid(row=5, column=0, columnspan=2, pady=(20,0), sticky="ew")
 
         self.loading_label = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=24))
-        self.loading_label.grid(row=5, column=0, columnspan=2, pady=(20,0))
+        self.loading_label.grid(row=6, column=0, columnspan=2, pady=(20,0))
+
+        # Lote: pasta ou glob convertidos em paralelo num pool de processos
+        ctk.CTkLabel(frame, text="Conversão em lote:", font=ctk.CTkFont(size=16)).grid(row=7, column=0, columnspan=2, sticky="w", pady=(20,0))
+        self.batch_entry = ctk.CTkEntry(frame, placeholder_text="Pasta ou padrão (ex.: C:/dados/*.csv)")
+        self.batch_entry.grid(row=8, column=0, sticky="ew", padx=(0,10), pady=(10,0))
+        ctk.CTkButton(frame, text="Pasta", command=self.select_batch_folder).grid(row=8, column=1, sticky="ew", pady=(10,0))
+        self.batch_out_entry = ctk.CTkEntry(frame, placeholder_text="Pasta de saída (opcional)")
+        self.batch_out_entry.grid(row=9, column=0, sticky="ew", padx=(0,10), pady=(10,0))
+        self.batch_btn = ctk.CTkButton(frame, text="Converter lote", command=self.start_batch)
+        self.batch_btn.grid(row=9, column=1, sticky="ew", pady=(10,0))
+        self.batch_log = ctk.CTkTextbox(frame, height=140, state="disabled", wrap="word")
+        self.batch_log.grid(row=10, column=0, columnspan=2, sticky="nsew", pady=(10,0))
+        frame.grid_rowconfigure(10, weight=1)
 
         self.input_path = ""; self.output_path = ""
         self.loading_chars = ["⏳","🔄","💫","🔃"]; self.load_idx = 0
@@ -92,10 +108,7 @@ class ConverterApp(ctk.CTk):
             self.output_entry.insert(0, path)
 
     def get_ext(self):
-        return {
-            "CSV → XLSX": ".xlsx","CSV → DOCX": ".docx","DOCX → PDF": ".pdf",
-            "XLSX → XLS": ".xls","XLS → XLSX": ".xlsx","PDF → DOCX": ".docx"
-        }[self.combo.get()]
+        return file_converters.CONVERSIONS[self.combo.get()][2]
 
     def start(self):
         if not self.input_path or not self.output_path:
@@ -129,33 +142,68 @@ class ConverterApp(ctk.CTk):
             self.convert_btn.configure(state=ctk.NORMAL)
 
     def csv_to_xlsx(self):
-        df = pd.read_csv(self.input_path); df.to_excel(self.output_path, index=False)
+        file_converters.csv_to_xlsx(self.input_path, self.output_path)
 
     def csv_to_docx(self):
-        df = pd.read_csv(self.input_path)
-        doc = Document()
-        table = doc.add_table(rows=1, cols=len(df.columns))
-        for i, col in enumerate(df.columns): table.cell(0,i).text = col
-        for row in df.itertuples(index=False):
-            cells = table.add_row().cells
-            for i, val in enumerate(row): cells[i].text = str(val)
-        doc.save(self.output_path)
+        file_converters.csv_to_docx(self.input_path, self.output_path)
 
     def docx_to_pdf(self):
-        docx2pdf_convert(self.input_path, self.output_path)
+        file_converters.docx_to_pdf(self.input_path, self.output_path)
 
     def xlsx_to_xls(self):
-        df = pd.read_excel(self.input_path)
-        wb = xlwt.Workbook(); ws = wb.add_sheet('Sheet1')
-        for r, row in enumerate(df.values):
-            for c, val in enumerate(row): ws.write(r, c, val)
-        wb.save(self.output_path)
+        file_converters.xlsx_to_xls(self.input_path, self.output_path)
 
     def xls_to_xlsx(self):
-        df = pd.read_excel(self.input_path); df.to_excel(self.output_path, index=False)
+        file_converters.xls_to_xlsx(self.input_path, self.output_path)
 
     def pdf_to_docx(self):
-        cv = PDF2DOCXConverter(self.input_path); cv.convert(self.output_path); cv.close()
+        pages = self.pages_entry.get().strip() or None
+        file_converters.pdf_to_docx(self.input_path, self.output_path, pages=pages, workers=os.cpu_count())
+
+    def select_batch_folder(self):
+        path = filedialog.askdirectory(title="Selecione a pasta do lote")
+        if path:
+            self.batch_entry.delete(0, "end")
+            self.batch_entry.insert(0, path)
+
+    def batch_log_line(self, msg):
+        self.batch_log.configure(state="normal")
+        self.batch_log.insert("end", msg + "\n")
+        self.batch_log.see("end")
+        self.batch_log.configure(state="disabled")
+
+    def start_batch(self):
+        source = self.batch_entry.get().strip()
+        if not source:
+            messagebox.showwarning("Oops","Informe a pasta ou o padrão do lote!")
+            return
+        kind = self.combo.get()
+        inputs = collect_inputs(source, kind)
+        if not inputs:
+            messagebox.showwarning("Oops","Nenhum arquivo encontrado para essa conversão.")
+            return
+        output_dir = self.batch_out_entry.get().strip() or None
+        self.batch_btn.configure(state=ctk.DISABLED)
+        self.batch_log.configure(state="normal"); self.batch_log.delete("0.0", "end"); self.batch_log.configure(state="disabled")
+        self.batch_log_line(f"{len(inputs)} arquivo(s) para {kind}...")
+        threading.Thread(target=self.run_batch_conversion, args=(inputs, kind, output_dir), daemon=True).start()
+
+    def run_batch_conversion(self, inputs, kind, output_dir):
+        def on_result(result, done, total):
+            name = os.path.basename(result["input"])
+            if result["status"] == "error": msg = f"[{done}/{total}] ❌ {name}: {result['error']}"
+            elif result["status"] == "skipped": msg = f"[{done}/{total}] ⏭ {name} (saída atualizada)"
+            else: msg = f"[{done}/{total}] ✔ {name} ({result['seconds']:.1f}s)"
+            self.after(0, self.batch_log_line, msg)
+        try:
+            manifest = run_batch(inputs, kind, output_dir, on_result=on_result)
+            self.after(0, self.batch_log_line,
+                       f"Concluído: {manifest['ok']} ok, {manifest['skipped']} pulados, {manifest['errors']} erros. "
+                       f"Manifesto: {manifest['manifest_path']}")
+        except Exception as e:
+            self.after(0, self.batch_log_line, f"❌ Erro: {e}")
+        finally:
+            self.after(0, lambda: self.batch_btn.configure(state=ctk.NORMAL))
 
 if __name__ == "__main__":
     app = ConverterApp()
@@ -1,22 +1,29 @@
-import pandas as pd
+import os
+import sys
+import time
 
-# Caminho do arquivo CSV original
-caminho_csv_original = 'A:\Documentos RPA\ARQUIVOS CONSULTA MARGEM\piaui_2.csv'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils.csv_splitter import split_csv, throughput_report
 
-# Carrega o CSV usando o pandas
-df = pd.read_csv(caminho_csv_original)
+# Caminho do arquivo CSV original (pode ser sobrescrito pelo 1º argumento)
+caminho_csv_original = r'A:\Documentos RPA\ARQUIVOS CONSULTA MARGEM\piaui_2.csv'
 
 # Define o número de linhas por arquivo
 linhas_por_arquivo = 10000
 
-# Calcula o número de partes necessárias
-num_partes = len(df) // linhas_por_arquivo + (1 if len(df) % linhas_por_arquivo != 0 else 0)
+# Prefixo dos arquivos gerados: CONSULTA_MARGEM_PIAUI_PT_{n}.csv
+prefixo_saida = 'CONSULTA_MARGEM_PIAUI_PT_'
 
-# Divide e salva cada parte
-for i in range(num_partes):
-    inicio = i * linhas_por_arquivo
-    fim = inicio + linhas_por_arquivo
-    df_parte = df.iloc[inicio:fim]
-    caminho_arquivo_parte = f'CONSULTA_MARGEM_PIAUI_PT_{i + 1}.csv'
-    df_parte.to_csv(caminho_arquivo_parte, index=False)
-    print(f'Arquivo {caminho_arquivo_parte} salvo com sucesso.')
\ No newline at end of file
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        caminho_csv_original = sys.argv[1]
+
+    # Lê em streaming e salva cada parte assim que ela fecha (memória constante)
+    inicio = time.perf_counter()
+    partes = split_csv(
+        caminho_csv_original,
+        rows_per_part=linhas_por_arquivo,
+        output_prefix=prefixo_saida,
+        on_part=lambda caminho, linhas: print(f'Arquivo {caminho} salvo com sucesso.'),
+    )
+    print(throughput_report(partes, time.perf_counter() - inicio))
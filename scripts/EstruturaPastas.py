@@ -1,12 +1,20 @@
 import os
+import queue
+import sys
+import threading
+import time
 import tkinter as tk
-from tkinter import filedialog, scrolledtext
+from tkinter import filedialog, scrolledtext, ttk
 from rich.console import Console
 from rich.tree import Tree
 from rich.text import Text
 from rich import print as rich_print
 from io import StringIO
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils.dir_scanner import DEFAULT_INDEX, ScanResult, scan
+from src.utils.sizes import format_size
+
 # Console virtual pra capturar output formatado do Rich
 class RichCapture:
     def __init__(self):
@@ -16,19 +24,25 @@ class RichCapture:
     def get_output(self):
         return self.buffer.getvalue()
 
-def build_tree(directory: str, tree: Tree):
-    try:
-        entries = sorted(os.listdir(directory))
-        for entry in entries:
-            path = os.path.join(directory, entry)
-            if os.path.isdir(path):
-                subtree = tree.add(f"[bold blue][📁] {entry}")
-                build_tree(path, subtree)
+def build_tree(directory: str, tree: Tree, result=None):
+    """Monta a árvore Rich a partir da varredura (scandir + índice), sem recursão."""
+    if result is None:
+        result = scan(directory, index=DEFAULT_INDEX)
+    stack = [(os.path.abspath(directory), tree)]
+    while stack:
+        path, node = stack.pop()
+        scanned = result.dirs.get(path)
+        if scanned is not None and scanned.error:
+            node.add(f"[red]{scanned.error}[/]")
+            continue
+        subdirs, files = result.children(path)
+        # mesma ordem do os.listdir ordenado: pastas e arquivos intercalados por nome
+        entries = sorted([(name, None) for name in subdirs] + [(name, size) for name, size, _ in files])
+        for name, size in entries:
+            if size is None:
+                stack.append((os.path.join(path, name), node.add(f"[bold blue][📁] {name}")))
             else:
-                size = os.path.getsize(path)
-                tree.add(f"[green][📄] {entry}[/] - {size / 1024:.2f} KB")
-    except PermissionError:
-        tree.add("[red]Acesso negado[/]")
+                node.add(f"[green][📄] {name}[/] - {size / 1024:.2f} KB")
 
 def browse_and_display(text_widget: scrolledtext.ScrolledText):
     folder_selected = filedialog.askdirectory(title="Selecione a pasta para escanear")
@@ -49,6 +63,158 @@ def browse_and_display(text_widget: scrolledtext.ScrolledText):
     text_widget.insert(tk.END, f"📂 Estrutura da pasta: {folder_selected}\n\n")
     text_widget.insert(tk.END, output)
 
+class LazyTreeView(tk.Frame):
+    """
+    Árvore sob demanda para pastas enormes: a varredura roda numa thread e
+    os diretórios chegam por uma fila, consumida em lotes pelo after(); só
+    os nós abertos têm filhos inseridos (em páginas de PAGE_SIZE) e o
+    Treeview só desenha as linhas visíveis. Os tamanhos das pastas são
+    somados conforme a varredura avança.
+    """
+
+    PAGE_SIZE = 500
+    DRAIN_BUDGET = 0.05  # segundos de trabalho por ciclo da fila, para não travar a interface
+
+    def __init__(self, master, status_var):
+        super().__init__(master)
+        self.status_var = status_var
+        self.tree = ttk.Treeview(self, columns=("size", "items"), selectmode="browse")
+        self.tree.heading("#0", text="Nome")
+        self.tree.heading("size", text="Tamanho")
+        self.tree.heading("items", text="Itens")
+        self.tree.column("#0", width=480)
+        self.tree.column("size", width=110, anchor="e")
+        self.tree.column("items", width=80, anchor="e")
+        self.tree.tag_configure("error", foreground="red")
+        self.tree.tag_configure("more", foreground="blue")
+        scroll = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        self.tree.pack(side="left", expand=True, fill="both")
+        scroll.pack(side="right", fill="y")
+        self.tree.bind("<<TreeviewOpen>>", self._on_open)
+        self.tree.bind("<Double-1>", self._on_more)
+        self.tree.bind("<Return>", self._on_more)
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self.result = None
+
+    def load(self, folder):
+        self._stop.set()
+        self._stop = threading.Event()
+        self._queue = queue.Queue()
+        self.tree.delete(*self.tree.get_children())
+        root = os.path.abspath(folder)
+        self.result = ScanResult(root)
+        self._items = {}        # caminho da pasta → item no Treeview
+        self._paths = {}        # item no Treeview → caminho da pasta
+        self._populated = set()  # pastas cujos filhos já foram inseridos
+        self._waiting = set()    # pastas abertas antes de a varredura chegar nelas
+        self._more = {}          # item "mostrar mais" → (item pai, entradas restantes)
+        self._started = time.perf_counter()
+        iid = self.tree.insert("", "end", text=f"📁 {root}", values=("…", ""), open=True)
+        self._items[root] = iid; self._paths[iid] = root
+        self._waiting.add(root)
+        self.tree.insert(iid, "end", text="carregando…")
+        threading.Thread(target=self._scan_thread, args=(root, self._queue, self._stop), daemon=True).start()
+        self.after(50, self._drain, self._queue)
+
+    @staticmethod
+    def _scan_thread(root, q, stop):
+        try:
+            scan(root, index=DEFAULT_INDEX, on_dir=q.put, stop=stop)
+        except Exception as e:
+            q.put(e)
+        q.put(None)
+
+    def _drain(self, q):
+        if q is not self._queue:
+            return  # varredura antiga, substituída por outra pasta
+        deadline = time.perf_counter() + self.DRAIN_BUDGET
+        touched = set()
+        finished = False
+        while time.perf_counter() < deadline:
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                finished = True
+                break
+            if isinstance(item, Exception):
+                self.status_var.set(f"Erro na varredura: {item}")
+                continue
+            self.result.add(item)
+            touched.add(item.path)
+            if item.path in self._waiting:
+                self._waiting.discard(item.path)
+                self._populate(item.path)
+        self._refresh_sizes(touched)
+        stats = self.result.stats
+        elapsed = time.perf_counter() - self._started
+        self.status_var.set(f"{'Concluído' if finished else 'Varrendo'}: {stats['dirs']} pastas, "
+                            f"{stats['files']} arquivos, {format_size(stats['bytes'])} ({elapsed:.1f}s)")
+        if not finished:
+            self.after(100, self._drain, q)
+
+    def _refresh_sizes(self, touched):
+        # só as pastas já inseridas no Treeview (e seus ancestrais) precisam ser redesenhadas
+        dirty = set()
+        for path in touched:
+            while path not in dirty:
+                if path in self._items: dirty.add(path)
+                parent = os.path.dirname(path)
+                if path == self.result.root or parent == path: break
+                path = parent
+        for path in dirty:
+            self.tree.set(self._items[path], "size", format_size(self.result.total_size(path)))
+
+    def _populate(self, path):
+        iid = self._items[path]
+        self.tree.delete(*self.tree.get_children(iid))
+        self._populated.add(path)
+        scanned = self.result.dirs.get(path)
+        if scanned is not None and scanned.error:
+            self.tree.insert(iid, "end", text=f"⚠ {scanned.error}", tags=("error",))
+            return
+        subdirs, files = self.result.children(path)
+        self.tree.set(iid, "items", len(subdirs) + len(files))
+        entries = [(name, None) for name in subdirs] + [(name, size) for name, size, _ in files]
+        self._insert_page(iid, path, entries)
+
+    def _insert_page(self, iid, path, entries):
+        for name, size in entries[:self.PAGE_SIZE]:
+            if size is None:
+                child_path = os.path.join(path, name)
+                child = self.tree.insert(iid, "end", text=f"📁 {name}",
+                                         values=(format_size(self.result.total_size(child_path)), ""))
+                self._items[child_path] = child; self._paths[child] = child_path
+                self.tree.insert(child, "end", text="carregando…")
+            else:
+                self.tree.insert(iid, "end", text=f"📄 {name}", values=(format_size(size), ""))
+        rest = entries[self.PAGE_SIZE:]
+        if rest:
+            more = self.tree.insert(iid, "end", text=f"▶ mostrar mais {min(len(rest), self.PAGE_SIZE)} "
+                                                     f"(restam {len(rest)}) — duplo clique", tags=("more",))
+            self._more[more] = (iid, path, rest)
+
+    def _on_open(self, event):
+        iid = self.tree.focus()
+        path = self._paths.get(iid)
+        if path is None or path in self._populated:
+            return
+        if path in self.result.dirs:
+            self._populate(path)
+        else:
+            self._waiting.add(path)
+
+    def _on_more(self, event):
+        iid = self.tree.focus()
+        if iid in self._more:
+            parent, path, rest = self._more.pop(iid)
+            self.tree.delete(iid)
+            self._insert_page(parent, path, rest)
+
+
 def main():
     root = tk.Tk()
     root.title("Visualizador de Estrutura de Pastas")
@@ -57,11 +223,29 @@ def main():
     frame = tk.Frame(root)
     frame.pack(pady=10)
 
-    btn = tk.Button(frame, text="Selecionar Pasta", command=lambda: browse_and_display(text_area), font=("Arial", 12))
-    btn.pack()
+    status_var = tk.StringVar(value="Selecione uma pasta.")
+    notebook = ttk.Notebook(root)
+    lazy_view = LazyTreeView(notebook, status_var)
+    text_area = scrolledtext.ScrolledText(notebook, wrap=tk.WORD, font=("Courier", 10))
+    notebook.add(lazy_view, text="Árvore")
+    notebook.add(text_area, text="Texto (Rich)")
+
+    def open_lazy():
+        folder = filedialog.askdirectory(title="Selecione a pasta para escanear")
+        if folder:
+            notebook.select(lazy_view)
+            lazy_view.load(folder)
+
+    def open_text():
+        notebook.select(text_area)
+        browse_and_display(text_area)
+
+    btn = tk.Button(frame, text="Selecionar Pasta", command=open_lazy, font=("Arial", 12))
+    btn.pack(side="left", padx=5)
+    tk.Button(frame, text="Árvore completa (texto)", command=open_text, font=("Arial", 12)).pack(side="left", padx=5)
 
-    text_area = scrolledtext.ScrolledText(root, wrap=tk.WORD, font=("Courier", 10))
-    text_area.pack(expand=True, fill="both", padx=10, pady=10)
+    notebook.pack(expand=True, fill="both", padx=10, pady=(0, 5))
+    tk.Label(root, textvariable=status_var, anchor="w").pack(fill="x", padx=10, pady=(0, 10))
 
     root.mainloop()
 
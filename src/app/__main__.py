@@ -0,0 +1,7 @@
+import sys
+
+from src.app.cli import main
+
+# protegido: o warm_pool usa spawn, que reimporta o módulo principal nos processos filhos
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Orquestrador sem interface gráfica
+
+Lista e executa os mesmos scripts da GUI (pasta scripts/ + manual_scripts
+do scripts_config.json), repassando a saída em tempo real e devolvendo o
+código de saída do script. Não importa customtkinter: serve para
+containers, cron e agendador de tarefas.
+
+Uso:
+  python -m src.app list
+  python -m src.app run DivisorDadosExecel -- C:/dados/consulta.csv
+  python -m src.app run notificador --timeout 600 --log-file logs/notificador.log
+  python -m src.app metrics --format prometheus --output logs/rpa.prom
+  python -m src.app schedule [--once | --list]
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+from datetime import datetime
+
+from src.app import metrics, registry, runner, scheduler
+from src.core.logger import setup_logging
+from src.utils.sizes import format_size
+
+EXIT_NOT_FOUND = 127
+
+
+def cmd_list(args):
+    scripts = registry.discover_scripts(args.scripts_dir, registry.load_config(args.config))
+    if args.json:
+        print(json.dumps([{"name": label, "path": path} for label, path in scripts], indent=2, ensure_ascii=False))
+    else:
+        for label, path in scripts:
+            print(f"{label:<35} {path}")
+    return 0
+
+
+def cmd_run(args):
+    try:
+        path = registry.resolve_script(args.name, args.scripts_dir, registry.load_config(args.config))
+    except LookupError as e:
+        print(e, file=sys.stderr)
+        return EXIT_NOT_FOUND
+    if args.log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(args.log_file)), exist_ok=True)
+    log_file = open(args.log_file, "a", encoding="utf-8") if args.log_file else None
+    try:
+        return _run_logged(args, path, log_file)
+    finally:
+        if log_file: log_file.close()
+
+
+def _run_logged(args, path, log_file):
+    def on_line(line):
+        if not args.quiet:
+            sys.stdout.write(line); sys.stdout.flush()
+        if log_file: log_file.write(line)
+
+    started = datetime.now()
+    if log_file: log_file.write(f"--- {started:%Y-%m-%d %H:%M:%S} {path} {' '.join(args.args)}\n")
+    env = runner.job_env(f"{started:%Y%m%d%H%M%S}-{os.getpid()}", path)
+    sampler = None
+
+    def on_start(proc):
+        nonlocal sampler
+        if not args.no_metrics: sampler = metrics.ProcessSampler(proc)
+
+    try:
+        result = runner.run(path, args.args, on_line, timeout=args.timeout, env=env,
+                            cwd=registry.BASE_DIR, on_start=on_start)
+    except KeyboardInterrupt:
+        result = runner.RunResult(130, (datetime.now() - started).total_seconds(), False)
+    status = "prazo esgotado" if result.timed_out else ("sucesso" if result.returncode == 0 else "erro")
+    summary = f"{args.name} finalizado com {status} (código {result.returncode}) em {result.seconds:.1f}s"
+    print(summary, file=sys.stderr)
+    if sampler is not None:
+        try:
+            metrics.MetricsStore(args.metrics_db).record(os.path.basename(path), sampler.stop(), result.returncode,
+                                                         status, env["RPA_JOB_ID"])
+        except Exception as e:
+            print(f"Falha ao registrar métricas: {e}", file=sys.stderr)
+    if log_file: log_file.write(summary + "\n")
+    return result.returncode
+
+
+def cmd_metrics(args):
+    store = metrics.MetricsStore(args.metrics_db)
+    if args.format == "csv":
+        if not args.output:
+            print("--format csv requer --output", file=sys.stderr); return 2
+        print(f"{store.export_csv(args.output, args.script)} execuções em {args.output}")
+        return 0
+    if args.format == "prometheus":
+        text = store.export_prometheus()
+        if args.output:
+            # grava e renomeia: o coletor nunca lê um arquivo pela metade
+            with open(args.output + ".tmp", "w", encoding="utf-8") as f: f.write(text)
+            os.replace(args.output + ".tmp", args.output)
+        else:
+            sys.stdout.write(text)
+        return 0
+    fmt = lambda v: "-" if v is None else f"{v:.1f}s"
+    print(f"{'script':<30} {'execuções':>9} {'falhas':>6} {'p50':>8} {'p95':>8} {'memória':>10} {'cpu médio':>9}")
+    for s in store.summary():
+        if args.script and s["script"] != args.script: continue
+        mem = format_size(s["peak_rss"]) if s["peak_rss"] else "-"
+        print(f"{s['script']:<30} {s['runs']:>9} {s['failures']:>6} {fmt(s['p50_seconds']):>8} "
+              f"{fmt(s['p95_seconds']):>8} {mem:>10} {fmt(s['avg_cpu_seconds']):>9}")
+    return 0
+
+
+def cmd_schedule(args):
+    if args.list:
+        # só leitura: não cria o banco, não grava horários e não precisa da trava
+        sched = scheduler.Scheduler(args.config, args.scripts_dir, args.db, read_only=True)
+        for row in sched.describe():
+            flag = "" if row["enabled"] else " (desativado)"
+            print(f"{row['name']:<25} {row['rule']:<22} próxima {row['next_run']}  última {row['last_run']} "
+                  f"[{row['last_status']}]{flag}")
+        return 0
+    setup_logging("scheduler", os.path.join(registry.BASE_DIR, "logs"), file_name="scheduler")
+    sched = scheduler.Scheduler(args.config, args.scripts_dir, args.db, warm=args.warm)
+    try:
+        if args.once:
+            print(f"{sched.run_once()} job(s) executado(s)", file=sys.stderr)
+            return 0
+        signal.signal(signal.SIGTERM, lambda *_: sched.stop())
+        sched.run_forever()
+    except KeyboardInterrupt:
+        sched.stop()
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.app", description="Orquestrador RPA sem interface gráfica.")
+    parser.add_argument("--scripts-dir", default=registry.SCRIPTS_DIR)
+    parser.add_argument("--config", default=registry.CONFIG_FILE)
+    parser.add_argument("--metrics-db", default=metrics.DEFAULT_DB, help="SQLite com o histórico de execuções")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("list", help="lista os scripts disponíveis")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("run", help="executa um script pelo nome")
+    p.add_argument("name", help="rótulo (Notificador.py), nome sem extensão ou caminho")
+    p.add_argument("args", nargs="*", help="argumentos do script (após --)")
+    p.add_argument("--timeout", type=float, default=None, help="segundos até encerrar o script")
+    p.add_argument("--log-file", help="acrescenta a saída neste arquivo")
+    p.add_argument("-q", "--quiet", action="store_true", help="não repete a saída no terminal")
+    p.add_argument("--no-metrics", action="store_true", help="não registra CPU/memória/duração")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("metrics", help="histórico de execuções por script")
+    p.add_argument("--format", choices=("table", "prometheus", "csv"), default="table")
+    p.add_argument("--output", help="arquivo de saída (obrigatório para csv)")
+    p.add_argument("--script", help="só este script (rótulo, ex.: Notificador.py)")
+    p.set_defaults(func=cmd_metrics)
+
+    p = sub.add_parser("schedule", help="executa os scheduled_jobs do scripts_config.json")
+    p.add_argument("--once", action="store_true", help="executa o que estiver vencido e sai")
+    p.add_argument("--list", action="store_true", help="mostra os jobs e a próxima execução (só leitura)")
+    p.add_argument("--db", default=scheduler.DEFAULT_DB, help="SQLite com o estado do agendador")
+    p.add_argument("--warm", action="store_true", help="usa o pool de processos aquecidos mesmo sem warm_pool no config")
+    p.set_defaults(func=cmd_schedule)
+    return parser
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # tudo depois do primeiro "--" vai para o script, mesmo que pareça opção
+    extra = []
+    if "--" in argv:
+        cut = argv.index("--")
+        argv, extra = argv[:cut], argv[cut + 1:]
+    args = build_parser().parse_args(argv)
+    if hasattr(args, "args"):
+        args.args = args.args + extra
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
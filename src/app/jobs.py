@@ -0,0 +1,232 @@
+"""
+Fila de execuções do orquestrador
+
+Cada clique vira um Job numa fila; o JobManager inicia os pendentes em
+ordem de chegada respeitando um máximo global de execuções simultâneas e
+um máximo por script (quem passou do limite espera sem bloquear os
+outros). Cada job guarda a própria saída, o processo (para cancelar) e os
+tempos/código de saída para o painel de execuções.
+
+Os eventos chegam por on_event(tipo, job, linha) a partir das threads de
+execução: "queued", "started", "line", "finished". A interface deve
+repassá-los para a thread dela (ver log_pipeline).
+
+A saída em memória é limitada às últimas `buffer_lines` linhas; com
+`log_dir`, a saída completa de cada job vai para um arquivo próprio.
+Com `metrics` (MetricsStore), cada execução é amostrada e registrada.
+Com `backend` (warm_pool.WarmPool), os scripts rodam num processo já
+aquecido em vez de um `python` novo.
+"""
+import collections
+import itertools
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+from src.app import runner
+from src.app.metrics import ProcessSampler
+
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_MAX_PER_SCRIPT = 1
+DEFAULT_BUFFER_LINES = 5000
+
+PENDING, RUNNING, SUCCESS, FAILED, CANCELLED, TIMED_OUT = (
+    "pendente", "executando", "sucesso", "erro", "cancelado", "prazo esgotado")
+FINISHED = {SUCCESS, FAILED, CANCELLED, TIMED_OUT}
+
+
+class Job:
+    def __init__(self, job_id, label, path, args=(), timeout=None, buffer_lines=DEFAULT_BUFFER_LINES):
+        self.id = job_id
+        self.label = label
+        self.path = path
+        self.args = list(args)
+        self.timeout = timeout
+        self.status = PENDING
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.returncode = None
+        self.lines = collections.deque(maxlen=buffer_lines)
+        self.line_count = 0
+        self.log_path = None
+        self.metrics = None
+        self.proc = None
+        self.cancel_requested = False
+        self._done = threading.Event()
+
+    @property
+    def duration(self):
+        """Segundos de execução (até agora, se ainda estiver rodando)."""
+        if self.started is None: return None
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    def wait(self, timeout=None):
+        """Espera o job terminar (inclusive se for cancelado na fila). Devolve job.done."""
+        self._done.wait(timeout)
+        return self.done
+
+    @property
+    def output(self):
+        return "".join(self.lines)
+
+    def __repr__(self):
+        return f"<Job #{self.id} {self.label} {self.status}>"
+
+
+class JobManager:
+    """
+    max_concurrent: execuções simultâneas no total.
+    max_per_script: execuções simultâneas do mesmo script, com exceções
+    por rótulo em script_limits ({"Notificador.py": 2}).
+    """
+
+    def __init__(self, max_concurrent=DEFAULT_MAX_CONCURRENT, max_per_script=DEFAULT_MAX_PER_SCRIPT,
+                 script_limits=None, on_event=None, env=None, cwd=None, log_dir=None,
+                 buffer_lines=DEFAULT_BUFFER_LINES, metrics=None, backend=None):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_per_script = max(1, int(max_per_script))
+        self.script_limits = dict(script_limits or {})
+        self.on_event = on_event
+        self.env = env
+        self.cwd = cwd
+        self.log_dir = log_dir
+        self.buffer_lines = buffer_lines
+        self.metrics = metrics
+        self.backend = backend
+        self.jobs = collections.OrderedDict()
+        self._pending = collections.deque()
+        self._running = collections.Counter()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        """Limites a partir do scripts_config.json (max_concurrent, max_per_script, script_limits)."""
+        return cls(config.get("max_concurrent", DEFAULT_MAX_CONCURRENT),
+                   config.get("max_per_script", DEFAULT_MAX_PER_SCRIPT),
+                   config.get("script_limits"), **kwargs)
+
+    def limit_for(self, label):
+        return max(1, int(self.script_limits.get(label, self.max_per_script)))
+
+    @property
+    def running(self):
+        return sum(self._running.values())
+
+    def _emit(self, kind, job, line=None):
+        if self.on_event:
+            self.on_event(kind, job, line)
+
+    def submit(self, path, label=None, args=(), timeout=None):
+        job = Job(next(self._ids), label or path, path, args, timeout, self.buffer_lines)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._pending.append(job)
+        self._emit("queued", job)
+        self._dispatch()
+        return job
+
+    def _dispatch(self):
+        """Inicia, em ordem de chegada, os pendentes que cabem nos limites."""
+        to_start = []
+        with self._lock:
+            for job in list(self._pending):
+                if self.running >= self.max_concurrent: break
+                if self._running[job.path] >= self.limit_for(job.label): continue
+                self._pending.remove(job)
+                self._running[job.path] += 1
+                job.status, job.started = RUNNING, time.time()
+                to_start.append(job)
+        for job in to_start:
+            threading.Thread(target=self._run, args=(job,), daemon=True).start()
+
+    def _open_log(self, job):
+        if not self.log_dir: return None
+        os.makedirs(self.log_dir, exist_ok=True)
+        stem = re.sub(r"[^\w.-]+", "_", os.path.splitext(job.label)[0])
+        job.log_path = os.path.join(self.log_dir, f"{datetime.now():%Y%m%d_%H%M%S}_{job.id}_{stem}.log")
+        return open(job.log_path, "a", encoding="utf-8")
+
+    def _run(self, job):
+        log_file = None
+        try:
+            log_file = self._open_log(job)
+        except OSError as e:
+            job.lines.append(f"Sem arquivo de log ({e}); guardando só as últimas {self.buffer_lines} linhas.\n")
+        self._emit("started", job)
+        sampler = None
+
+        def on_start(proc):
+            nonlocal sampler
+            job.proc = proc
+            if self.metrics is not None: sampler = ProcessSampler(proc)
+            if job.cancel_requested: runner.terminate(proc)
+
+        def on_line(line):
+            if log_file: log_file.write(line)
+            job.lines.append(line)
+            job.line_count += 1
+            self._emit("line", job, line)
+
+        try:
+            env = runner.job_env(job.id, job.label, self.env)
+            run = self.backend.run if self.backend else runner.run
+            result = run(job.path, job.args, on_line, timeout=job.timeout, env=env, cwd=self.cwd, on_start=on_start)
+            job.returncode = result.returncode
+            if job.cancel_requested: job.status = CANCELLED
+            elif result.timed_out: job.status = TIMED_OUT
+            else: job.status = SUCCESS if result.returncode == 0 else FAILED
+        except Exception as e:
+            on_line(f"Falha ao iniciar {job.path}: {e}\n")
+            job.status = FAILED
+        finally:
+            if log_file: log_file.close()
+            job.finished, job.proc = time.time(), None
+            if sampler is not None:
+                job.metrics = sampler.stop()
+                try:
+                    self.metrics.record(job.label, job.metrics, job.returncode, job.status, job.id)
+                except Exception as e:
+                    job.lines.append(f"Falha ao registrar métricas: {e}\n")
+            with self._lock:
+                self._running[job.path] -= 1
+                if not self._running[job.path]: del self._running[job.path]
+            job._done.set()
+            self._emit("finished", job)
+            self._dispatch()
+
+    def cancel(self, job_id):
+        """Tira da fila ou encerra o processo. Devolve False se o job já terminou."""
+        job = self.jobs.get(job_id)
+        if job is None or job.done: return False
+        with self._lock:
+            if job.status == PENDING:
+                self._pending.remove(job)
+                job.status, job.finished = CANCELLED, time.time()
+                pending_cancelled = True
+            else:
+                job.cancel_requested = True
+                pending_cancelled = False
+        if pending_cancelled:
+            job._done.set()
+            self._emit("finished", job)
+        elif job.proc is not None:
+            # terminate espera o prazo de encerramento; não prende quem chamou (a GUI)
+            threading.Thread(target=runner.terminate, args=(job.proc,), daemon=True).start()
+        return True
+
+    def cancel_all(self):
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+
+    def clear_finished(self):
+        with self._lock:
+            for job_id in [i for i, j in self.jobs.items() if j.done]:
+                del self.jobs[job_id]
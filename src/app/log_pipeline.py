@@ -0,0 +1,87 @@
+"""
+Caminho da saída dos jobs até a interface
+
+As threads de execução publicam eventos numa fila limitada; a GUI esvazia
+a fila num timer (after), em lotes e com orçamento de tempo por rodada,
+e faz um único insert por job a cada rodada. Quando a fila enche, a
+thread que publica linhas espera (o pipe do script enche e o script
+desacelera) em vez de a memória crescer ou a interface congelar. A saída
+completa continua no arquivo do job (JobManager com log_dir), então nada
+se perde na tela.
+"""
+import collections
+import threading
+import time
+
+DEFAULT_QUEUE_SIZE = 10000
+DRAIN_BUDGET = 0.03   # segundos de trabalho na thread da GUI por rodada
+DRAIN_MAX_ITEMS = 5000
+PUT_RETRY = 0.25
+
+
+class LogPipeline:
+    """
+    Só as linhas de saída contam para o limite `maxsize` e esperam por
+    espaço; eventos de controle (queued, started, finished) entram sempre,
+    sem bloquear, porque também são publicados pela thread da GUI, que é
+    quem esvazia a fila. Tudo sai na ordem em que entrou.
+    """
+
+    def __init__(self, maxsize=DEFAULT_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self._items = collections.deque()
+        self._lines = 0
+        self._space = threading.Condition()
+        self.closed = False
+        self.blocked_seconds = 0.0
+
+    def publish(self, kind, job, line=None):
+        """on_event do JobManager. Linhas esperam se a fila estiver cheia; os demais eventos nunca esperam."""
+        with self._space:
+            if kind == "line" and self._lines >= self.maxsize:
+                started = time.perf_counter()
+                while self._lines >= self.maxsize and not self.closed:
+                    self._space.wait(PUT_RETRY)
+                self.blocked_seconds += time.perf_counter() - started
+            if kind == "line":
+                self._lines += 1
+            self._items.append((kind, job, line))
+
+    def drain(self, budget=DRAIN_BUDGET, max_items=DRAIN_MAX_ITEMS):
+        """
+        Retira o que couber no orçamento e devolve uma lista de lotes na ordem
+        de chegada: ("lines", job, texto) com as linhas seguidas do mesmo job
+        já concatenadas, ou (tipo, job, None) para os demais eventos.
+        """
+        deadline = time.perf_counter() + budget
+        batches = []
+        taken = 0
+        for _ in range(max_items):
+            try:
+                kind, job, line = self._items.popleft()
+            except IndexError:
+                break
+            if kind == "line":
+                taken += 1
+                if batches and batches[-1][0] == "lines" and batches[-1][1] is job:
+                    batches[-1][2].append(line)
+                else:
+                    batches.append(("lines", job, [line]))
+            else:
+                batches.append((kind, job, None))
+            if time.perf_counter() > deadline:
+                break
+        if taken:
+            with self._space:
+                self._lines -= taken
+                self._space.notify_all()
+        return [(kind, job, "".join(data) if kind == "lines" else None) for kind, job, data in batches]
+
+    def pending(self):
+        return len(self._items)
+
+    def close(self):
+        """Libera quem estiver bloqueado em publish."""
+        with self._space:
+            self.closed = True
+            self._space.notify_all()
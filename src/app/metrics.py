@@ -0,0 +1,260 @@
+"""
+Métricas de cada execução do orquestrador
+
+Enquanto o script roda, uma thread amostra o processo filho (tempo de CPU,
+memória, bytes lidos/gravados); no fim, um registro por execução vai para
+um SQLite local. Fontes, na ordem: psutil (se instalado, inclui os
+processos netos), /proc (Linux) ou só o tempo de relógio.
+
+O pico de memória vem do VmHWM do /proc (pico real, não só o das amostras)
+ou do maior RSS amostrado com psutil. O tempo de CPU e o I/O são os da
+última amostra, então podem faltar até SAMPLE_INTERVAL segundos no fim.
+Em processos reaproveitados (warm_pool) tudo é contado a partir da amostra
+`base` que o pool tira antes de entregar o job; a memória é o crescimento
+do RSS sobre ela (o VmHWM seria o do processo desde que abriu).
+
+Exportação: texto do Prometheus (para um coletor local ler de um arquivo
+ou do stdout) e CSV.
+
+Uso:
+  python -m src.app metrics
+  python -m src.app metrics --format prometheus --output metrics.prom
+"""
+import csv
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from src.app.registry import BASE_DIR
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DEFAULT_DB = os.environ.get("RPA_METRICS_DB") or os.path.join(BASE_DIR, "logs", "metrics.sqlite3")
+SAMPLE_INTERVAL = 0.5
+FIELDS = ["id", "script", "job_id", "started", "finished", "wall_seconds", "cpu_seconds", "peak_rss",
+          "read_bytes", "write_bytes", "returncode", "status"]
+
+try:
+    _CLK_TCK = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    _CLK_TCK = 100
+
+
+def _sample_psutil(pid):
+    try:
+        parent = psutil.Process(pid)
+        procs = [parent] + parent.children(recursive=True)
+    except psutil.Error:
+        return None
+    out = {"cpu_seconds": 0.0, "rss": 0, "read_bytes": None, "write_bytes": None}
+    for p in procs:
+        try:
+            with p.oneshot():
+                cpu = p.cpu_times()
+                out["cpu_seconds"] += cpu.user + cpu.system
+                out["rss"] += p.memory_info().rss
+                try:
+                    io = p.io_counters()
+                    out["read_bytes"] = (out["read_bytes"] or 0) + io.read_bytes
+                    out["write_bytes"] = (out["write_bytes"] or 0) + io.write_bytes
+                except (psutil.Error, AttributeError):
+                    pass
+        except psutil.Error:
+            continue
+    return out
+
+
+def _sample_proc(pid, peak=True):
+    base = f"/proc/{pid}"
+    try:
+        with open(f"{base}/stat", "rb") as f:
+            # o nome do processo pode ter espaços: os campos começam depois do último ')'
+            fields = f.read().rsplit(b")", 1)[1].split()
+        with open(f"{base}/status", "rb") as f:
+            status = dict(line.split(b":", 1) for line in f if b":" in line)
+    except (OSError, IndexError, ValueError):
+        return None
+    kb = lambda key: int(status[key].split()[0]) * 1024 if key in status else 0
+    out = {"cpu_seconds": (int(fields[11]) + int(fields[12])) / _CLK_TCK,
+           "rss": max(kb(b"VmRSS"), kb(b"VmHWM") if peak else 0), "read_bytes": None, "write_bytes": None}
+    try:
+        with open(f"{base}/io", "rb") as f:
+            io = dict(line.split(b":", 1) for line in f if b":" in line)
+        out["read_bytes"], out["write_bytes"] = int(io[b"read_bytes"]), int(io[b"write_bytes"])
+    except (OSError, KeyError, ValueError):
+        pass
+    return out
+
+
+def sample(pid, peak=True):
+    """
+    {cpu_seconds, rss, read_bytes, write_bytes} do processo agora, ou None se
+    não for possível medir. Com peak=False, rss é só o atual (sem o VmHWM).
+    """
+    if psutil is not None:
+        return _sample_psutil(pid)
+    if os.path.isdir("/proc"):
+        return _sample_proc(pid, peak)
+    return None
+
+
+class ProcessSampler:
+    """Amostra um Popen numa thread até ele terminar. stop() devolve o resumo."""
+
+    def __init__(self, proc, interval=SAMPLE_INTERVAL):
+        self.proc = proc
+        self.interval = interval
+        self.started = time.time()
+        self.cpu_seconds = self.peak_rss = self.read_bytes = self.write_bytes = None
+        # processo reaproveitado (warm_pool): desconta o que ele já tinha antes deste job
+        self._warm = getattr(proc, "warm", False)
+        self._base = (getattr(proc, "base", None) if self._warm else None) or {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            s = sample(self.proc.pid, peak=not self._warm) if self.proc.poll() is None else None
+            if s:
+                self.cpu_seconds = s["cpu_seconds"] - self._base.get("cpu_seconds", 0)
+                self.peak_rss = max(self.peak_rss or 0, s["rss"] - self._base.get("rss", 0))
+                if s["read_bytes"] is not None:
+                    self.read_bytes = s["read_bytes"] - (self._base.get("read_bytes") or 0)
+                    self.write_bytes = s["write_bytes"] - (self._base.get("write_bytes") or 0)
+            if self._stop.wait(self.interval) or self.proc.poll() is not None:
+                break
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return {"started": self.started, "finished": time.time(), "wall_seconds": time.time() - self.started,
+                "cpu_seconds": self.cpu_seconds, "peak_rss": self.peak_rss,
+                "read_bytes": self.read_bytes, "write_bytes": self.write_bytes}
+
+
+def percentile(values, q):
+    """Percentil q (0-100) com interpolação linear; None para lista vazia."""
+    values = sorted(v for v in values if v is not None)
+    if not values: return None
+    k = (len(values) - 1) * q / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+class MetricsStore:
+    """Histórico de execuções em SQLite. Uma conexão por operação: pode ser usado de várias threads."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as db, db:
+            db.executescript("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    script TEXT NOT NULL,
+                    job_id TEXT,
+                    started REAL NOT NULL,
+                    finished REAL NOT NULL,
+                    wall_seconds REAL NOT NULL,
+                    cpu_seconds REAL,
+                    peak_rss INTEGER,
+                    read_bytes INTEGER,
+                    write_bytes INTEGER,
+                    returncode INTEGER,
+                    status TEXT
+                );
+                CREATE INDEX IF NOT EXISTS runs_script ON runs (script, started);
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def record(self, script, metrics, returncode=None, status=None, job_id=None):
+        row = dict(metrics, script=script, returncode=returncode, status=status,
+                   job_id=None if job_id is None else str(job_id))
+        cols = [f for f in FIELDS if f != "id"]
+        with closing(self._connect()) as db, db:
+            db.execute(f"INSERT INTO runs ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                       [row.get(c) for c in cols])
+
+    def runs(self, script=None, limit=None):
+        """Execuções (dicts), da mais recente para a mais antiga."""
+        sql = f"SELECT {', '.join(FIELDS)} FROM runs"
+        params = []
+        if script:
+            sql += " WHERE script = ?"; params.append(script)
+        sql += " ORDER BY started DESC"
+        if limit:
+            sql += " LIMIT ?"; params.append(limit)
+        with closing(self._connect()) as db:
+            return [dict(zip(FIELDS, row)) for row in db.execute(sql, params)]
+
+    def summary(self):
+        """Por script: execuções, falhas, p50/p95 de duração, pico de memória, CPU média e última execução."""
+        with closing(self._connect()) as db:
+            # agregados no SQLite; só as durações (para os percentis) voltam linha a linha.
+            # last_returncode vem da execução mais recente, escolhida explicitamente
+            rows = db.execute("""
+                SELECT script, COUNT(*), SUM((returncode IS NOT NULL AND returncode != 0) OR status = 'cancelado'),
+                       TOTAL(wall_seconds), MAX(NULLIF(peak_rss, 0)), AVG(cpu_seconds), TOTAL(cpu_seconds),
+                       MAX(started),
+                       (SELECT r2.returncode FROM runs r2 WHERE r2.script = runs.script
+                        ORDER BY r2.started DESC LIMIT 1)
+                FROM runs GROUP BY script ORDER BY script""").fetchall()
+            walls = {}
+            for script, wall in db.execute("SELECT script, wall_seconds FROM runs"):
+                walls.setdefault(script, []).append(wall)
+        return [{
+            "script": script,
+            "runs": runs,
+            "failures": failures,
+            "p50_seconds": percentile(walls.get(script, ()), 50),
+            "p95_seconds": percentile(walls.get(script, ()), 95),
+            "total_seconds": total_seconds,
+            "peak_rss": peak_rss,
+            "avg_cpu_seconds": avg_cpu,
+            "total_cpu_seconds": total_cpu,
+            "last_started": last_started,
+            "last_returncode": last_returncode,
+        } for script, runs, failures, total_seconds, peak_rss, avg_cpu, total_cpu, last_started, last_returncode in rows]
+
+    def export_csv(self, path, script=None):
+        runs = self.runs(script)
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS, delimiter=";")
+            writer.writeheader(); writer.writerows(runs)
+        return len(runs)
+
+    def export_prometheus(self):
+        """Texto no formato de exposição do Prometheus, agregado por script."""
+        def esc(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        metrics = [
+            ("rpa_script_runs_total", "counter", "Execuções registradas", lambda s: s["runs"]),
+            ("rpa_script_failures_total", "counter", "Execuções com erro, prazo esgotado ou canceladas", lambda s: s["failures"]),
+            ("rpa_script_duration_seconds_p50", "gauge", "Mediana da duração", lambda s: s["p50_seconds"]),
+            ("rpa_script_duration_seconds_p95", "gauge", "Percentil 95 da duração", lambda s: s["p95_seconds"]),
+            ("rpa_script_duration_seconds_total", "counter", "Soma das durações", lambda s: s["total_seconds"]),
+            ("rpa_script_cpu_seconds_total", "counter", "Soma do tempo de CPU", lambda s: s["total_cpu_seconds"]),
+            ("rpa_script_peak_rss_bytes", "gauge", "Maior pico de memória", lambda s: s["peak_rss"]),
+            ("rpa_script_last_run_timestamp_seconds", "gauge", "Início da última execução", lambda s: s["last_started"]),
+            ("rpa_script_last_exit_code", "gauge", "Código de saída da última execução", lambda s: s["last_returncode"]),
+        ]
+        summary = self.summary()
+        lines = []
+        for name, kind, help_text, get in metrics:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for s in summary:
+                value = get(s)
+                if value is not None:
+                    number = int(value) if float(value).is_integer() else round(float(value), 6)
+                    lines.append(f'{name}{{script="{esc(s["script"])}"}} {number}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,58 @@
+"""
+Descoberta dos scripts do orquestrador
+
+A mesma lista do MainApp.load_scripts: os .py da pasta `scripts/` mais os
+`manual_scripts` do scripts_config.json. Sem dependência de interface, para
+ser usada pela GUI, pela linha de comando e pelo agendador.
+"""
+import json
+import os
+
+# raiz do projeto (pasta acima de src/); RPA_HOME sobrescreve, útil em containers
+BASE_DIR = os.environ.get("RPA_HOME") or os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCRIPTS_DIR = os.path.join(BASE_DIR, "scripts")
+CONFIG_FILE = os.path.join(BASE_DIR, "scripts_config.json")
+
+
+def load_config(path=CONFIG_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"manual_scripts": []}
+
+
+def save_config(config, path=CONFIG_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+
+
+def discover_scripts(scripts_dir=SCRIPTS_DIR, config=None):
+    """[(rótulo, caminho)] na ordem exibida pela GUI."""
+    config = load_config() if config is None else config
+    entries = []
+    if os.path.isdir(scripts_dir):
+        for f in sorted(os.listdir(scripts_dir)):
+            if f.endswith(".py"):
+                entries.append((f, os.path.join(scripts_dir, f)))
+    for p in config.get("manual_scripts", []):
+        if os.path.isfile(p): entries.append((os.path.basename(p), p))
+    return entries
+
+
+def resolve_script(name, scripts_dir=SCRIPTS_DIR, config=None):
+    """
+    Caminho do script pelo rótulo ("Notificador.py"), nome sem extensão
+    ("notificador", sem diferenciar maiúsculas) ou caminho de arquivo.
+    Levanta LookupError se não encontrar ou se o nome for ambíguo.
+    """
+    if os.path.isfile(name):
+        return os.path.abspath(name)
+    wanted = name.lower()
+    matches = [path for label, path in discover_scripts(scripts_dir, config)
+               if label.lower() == wanted or os.path.splitext(label)[0].lower() == wanted]
+    if not matches:
+        raise LookupError(f"Script não encontrado: {name}")
+    if len(set(matches)) > 1:
+        raise LookupError(f"Nome ambíguo: {name} ({', '.join(matches)})")
+    return matches[0]
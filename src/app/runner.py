@@ -0,0 +1,91 @@
+"""
+Execução de scripts em subprocesso
+
+Caminho único de execução usado pela GUI, pela linha de comando e pelo
+agendador: o script roda num `python` novo, com stdout e stderr juntos e
+lidos linha a linha (sem buffer no filho), com prazo opcional.
+"""
+import collections
+import os
+import subprocess
+import sys
+import threading
+import time
+
+TIMEOUT_EXIT_CODE = 124  # mesmo código do `timeout` do coreutils
+TERMINATE_GRACE = 5.0
+
+RunResult = collections.namedtuple("RunResult", "returncode seconds timed_out")
+
+
+def python_executable():
+    """Intérprete para os filhos: RPA_PYTHON ou o atual (python.exe em vez de pythonw.exe no Windows)."""
+    exe = os.environ.get("RPA_PYTHON") or sys.executable or "python"
+    head, tail = os.path.split(exe)
+    if tail.lower() == "pythonw.exe":
+        exe = os.path.join(head, "python.exe")
+    return exe
+
+
+def build_command(path, args=()):
+    return [python_executable(), "-u", path, *[str(a) for a in args]]
+
+
+def child_env(extra=None):
+    env = dict(os.environ, PYTHONUNBUFFERED="1", PYTHONIOENCODING="utf-8")
+    env.update({k: str(v) for k, v in (extra or {}).items()})
+    return env
+
+
+def job_env(job_id, label, extra=None):
+    """Variáveis que identificam a execução para o src.core.logger do script filho."""
+    env = dict(extra or {})
+    env.setdefault("RPA_JOB_ID", str(job_id))
+    env.setdefault("RPA_SCRIPT_ID", os.path.splitext(os.path.basename(label))[0])
+    return env
+
+
+def terminate(proc, grace=TERMINATE_GRACE):
+    """Pede para o processo terminar e, se não sair em `grace` segundos, mata."""
+    if proc.poll() is not None:
+        return
+    proc.terminate()
+    try:
+        proc.wait(grace)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def run(path, args=(), on_line=None, timeout=None, env=None, cwd=None, on_start=None):
+    """
+    Executa o script e repassa cada linha de saída para on_line(texto).
+    on_start(Popen) recebe o processo logo após o início (para cancelar).
+    Devolve RunResult; no estouro do prazo o código é TIMEOUT_EXIT_CODE.
+    """
+    started = time.perf_counter()
+    proc = subprocess.Popen(build_command(path, args), stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, encoding="utf-8", errors="replace", env=child_env(env),
+                            cwd=cwd)
+    if on_start: on_start(proc)
+    timed_out = threading.Event()
+
+    def expire():
+        timed_out.set()
+        terminate(proc)
+
+    timer = threading.Timer(timeout, expire) if timeout else None
+    if timer:
+        timer.daemon = True
+        timer.start()
+    try:
+        for line in proc.stdout:
+            if on_line: on_line(line)
+        proc.wait()
+    except BaseException:
+        terminate(proc)
+        raise
+    finally:
+        if timer: timer.cancel()
+        proc.stdout.close()
+    code = TIMEOUT_EXIT_CODE if timed_out.is_set() else proc.returncode
+    return RunResult(code, time.perf_counter() - started, timed_out.is_set())
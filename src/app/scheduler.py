@@ -0,0 +1,462 @@
+"""
+Agendador do orquestrador
+
+Lê `scheduled_jobs` do scripts_config.json e executa cada job no horário,
+pelo mesmo JobManager/runner usado pela GUI (mesmos limites, logs por
+execução e métricas):
+
+  "scheduled_jobs": [
+    {"name": "notificador-manha", "script": "Notificador.py", "cron": "0 8 * * 1-5",
+     "args": [], "timeout": 600, "retries": 2, "retry_delay": 60},
+    {"name": "limpeza", "script": "C:/robos/limpeza.py", "interval": "15m", "catch_up": false}
+  ]
+
+ - cron: 5 campos (minuto hora dia mês dia-da-semana), com *, listas,
+   intervalos, passos e nomes (jan, seg/mon...); interval: segundos ou
+   "30s", "15m", "2h", "1d"
+ - o estado (próxima execução, última execução, histórico de tentativas)
+   fica em SQLite; um job nunca roda em paralelo com ele mesmo
+ - ao reiniciar, execuções perdidas viram uma só (catch_up, padrão true)
+   ou são puladas (catch_up: false)
+ - só um agendador por banco: o segundo recusa iniciar enquanto o
+   primeiro estiver ativo
+ - o config é relido quando o arquivo muda
+
+Uso:
+  python -m src.app schedule            # fica rodando
+  python -m src.app schedule --once     # executa o que estiver vencido e sai (cron/Agendador de Tarefas)
+  python -m src.app schedule --list
+  python -m src.app schedule --warm     # scripts em processos aquecidos (ver warm_pool)
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime, timedelta
+from urllib.request import pathname2url
+
+from src.app import registry
+from src.app.jobs import FAILED, TIMED_OUT, JobManager
+from src.app.metrics import MetricsStore
+from src.app.warm_pool import WarmPool
+
+DEFAULT_DB = os.environ.get("RPA_SCHEDULER_DB") or os.path.join(registry.BASE_DIR, "logs", "scheduler.sqlite3")
+JOB_LOG_DIR = os.path.join(registry.BASE_DIR, "logs", "execucoes")
+TICK = 1.0
+LOCK_STALE = 60.0   # segundos sem sinal até outro agendador poder assumir o banco
+MAX_SLEEP = 30.0
+MISFIRE_GRACE = 60.0  # atraso tolerado antes de uma execução contar como perdida
+
+log = logging.getLogger(__name__)
+
+
+class ScheduleError(ValueError):
+    pass
+
+
+# ---------------------------------------------------------------- cron
+
+_NAMES = {
+    "month": {n: i for i, n in enumerate(
+        "jan feb mar apr may jun jul aug sep oct nov dec".split(), 1)},
+    "dow": {**{n: i for i, n in enumerate("sun mon tue wed thu fri sat".split())},
+            **{n: i for i, n in enumerate("dom seg ter qua qui sex sab".split())}},
+}
+_ALIASES = {"@hourly": "0 * * * *", "@daily": "0 0 * * *", "@midnight": "0 0 * * *",
+            "@weekly": "0 0 * * 0", "@monthly": "0 0 1 * *", "@yearly": "0 0 1 1 *", "@annually": "0 0 1 1 *"}
+
+
+def _parse_field(text, low, high, names=None):
+    values = set()
+    for part in text.lower().split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ScheduleError(f"passo inválido: {text}")
+            step = int(step_text)
+        if part == "*":
+            start, end = low, high
+        else:
+            bounds = [names.get(b, b) if names else b for b in part.split("-", 1)]
+            try:
+                bounds = [int(b) for b in bounds]
+            except ValueError:
+                raise ScheduleError(f"valor inválido: {text}")
+            start = bounds[0]
+            end = bounds[1] if len(bounds) > 1 else (high if step > 1 else start)
+        if not (low <= start <= high and low <= end <= high) or start > end:
+            raise ScheduleError(f"fora do intervalo {low}-{high}: {text}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpr:
+    """Expressão cron de 5 campos. next_after(dt) devolve o próximo minuto que casa, depois de dt."""
+
+    def __init__(self, expr):
+        self.expr = expr
+        fields = _ALIASES.get(expr.strip().lower(), expr).split()
+        if len(fields) != 5:
+            raise ScheduleError(f"cron precisa de 5 campos: {expr!r}")
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12, _NAMES["month"])
+        dow = _parse_field(fields[4], 0, 7, _NAMES["dow"])
+        self.weekdays = {d % 7 for d in dow}   # 0 e 7 são domingo
+        # como no cron: com dia do mês e dia da semana restritos, basta casar um dos dois
+        # ("*/2" conta como irrestrito, igual ao Vixie cron)
+        self._dom_any = fields[2].startswith("*")
+        self._dow_any = fields[4].startswith("*")
+
+    def _day_matches(self, dt):
+        dom = dt.day in self.days
+        dow = (dt.weekday() + 1) % 7 in self.weekdays
+        if self._dom_any: return dow
+        if self._dow_any: return dom
+        return dom or dow
+
+    def next_after(self, dt):
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ScheduleError(f"cron nunca casa: {self.expr!r}")
+
+
+def parse_interval(value):
+    """Segundos a partir de 900, "900", "30s", "15m", "2h" ou "1d"."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*", str(value).lower())
+    if not match or float(match.group(1)) <= 0:
+        raise ScheduleError(f"intervalo inválido: {value!r}")
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}[match.group(2)]
+
+
+# ---------------------------------------------------------------- jobs
+
+class ScheduledJob:
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec.get("name") or spec.get("script")
+        self.script = spec.get("script")
+        if not self.name or not self.script:
+            raise ScheduleError(f"job sem 'script': {spec}")
+        self.args = [str(a) for a in spec.get("args", [])]
+        self.timeout = spec.get("timeout")
+        self.retries = int(spec.get("retries", 0))
+        self.retry_delay = float(spec.get("retry_delay", 60))
+        self.catch_up = bool(spec.get("catch_up", True))
+        self.enabled = bool(spec.get("enabled", True))
+        if ("cron" in spec) == ("interval" in spec):
+            raise ScheduleError(f"{self.name}: informe 'cron' ou 'interval'")
+        self.cron = CronExpr(spec["cron"]) if "cron" in spec else None
+        self.interval = parse_interval(spec["interval"]) if "interval" in spec else None
+
+    def next_after(self, ts):
+        """Próximo horário (epoch) depois de ts."""
+        if self.cron:
+            return self.cron.next_after(datetime.fromtimestamp(ts)).timestamp()
+        return ts + self.interval
+
+    def first_run(self, now):
+        return now if self.interval else self.next_after(now)
+
+    @property
+    def rule(self):
+        return f"cron {self.cron.expr}" if self.cron else f"a cada {self.interval:g}s"
+
+
+def load_jobs(config):
+    """{nome: ScheduledJob} dos scheduled_jobs válidos; inválidos vão para o log e ficam de fora."""
+    jobs = {}
+    for spec in config.get("scheduled_jobs", []):
+        try:
+            job = ScheduledJob(spec)
+        except (ScheduleError, TypeError, ValueError) as e:
+            log.error("Job agendado ignorado: %s", e)
+            continue
+        if job.name in jobs:
+            log.error("Job agendado com nome repetido ignorado: %s", job.name)
+            continue
+        jobs[job.name] = job
+    return jobs
+
+
+class ScheduleStore:
+    """
+    Estado do agendador em SQLite: próxima/última execução por job, tentativas e a trava do agendador.
+    Com read_only=True (schedule --list), o banco é aberto só para leitura e não é criado.
+    """
+
+    def __init__(self, path=DEFAULT_DB, read_only=False):
+        self.path = path
+        self.read_only = read_only
+        if read_only: return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as db, db:
+            db.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    name TEXT PRIMARY KEY,
+                    rule TEXT,
+                    next_run REAL,
+                    last_run REAL,
+                    last_status TEXT,
+                    last_returncode INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    scheduled REAL,
+                    started REAL,
+                    finished REAL,
+                    attempt INTEGER,
+                    returncode INTEGER,
+                    status TEXT,
+                    log_path TEXT
+                );
+                CREATE INDEX IF NOT EXISTS runs_name ON runs (name, started);
+                CREATE TABLE IF NOT EXISTS lock (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    owner TEXT,
+                    heartbeat REAL
+                );
+            """)
+
+    def _connect(self):
+        if self.read_only:
+            return sqlite3.connect(f"file:{pathname2url(os.path.abspath(self.path))}?mode=ro", uri=True, timeout=30)
+        return sqlite3.connect(self.path, timeout=30)
+
+    def acquire(self, owner, stale=LOCK_STALE):
+        """Trava o banco para este agendador. False se outro deu sinal há menos de `stale` segundos."""
+        now = time.time()
+        with closing(self._connect()) as db, db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT owner, heartbeat FROM lock WHERE id = 1").fetchone()
+            if row and row[0] != owner and now - row[1] < stale:
+                return False
+            db.execute("INSERT OR REPLACE INTO lock (id, owner, heartbeat) VALUES (1, ?, ?)", (owner, now))
+        return True
+
+    def heartbeat(self, owner):
+        with closing(self._connect()) as db, db:
+            db.execute("UPDATE lock SET heartbeat = ? WHERE id = 1 AND owner = ?", (time.time(), owner))
+
+    def release(self, owner):
+        with closing(self._connect()) as db, db:
+            db.execute("DELETE FROM lock WHERE id = 1 AND owner = ?", (owner,))
+
+    def states(self):
+        if self.read_only and not os.path.exists(self.path): return {}
+        with closing(self._connect()) as db:
+            return {row[0]: {"rule": row[1], "next_run": row[2], "last_run": row[3], "last_status": row[4],
+                             "last_returncode": row[5]}
+                    for row in db.execute("SELECT name, rule, next_run, last_run, last_status, last_returncode FROM jobs")}
+
+    def set_next(self, name, next_run, rule=None):
+        with closing(self._connect()) as db, db:
+            db.execute("INSERT INTO jobs (name, rule, next_run) VALUES (?, ?, ?) "
+                       "ON CONFLICT(name) DO UPDATE SET next_run = excluded.next_run, rule = COALESCE(excluded.rule, rule)",
+                       (name, rule, next_run))
+
+    def record(self, name, scheduled, job, attempt):
+        with closing(self._connect()) as db, db:
+            db.execute("INSERT INTO runs (name, scheduled, started, finished, attempt, returncode, status, log_path) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       (name, scheduled, job.started, job.finished, attempt, job.returncode, job.status, job.log_path))
+            db.execute("UPDATE jobs SET last_run = ?, last_status = ?, last_returncode = ? WHERE name = ?",
+                       (job.started, job.status, job.returncode, name))
+
+    def history(self, name=None, limit=50):
+        sql = "SELECT name, scheduled, started, finished, attempt, returncode, status, log_path FROM runs"
+        params = []
+        if name:
+            sql += " WHERE name = ?"; params.append(name)
+        sql += " ORDER BY id DESC LIMIT ?"; params.append(limit)
+        cols = ["name", "scheduled", "started", "finished", "attempt", "returncode", "status", "log_path"]
+        with closing(self._connect()) as db:
+            return [dict(zip(cols, row)) for row in db.execute(sql, params)]
+
+
+class Scheduler:
+    def __init__(self, config_path=registry.CONFIG_FILE, scripts_dir=registry.SCRIPTS_DIR, db_path=DEFAULT_DB,
+                 manager=None, warm=False, read_only=False):
+        self.config_path = config_path
+        self.scripts_dir = scripts_dir
+        self.store = ScheduleStore(db_path, read_only)
+        self.owner = f"{os.getpid()}@{time.time():.0f}"
+        self.config = {}
+        self.jobs = {}
+        self._config_mtime = None
+        self.manager = manager
+        self.warm = warm
+        self.pool = None
+        self._active = {}   # nome -> thread da execução (com as tentativas)
+        self._stop = threading.Event()
+
+    def _load_config(self, force=False):
+        """Relê o config e os jobs se o arquivo mudou (sem tocar no banco)."""
+        try:
+            mtime = os.path.getmtime(self.config_path)
+        except OSError:
+            mtime = None
+        if not force and mtime == self._config_mtime:
+            return False
+        self._config_mtime = mtime
+        self.config = registry.load_config(self.config_path)
+        self.jobs = load_jobs(self.config)
+        return True
+
+    @staticmethod
+    def _needs_first_run(job, state):
+        # job novo ou com regra alterada: recomeça a contar a partir de agora
+        return state is None or state["next_run"] is None or state["rule"] != job.rule
+
+    def reload(self, force=False):
+        """Relê o config se ele mudou; jobs novos ganham o primeiro horário, removidos saem do estado ativo."""
+        if not self._load_config(force):
+            return False
+        states = self.store.states()
+        now = time.time()
+        for job in self.jobs.values():
+            if self._needs_first_run(job, states.get(job.name)):
+                self.store.set_next(job.name, job.first_run(now), job.rule)
+        log.info("%d job(s) agendado(s) carregado(s) de %s", len(self.jobs), self.config_path)
+        return True
+
+    def _ensure_manager(self):
+        """Cria o JobManager (e o pool aquecido, se houver) na primeira execução."""
+        if self.manager is None:
+            self.pool = WarmPool.from_config(self.config, enabled=True if self.warm else None)
+            if self.pool: self.pool.start()
+            self.manager = JobManager.from_config(self.config, log_dir=JOB_LOG_DIR, cwd=registry.BASE_DIR,
+                                                  metrics=MetricsStore(), backend=self.pool)
+        return self.manager
+
+    def due(self, now=None):
+        """[(job, horário previsto)] vencidos e que não estão rodando."""
+        now = time.time() if now is None else now
+        states = self.store.states()
+        out = []
+        for job in self.jobs.values():
+            next_run = (states.get(job.name) or {}).get("next_run")
+            if not job.enabled or next_run is None or next_run > now: continue
+            if job.name in self._active and self._active[job.name].is_alive(): continue
+            out.append((job, next_run))
+        return out
+
+    def fire(self, job, scheduled, now=None):
+        """Agenda o próximo horário (juntando os perdidos) e inicia a execução, se for o caso."""
+        now = time.time() if now is None else now
+        following = job.next_after(scheduled)
+        missed = 0
+        while following <= now:
+            following = job.next_after(following); missed += 1
+        self.store.set_next(job.name, following)
+        if not job.catch_up and now - scheduled > MISFIRE_GRACE:
+            log.info("%s: %d execução(ões) perdida(s) pulada(s) (catch_up desativado)", job.name, missed + 1)
+            return None
+        if missed:
+            log.info("%s: %d execução(ões) perdida(s) juntada(s) em uma", job.name, missed + 1)
+        self._ensure_manager()
+        thread = threading.Thread(target=self._execute, args=(job, scheduled), name=f"agendado-{job.name}", daemon=True)
+        self._active[job.name] = thread
+        thread.start()
+        return thread
+
+    def _execute(self, job, scheduled):
+        try:
+            path = registry.resolve_script(job.script, self.scripts_dir, self.config)
+        except LookupError as e:
+            log.error("%s: %s", job.name, e)
+            return
+        for attempt in range(1, job.retries + 2):
+            run = self.manager.submit(path, os.path.basename(path), job.args, job.timeout)
+            log.info("%s: tentativa %d iniciada (execução #%d)", job.name, attempt, run.id)
+            run.wait()
+            self.store.record(job.name, scheduled, run, attempt)
+            log.info("%s: tentativa %d terminou com %s (código %s) em %.1fs; log: %s",
+                     job.name, attempt, run.status, run.returncode, run.duration or 0, run.log_path)
+            if run.status not in (FAILED, TIMED_OUT):
+                return
+            if attempt <= job.retries and self._stop.wait(job.retry_delay):
+                return
+
+    def run_pending(self):
+        """Uma rodada: relê o config se mudou e dispara os vencidos. Devolve as threads iniciadas."""
+        self.reload()
+        return [t for t in (self.fire(job, scheduled) for job, scheduled in self.due()) if t]
+
+    def seconds_to_next(self):
+        states = self.store.states()
+        upcoming = [states[j.name]["next_run"] for j in self.jobs.values()
+                    if j.enabled and j.name in states and states[j.name]["next_run"]]
+        return max(0.0, min(upcoming) - time.time()) if upcoming else MAX_SLEEP
+
+    def run_forever(self):
+        if not self.store.acquire(self.owner):
+            raise RuntimeError(f"Outro agendador está ativo no banco {self.store.path}")
+        log.info("Agendador iniciado (%s)", self.owner)
+        try:
+            self.reload(force=True)
+            while not self._stop.is_set():
+                self.run_pending()
+                self.store.heartbeat(self.owner)
+                self._stop.wait(min(max(self.seconds_to_next(), TICK), MAX_SLEEP))
+        finally:
+            if self.manager: self.manager.cancel_all()
+            if self.pool: self.pool.close()
+            self.store.release(self.owner)
+            log.info("Agendador encerrado")
+
+    def run_once(self):
+        """Executa o que estiver vencido (com as tentativas) e volta."""
+        if not self.store.acquire(self.owner):
+            raise RuntimeError(f"Outro agendador está ativo no banco {self.store.path}")
+        try:
+            self.reload(force=True)
+            threads = self.run_pending()
+            for t in threads:
+                while t.is_alive():
+                    t.join(LOCK_STALE / 4)
+                    self.store.heartbeat(self.owner)
+            return len(threads)
+        finally:
+            if self.pool: self.pool.close()
+            self.store.release(self.owner)
+
+    def stop(self):
+        self._stop.set()
+
+    def describe(self):
+        """
+        Linhas para --list: nome, regra, próxima e última execução. Só lê o
+        banco; para job novo ou com regra alterada mostra o horário que o
+        agendador vai gravar ao carregá-lo.
+        """
+        self._load_config()
+        states = self.store.states()
+        now = time.time()
+        fmt = lambda ts: datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S") if ts else "-"
+        rows = []
+        for job in self.jobs.values():
+            state = states.get(job.name)
+            next_run = job.first_run(now) if self._needs_first_run(job, state) else state["next_run"]
+            state = state or {}
+            rows.append({"name": job.name, "script": job.script, "rule": job.rule, "enabled": job.enabled,
+                         "next_run": fmt(next_run), "last_run": fmt(state.get("last_run")),
+                         "last_status": state.get("last_status") or "-"})
+        return rows
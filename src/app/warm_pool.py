@@ -0,0 +1,403 @@
+"""
+Pool de processos "quentes" para executar scripts
+
+Alternativa ao runner.run (um `python` novo por execução): alguns processos
+ficam abertos com as dependências pesadas já importadas (pandas, docx,
+pdf2docx, customtkinter...) e executam o script com runpy.run_path, como
+se fosse `python script.py args`:
+
+ - sys.argv, diretório atual, variáveis de ambiente e sys.path são
+   trocados só durante a execução e restaurados depois
+ - print/stdout/stderr do script voltam linha a linha pelo pipe
+ - módulos importados pelo próprio script (fora do site-packages) são
+   descarregados no fim, para a próxima execução ver o código atual
+ - o processo é trocado depois de `max_jobs` execuções ou quando passa de
+   `max_rss` de memória; prazo esgotado ou cancelamento matam o processo
+   e um novo entra no lugar
+ - o pool tem pelo menos `max_concurrent` processos, para o JobManager
+   não iniciar um job sem processo livre; se não houver processo em
+   ACQUIRE_TIMEOUT (ou eles não conseguirem subir), o job roda pelo
+   runner.run normal
+
+A interface é a mesma do runner.run (RunResult, on_line, on_start), então
+o JobManager usa um ou outro sem diferença. Limitações: saída escrita
+direto no descritor 1/2 por bibliotecas em C não passa pelo pipe, estado
+global alterado pelo script nas bibliotecas pré-carregadas persiste até
+a troca do processo, e scripts que usam multiprocessing com spawn devem
+continuar no modo normal (o processo filho não reimporta o script).
+
+Config (scripts_config.json):
+  "warm_pool": {"enabled": true, "size": 2, "max_jobs": 50, "max_rss_mb": 1024,
+                "modules": ["pandas", "docx"]}
+"""
+import atexit
+import io
+import multiprocessing
+import os
+import queue
+import runpy
+import site
+import subprocess
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+
+from src.app import metrics, runner
+from src.app.jobs import DEFAULT_MAX_CONCURRENT
+
+DEFAULT_MODULES = ["pandas", "openpyxl", "xlwt", "docx", "pdf2docx", "pyarrow", "rich", "requests", "customtkinter"]
+DEFAULT_SIZE = 2
+DEFAULT_MAX_JOBS = 50
+DEFAULT_MAX_RSS = 1024 * 1024 ** 2
+POLL = 0.1
+READY_TIMEOUT = 300       # segundos para importar os módulos pré-carregados
+ACQUIRE_TIMEOUT = 30      # segundos esperando processo livre antes de rodar pelo runner.run
+SPAWN_RETRIES = 3         # falhas seguidas ao abrir processo antes de desistir
+SPAWN_RETRY_DELAY = 1
+
+
+def _library_dirs():
+    """Pastas da biblioteca padrão e de pacotes instalados (inclusive site-packages do usuário)."""
+    paths = sysconfig.get_paths()
+    dirs = {paths["stdlib"], paths["platstdlib"], paths["purelib"], paths["platlib"]}
+    try:
+        dirs.update(site.getsitepackages())
+    except AttributeError:   # virtualenv antigo sem getsitepackages
+        pass
+    user_site = site.getusersitepackages()
+    if user_site: dirs.add(user_site)
+    return tuple(os.path.normcase(os.path.realpath(p)) for p in dirs if p)
+
+
+_LIBRARY_DIRS = _library_dirs()
+
+
+# ---------------------------------------------------------------- processo de trabalho
+
+class _PipeWriter(io.TextIOBase):
+    """stdout/stderr do script: cada linha completa vira uma mensagem ("out", linha)."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._buffer = ""
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self._buffer += text
+        if "\n" in self._buffer:
+            *lines, self._buffer = self._buffer.split("\n")
+            for line in lines:
+                self._conn.send(("out", line + "\n"))
+        return len(text)
+
+    def flush(self):
+        if self._buffer:
+            self._conn.send(("out", self._buffer)); self._buffer = ""
+
+
+def _current_rss():
+    try:
+        with open("/proc/self/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def _is_library(module):
+    path = getattr(module, "__file__", None)
+    return not path or os.path.normcase(os.path.realpath(path)).startswith(_LIBRARY_DIRS)
+
+
+def _run_job(conn, job):
+    """Executa um script no próprio processo e devolve o código de saída."""
+    saved = (list(sys.argv), os.getcwd(), dict(os.environ), list(sys.path), sys.stdout, sys.stderr)
+    modules_before = set(sys.modules)
+    threads_before = set(threading.enumerate())
+    writer = _PipeWriter(conn)
+    code = 0
+    try:
+        sys.argv = [job["path"], *job["args"]]
+        os.environ.clear(); os.environ.update(job["env"])
+        if job["cwd"]: os.chdir(job["cwd"])
+        sys.path.insert(0, os.path.dirname(os.path.abspath(job["path"])))
+        sys.stdout = sys.stderr = writer
+        try:
+            runpy.run_path(job["path"], run_name="__main__")
+        except SystemExit as e:
+            if e.code is None: code = 0
+            elif isinstance(e.code, int): code = e.code
+            else: writer.write(f"{e.code}\n"); code = 1
+        except BaseException:
+            writer.write(traceback.format_exc()); code = 1
+        # como no `python script.py`, o script só termina quando as threads não-daemon dele terminam
+        for thread in set(threading.enumerate()) - threads_before:
+            if not thread.daemon: thread.join()
+    finally:
+        writer.flush()
+        sys.argv, cwd, env, sys.path, sys.stdout, sys.stderr = saved
+        os.chdir(cwd)
+        os.environ.clear(); os.environ.update(env)
+        for name in set(sys.modules) - modules_before:
+            if not _is_library(sys.modules[name]): del sys.modules[name]
+    return code
+
+
+def _worker_main(conn, modules):
+    loaded, failed = [], []
+    for name in modules:
+        try:
+            __import__(name); loaded.append(name)
+        except Exception:
+            failed.append(name)
+    conn.send(("ready", loaded, failed))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None: break
+        code = _run_job(conn, job)
+        conn.send(("done", code, _current_rss()))
+
+
+# ---------------------------------------------------------------- lado do orquestrador
+
+class _Worker:
+    def __init__(self, ctx, modules):
+        self.conn, child = ctx.Pipe()
+        # não-daemon: o script pode abrir processos próprios; WarmPool.close encerra no fim
+        self.process = ctx.Process(target=_worker_main, args=(child, modules))
+        self.process.start()
+        child.close()
+        self.jobs = 0
+        self.rss = None
+        self.base = None
+        self.loaded = self.failed = None
+
+    def wait_ready(self, timeout=None):
+        try:
+            if not self.conn.poll(timeout): return False
+            _, self.loaded, self.failed = self.conn.recv()
+        except (EOFError, OSError):
+            return False   # morreu durante o aquecimento
+        return True
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(2)
+        if self.process.is_alive(): self.process.kill()
+        self.conn.close()
+
+
+class _JobHandle:
+    """O que on_start recebe: mesma interface de Popen usada por runner.terminate e metrics.ProcessSampler."""
+
+    warm = True   # processo reaproveitado: CPU, memória e I/O contam a partir de `base`
+
+    def __init__(self, worker):
+        self._worker = worker
+        self.pid = worker.process.pid
+        self.base = worker.base
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        if self.returncode is None: self._worker.process.terminate()
+
+    def kill(self):
+        if self.returncode is None: self._worker.process.kill()
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.returncode is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired("warm-worker", timeout)
+            time.sleep(POLL / 2)
+        return self.returncode
+
+
+class WarmPool:
+    def __init__(self, size=DEFAULT_SIZE, modules=None, max_jobs=DEFAULT_MAX_JOBS, max_rss=DEFAULT_MAX_RSS):
+        self.size = max(1, int(size))
+        self.modules = list(DEFAULT_MODULES if modules is None else modules)
+        self.max_jobs = max_jobs
+        self.max_rss = max_rss
+        self.ctx = multiprocessing.get_context("spawn")
+        if hasattr(self.ctx, "set_executable"):
+            self.ctx.set_executable(runner.python_executable())
+        self._idle = queue.Queue()
+        self._workers = set()   # todos os processos abertos, livres ou ocupados
+        self._starting = 0      # processos agendados para abrir
+        self._lock = threading.Lock()
+        self._closed = False
+        self.recycled = 0
+        self.spawn_failures = 0
+
+    @classmethod
+    def from_config(cls, config, enabled=None):
+        """
+        WarmPool a partir de config["warm_pool"], ou None se desativado
+        (enabled=True força o pool mesmo sem a chave). O tamanho nunca fica
+        abaixo do max_concurrent do config.
+        """
+        spec = config.get("warm_pool") or {}
+        if not (spec.get("enabled") if enabled is None else enabled): return None
+        size = max(int(spec.get("size", DEFAULT_SIZE)), int(config.get("max_concurrent", DEFAULT_MAX_CONCURRENT)))
+        return cls(size, spec.get("modules"), spec.get("max_jobs", DEFAULT_MAX_JOBS),
+                   spec.get("max_rss_mb", DEFAULT_MAX_RSS // 1024 ** 2) * 1024 ** 2)
+
+    def start(self, wait=False):
+        """Abre os processos (o aquecimento roda em segundo plano, a menos que wait=True)."""
+        atexit.register(self.close)
+        threads = [self._start_spawn() for _ in range(self.size)]
+        if wait:
+            for t in threads: t.join()
+        return self
+
+    def _start_spawn(self, delay=0):
+        with self._lock:
+            self._starting += 1
+        thread = threading.Thread(target=self._spawn, args=(delay,), daemon=True)
+        thread.start()
+        return thread
+
+    def _spawn(self, delay=0):
+        time.sleep(delay)
+        worker = None
+        with self._lock:
+            self._starting -= 1
+            if self._closed: return
+            try:
+                worker = _Worker(self.ctx, self.modules)
+                self._workers.add(worker)
+            except Exception:
+                pass
+        ready = worker is not None and worker.wait_ready(READY_TIMEOUT)
+        # close() pode ter sido chamado durante o aquecimento
+        if ready and not self._closed:
+            self.spawn_failures = 0
+            self._idle.put(worker)
+            return
+        if worker is not None: self._discard(worker)
+        if not ready and not self._closed:
+            self.spawn_failures += 1
+            if self.spawn_failures < SPAWN_RETRIES: self._start_spawn(SPAWN_RETRY_DELAY)
+
+    def _discard(self, worker):
+        with self._lock:
+            self._workers.discard(worker)
+        worker.stop()
+
+    def _replace(self, worker):
+        self._discard(worker)
+        self.recycled += 1
+        self._start_spawn()
+
+    def _release(self, worker):
+        if self._closed or worker.jobs >= self.max_jobs or (self.max_rss and (worker.rss or 0) > self.max_rss):
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+
+    def _acquire(self, job):
+        """
+        Entrega o job a um processo livre (espera se todos estiverem ocupados).
+        Devolve None se o pool estiver fechado, sem processos ou sem processo
+        livre em ACQUIRE_TIMEOUT.
+        """
+        deadline = time.monotonic() + ACQUIRE_TIMEOUT
+        while not self._closed:
+            with self._lock:
+                if not self._workers and not self._starting: return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: return None
+            try:
+                worker = self._idle.get(timeout=min(1, remaining))
+            except queue.Empty:
+                continue
+            try:
+                # amostra antes do envio: o script começa assim que o processo recebe o job
+                worker.base = metrics.sample(worker.process.pid, peak=False)
+                worker.conn.send(job)
+                return worker
+            except OSError:
+                self._replace(worker)   # morreu enquanto estava livre
+        return None
+
+    def run(self, path, args=(), on_line=None, timeout=None, env=None, cwd=None, on_start=None):
+        """Mesmo contrato de runner.run, executando num processo do pool."""
+        started = time.perf_counter()
+        worker = self._acquire({"path": os.path.abspath(path), "args": [str(a) for a in args],
+                                "env": runner.child_env(env), "cwd": cwd})
+        if worker is None:
+            return runner.run(path, args, on_line, timeout=timeout, env=env, cwd=cwd, on_start=on_start)
+        handle = _JobHandle(worker)
+        if on_start: on_start(handle)
+        deadline = None if not timeout else time.monotonic() + timeout
+        kill_at = None
+        timed_out = False
+        try:
+            while True:
+                now = time.monotonic()
+                if deadline is not None and not timed_out and now >= deadline:
+                    timed_out = True
+                    handle.terminate()
+                    kill_at = now + runner.TERMINATE_GRACE
+                elif kill_at is not None and now >= kill_at:
+                    handle.kill()
+                try:
+                    if not worker.conn.poll(POLL): continue
+                    message = worker.conn.recv()
+                except (EOFError, OSError):
+                    # processo morreu (cancelado, prazo esgotado ou falha): entra outro no lugar
+                    worker.process.join(1)
+                    handle.returncode = worker.process.exitcode if worker.process.exitcode is not None else -1
+                    self._replace(worker)
+                    break
+                if message[0] == "out":
+                    if on_line: on_line(message[1])
+                elif message[0] == "done":
+                    handle.returncode, worker.rss = message[1], message[2]
+                    worker.jobs += 1
+                    self._release(worker)
+                    break
+        except BaseException:
+            if handle.returncode is None:
+                handle.kill()
+                self._replace(worker)
+            raise
+        code = runner.TIMEOUT_EXIT_CODE if timed_out else handle.returncode
+        return runner.RunResult(code, time.perf_counter() - started, timed_out)
+
+    def close(self):
+        """Encerra todos os processos, inclusive os ocupados e os que ainda estão aquecendo."""
+        with self._lock:
+            self._closed = True
+            workers, self._workers = list(self._workers), set()
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for worker in workers:
+            worker.stop()
@@ -1,25 +1,222 @@
+"""
+Log compartilhado por scripts, orquestrador e subprocessos
+
+ - quem loga só põe o registro numa fila (QueueHandler); a escrita em disco
+   e no console fica numa thread própria (QueueListener), então um log
+   dentro de laço não espera o disco
+ - um arquivo por programa em `log_dir` (<nome>.log), rotacionado à
+   meia-noite e ao passar de `max_bytes`; os antigos são comprimidos em
+   .gz e só os `backup_count` mais recentes ficam
+ - formato texto ou JSON lines (json_format=True ou RPA_LOG_JSON=1), com
+   job_id/script_id vindos de RPA_JOB_ID/RPA_SCRIPT_ID, que o orquestrador
+   define para cada script que executa
+ - setup_logging é idempotente: chamar de novo com as mesmas opções só
+   ajusta o nível; com outro destino/formato, refaz a configuração
+
+Uso:
+  from src.core.logger import setup_logging
+  log = setup_logging("DivisorDadosExecel")
+  log.info("arquivo dividido", extra={"partes": 12})
+"""
+import atexit
+import copy
+import gzip
+import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import shutil
+import sys
+import time
+from datetime import datetime, timedelta
+
+DEFAULT_LOG_DIR = os.environ.get("RPA_LOG_DIR", "logs")
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 14
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# atributos padrão do LogRecord; o resto veio de extra= e vai para o JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "job_id", "script_id"}
+
+_listener = None
+_queue_handler = None
+_settings = None
+
+
+class ContextFilter(logging.Filter):
+    """Preenche job_id/script_id a partir do ambiente, se o registro não trouxer."""
+
+    def __init__(self, job_id=None, script_id=None):
+        super().__init__()
+        self.job_id = job_id or os.environ.get("RPA_JOB_ID")
+        self.script_id = script_id or os.environ.get("RPA_SCRIPT_ID")
+
+    def filter(self, record):
+        if getattr(record, "job_id", None) is None: record.job_id = self.job_id
+        if getattr(record, "script_id", None) is None: record.script_id = self.script_id
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Um objeto JSON por linha."""
+
+    def format(self, record):
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "pid": record.process,
+            "thread": record.threadName,
+            "job_id": getattr(record, "job_id", None),
+            "script_id": getattr(record, "script_id", None),
+        }
+        data.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Como o QueueHandler, mas sem formatar a mensagem: quem formata é o handler final (texto ou JSON)."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RotatingGzipFileHandler(logging.handlers.BaseRotatingHandler):
+    """
+    Rotaciona à meia-noite e quando o arquivo passaria de max_bytes.
+    O arquivo rotacionado ganha a data/hora da rotação e é comprimido.
+    """
+
+    def __init__(self, filename, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT,
+                 encoding="utf-8", compress=True):
+        super().__init__(filename, "a", encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        if compress:
+            self.namer = lambda name: name + ".gz"
+            self.rotator = _gzip_rotator
+        self.rollover_at = self._next_midnight()
+
+    @staticmethod
+    def _next_midnight():
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rollover_at:
+            return os.path.exists(self.baseFilename)
+        if self.max_bytes > 0:
+            if self.stream is None: self.stream = self._open()
+            size = self.stream.tell()
+            return size > 0 and size + len(self.format(record)) + 1 >= self.max_bytes
+        return False
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        dest = self.rotation_filename(f"{self.baseFilename}.{stamp}")
+        n = 1
+        while os.path.exists(dest):
+            dest = self.rotation_filename(f"{self.baseFilename}.{stamp}.{n}"); n += 1
+        if os.path.exists(self.baseFilename):
+            self.rotate(self.baseFilename, dest)
+        self._delete_old()
+        self.rollover_at = self._next_midnight()
+
+    def _delete_old(self):
+        if self.backup_count <= 0: return
+        folder, base = os.path.split(self.baseFilename)
+        old = sorted((os.path.join(folder, f) for f in os.listdir(folder) if f.startswith(base + ".")),
+                     key=os.path.getmtime)
+        for path in old[:-self.backup_count]:
+            try: os.remove(path)
+            except OSError: pass
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _program_name():
+    name = os.path.splitext(os.path.basename(sys.argv[0] or ""))[0]
+    return name if name and name != "-c" else "app"
+
+
+def setup_logging(name=None, log_dir=None, level=logging.INFO, json_format=None, console=True,
+                  max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT, file_name=None):
+    """
+    Configura o log do processo e devolve o logger `name`.
+    O arquivo é <log_dir>/<file_name>.log (padrão: RPA_SCRIPT_ID ou o nome
+    do programa): um arquivo por programa, sem dois processos rotacionando
+    o mesmo arquivo. Chamadas seguintes com as mesmas opções só ajustam o
+    nível; com opções diferentes, a configuração anterior é encerrada.
+    """
+    global _listener, _queue_handler, _settings
+    root = logging.getLogger()
+    root.setLevel(level)
+    if json_format is None:
+        json_format = os.environ.get("RPA_LOG_JSON", "").lower() in ("1", "true", "sim")
+    log_dir = log_dir or DEFAULT_LOG_DIR
+    file_name = file_name or os.environ.get("RPA_SCRIPT_ID") or _program_name()
+    settings = (os.path.abspath(log_dir), file_name, bool(json_format), bool(console), max_bytes, backup_count)
+    previous = _settings
+    if _listener is not None:
+        if settings == previous:
+            return logging.getLogger(name)
+        shutdown_logging()
+
+    os.makedirs(log_dir, exist_ok=True)
+
+    handlers = [RotatingGzipFileHandler(os.path.join(log_dir, f"{file_name}.log"), max_bytes, backup_count)]
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+
+    _queue_handler = _QueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(ContextFilter())
+    root.addHandler(_queue_handler)
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    _settings = settings
+    atexit.unregister(shutdown_logging)
+    atexit.register(shutdown_logging)
+    if previous is not None:
+        logging.getLogger(__name__).info("log reconfigurado (antes: %s)", os.path.join(previous[0], f"{previous[1]}.log"))
+    return logging.getLogger(name)
+
+
+def shutdown_logging():
+    """Esvazia a fila, fecha os arquivos e remove o handler (setup_logging pode ser chamado de novo)."""
+    global _listener, _queue_handler, _settings
+    if _listener is None: return
+    _listener.stop()
+    for handler in _listener.handlers: handler.close()
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener = _queue_handler = _settings = None
+
 
 class Logger:
-    def __init__(self, log_dir='logs', log_level=logging.INFO):
+    """Interface antiga, mantida por compatibilidade: Logger(log_dir).get_logger()."""
+
+    def __init__(self, log_dir='logs', log_level=logging.INFO, json_format=None):
         self.log_dir = log_dir
-        os.makedirs(self.log_dir, exist_ok=True)
-        
-        log_filename = datetime.now().strftime('%Y-%m-%d.log')
-        log_path = os.path.join(self.log_dir, log_filename)
-        
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_path, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
-        
-        self.logger = logging.getLogger(__name__)
-    
+        self.logger = setup_logging(__name__, log_dir, log_level, json_format)
+
     def get_logger(self):
-        return self.logger
\ No newline at end of file
+        return self.logger
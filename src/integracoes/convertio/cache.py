@@ -0,0 +1,203 @@
+"""
+Cache local de resultados Convertio, por conteúdo
+
+A chave é o SHA-256 do conteúdo do arquivo de entrada (lido em blocos, sem
+carregar o arquivo em memória) combinado com o formato de saída e as opções
+(OCR etc.). Num acerto a saída é copiada do cache sem nenhuma chamada de rede.
+
+Os resultados ficam em `<raiz>/objects/` e o índice num SQLite, com o hash de
+cada saída para checar integridade na leitura. Acima de `max_bytes` os itens
+menos usados recentemente são removidos (LRU).
+
+Uso:
+  python -m src.integracoes.convertio.cache stats
+  python -m src.integracoes.convertio.cache list
+  python -m src.integracoes.convertio.cache prune --max-size 1GB
+  python -m src.integracoes.convertio.cache verify
+  python -m src.integracoes.convertio.cache clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from src.utils.sizes import format_size, parse_size
+
+HASH_CHUNK = 1024 * 1024
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+DEFAULT_ROOT = os.environ.get(
+    "CONVERTIO_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "rpa-utilitarios", "convertio"))
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.objects = os.path.join(root, "objects")
+        os.makedirs(self.objects, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                source_name TEXT,
+                outputformat TEXT,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )""")
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    @staticmethod
+    def key_for(input_path, outputformat, options=None):
+        params = json.dumps({"outputformat": outputformat, "options": options or {}}, sort_keys=True)
+        return hashlib.sha256(f"{file_sha256(input_path)}:{params}".encode()).hexdigest()
+
+    def _object_path(self, key):
+        return os.path.join(self.objects, key[:2], key)
+
+    def get(self, key, output_path):
+        """Copia o resultado para `output_path`; devolve False em falta ou se o item estiver corrompido."""
+        with self._lock:
+            row = self._db.execute("SELECT sha256 FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        obj = self._object_path(key)
+        if not os.path.exists(obj) or file_sha256(obj) != row[0]:
+            self.remove(key)
+            return False
+        shutil.copyfile(obj, output_path)
+        with self._lock:
+            self._db.execute("UPDATE entries SET last_access = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return True
+
+    def put(self, key, result_path, source_name=None, outputformat=None):
+        obj = self._object_path(key)
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        # copia para temporário + rename: leitores nunca veem um objeto pela metade
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(obj), suffix=".tmp")
+        h = hashlib.sha256(); size = 0
+        with os.fdopen(fd, "wb") as out, open(result_path, "rb") as src:
+            for chunk in iter(lambda: src.read(HASH_CHUNK), b""):
+                h.update(chunk); out.write(chunk); size += len(chunk)
+        os.replace(tmp, obj)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, size, sha256, source_name, outputformat, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)", (key, size, h.hexdigest(), source_name, outputformat, now, now))
+            self._db.commit()
+        self.prune(self.max_bytes)
+
+    def remove(self, key):
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+        try: os.remove(self._object_path(key))
+        except FileNotFoundError: pass
+
+    def entries(self):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, size, source_name, outputformat, created_at, last_access, hits"
+                " FROM entries ORDER BY last_access DESC").fetchall()
+        cols = ("key", "size", "source_name", "outputformat", "created_at", "last_access", "hits")
+        return [dict(zip(cols, row)) for row in rows]
+
+    def total_size(self):
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def prune(self, max_bytes):
+        """Remove os itens menos usados recentemente até o total caber em `max_bytes`."""
+        removed = []
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= max_bytes:
+                return removed
+            for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall():
+                if total <= max_bytes: break
+                removed.append(key); total -= size
+        for key in removed:
+            self.remove(key)
+        return removed
+
+    def verify(self):
+        """Confere o hash de todos os itens e remove os corrompidos. Devolve as chaves removidas."""
+        bad = []
+        for entry in self.entries():
+            with self._lock:
+                expected = self._db.execute("SELECT sha256 FROM entries WHERE key = ?", (entry["key"],)).fetchone()
+            obj = self._object_path(entry["key"])
+            if expected is None or not os.path.exists(obj) or file_sha256(obj) != expected[0]:
+                bad.append(entry["key"])
+        for key in bad:
+            self.remove(key)
+        return bad
+
+    def clear(self):
+        for entry in self.entries():
+            self.remove(entry["key"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspeciona e limpa o cache de conversões Convertio.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="pasta do cache")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="resumo do cache")
+    sub.add_parser("list", help="lista os itens (mais recentes primeiro)")
+    prune = sub.add_parser("prune", help="remove itens menos usados até caber no limite")
+    prune.add_argument("--max-size", type=parse_size, required=True, help="ex.: 500MB, 2GB")
+    sub.add_parser("verify", help="checa a integridade e remove itens corrompidos")
+    sub.add_parser("clear", help="esvazia o cache")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.root)
+    try:
+        if args.cmd == "stats":
+            entries = cache.entries()
+            print(f"Pasta: {cache.root}")
+            print(f"Itens: {len(entries)}  Tamanho: {format_size(cache.total_size())}  "
+                  f"Acertos: {sum(e['hits'] for e in entries)}")
+        elif args.cmd == "list":
+            for e in cache.entries():
+                last = datetime.fromtimestamp(e["last_access"]).strftime("%Y-%m-%d %H:%M")
+                print(f"{e['key'][:12]}  {format_size(e['size']):>10}  {e['outputformat'] or '':<5} "
+                      f"{e['hits']:>4} hits  {last}  {e['source_name'] or ''}")
+        elif args.cmd == "prune":
+            removed = cache.prune(args.max_size)
+            print(f"{len(removed)} item(ns) removido(s). Tamanho atual: {format_size(cache.total_size())}")
+        elif args.cmd == "verify":
+            bad = cache.verify()
+            print(f"{len(bad)} item(ns) corrompido(s) removido(s).")
+        elif args.cmd == "clear":
+            cache.clear()
+            print("Cache esvaziado.")
+    finally:
+        cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Cliente da API Convertio, independente da interface gráfica.
+
+Mantém uma única `requests.Session` com pool de conexões (sem novo handshake
+TCP+TLS a cada convert/upload/status/download) e converte listas de arquivos
+em paralelo num pool de threads limitado a `max_concurrency`, o número de
+conversões simultâneas que a conta permite na API. O status de todas as
+conversões é consultado por um único PollScheduler (ver polling.py).
+Com um ResultCache (ver cache.py), entradas já convertidas com as mesmas
+opções são servidas do disco, sem rede. Upload e download passam pela camada
+de E/S com buffers grandes e retomada (ver transfer.py).
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.integracoes.convertio import transfer
+from src.integracoes.convertio.polling import AdaptiveEta, PollScheduler
+
+API_BASE = "https://api.convertio.co"
+RETRY_STATUS = (429, 502, 503, 504)
+# POST cria a conversão (e é cobrado): só repete quando a API com certeza não processou o pedido;
+# um 502/504 do proxy pode chegar depois de a conversão já ter sido criada
+RETRY_STATUS_POST = (429, 503)
+
+
+class ConvertioError(Exception):
+    pass
+
+
+def build_options(ocr=False, langs=None, pages=None):
+    """Monta o campo `options` do POST /convert (None quando não há opções)."""
+    if not ocr:
+        return None
+    opts = {"ocr_enabled": True, "ocr_settings": {}}
+    if langs: opts["ocr_settings"]["langs"] = [l.strip() for l in langs.split(",")] if isinstance(langs, str) else list(langs)
+    if pages: opts["ocr_settings"]["page_nums"] = pages
+    return opts
+
+
+def _progress_msg(label, done, total, mbps):
+    pct = f" {done / total * 100:.0f}%" if total else ""
+    return f"{label}:{pct} {done / 1024 ** 2:.1f} MB ({mbps:.1f} MB/s)"
+
+
+def default_output_path(input_path, outputformat, output_dir=None):
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir or os.path.dirname(input_path), f"{stem}_conv.{outputformat}")
+
+
+class ConvertioClient:
+    def __init__(self, apikey, base_url=API_BASE, max_concurrency=4, timeout=60, retries=3, session=None,
+                 polling=None, deadline=None, cache=None, buffer_size=transfer.DEFAULT_BUFFER):
+        """
+        polling: estratégia de polling (padrão: AdaptiveEta).
+        deadline: prazo em segundos para cada conversão terminar (None = sem prazo).
+        cache: ResultCache para reaproveitar conversões já feitas (None = sem cache).
+        buffer_size: tamanho dos blocos de leitura/escrita no upload e no download.
+        """
+        self.apikey = apikey
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.session = session or requests.Session()
+        # conexões suficientes para todos os jobs simultâneos + downloads
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency * 2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self.deadline = deadline
+        self.cache = cache
+        self.buffer_size = buffer_size
+        self.poller = PollScheduler(self.status, polling or AdaptiveEta(), failed_exc=ConvertioError)
+
+    def close(self):
+        self.poller.stop()
+        self.session.close()
+
+    def poll_metrics(self):
+        return self.poller.metrics()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- HTTP ---------------------------------------------------------------
+
+    def _request(self, method, url, check=True, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        body = kwargs.get("data")
+        retry_status = RETRY_STATUS_POST if method.upper() == "POST" else RETRY_STATUS
+        for attempt in range(self.retries + 1):
+            if hasattr(body, "seek"): body.seek(0)  # reenvia o arquivo desde o início
+            r = self.session.request(method, url, **kwargs)
+            if r.status_code not in retry_status or attempt == self.retries:
+                break
+            wait = r.headers.get("Retry-After")
+            time.sleep(float(wait) if wait and wait.isdigit() else 2 ** attempt)
+        if check: r.raise_for_status()
+        return r
+
+    def _api(self, method, path, **kwargs):
+        return self._parse(self._request(method, f"{self.base_url}{path}", check=False, **kwargs))
+
+    def _parse(self, r):
+        try:
+            js = r.json()
+        except ValueError:
+            r.raise_for_status()
+            raise ConvertioError(f"Resposta inválida da API: {r.text[:200]}")
+        if js.get("status") != "ok":
+            raise ConvertioError(js.get("error") or f"Resposta inválida da API: {js}")
+        return js["data"]
+
+    # ---- etapas -------------------------------------------------------------
+
+    def start(self, outputformat, options=None):
+        """POST /convert: abre uma conversão com upload e devolve o id."""
+        data = {"apikey": self.apikey, "input": "upload", "outputformat": outputformat}
+        if options: data["options"] = options
+        return self._api("POST", "/convert", json=data)["id"]
+
+    def upload(self, cid, input_path, on_progress=None):
+        """on_progress(feito, total, MB/s) é chamado durante o envio."""
+        fname = os.path.basename(input_path)
+        r = transfer.upload(self.session, f"{self.base_url}/convert/{cid}/{fname}", input_path,
+                            self.buffer_size, self.retries, self.timeout, on_progress)
+        return self._parse(r)
+
+    def status(self, cid):
+        return self._api("GET", f"/convert/{cid}/status", params={"apikey": self.apikey})
+
+    def wait(self, cid, on_status=None, deadline=None):
+        """Aguarda o fim da conversão; o polling fica a cargo do scheduler compartilhado."""
+        return self.poller.submit(cid, on_status, deadline or self.deadline).result()
+
+    def download(self, url, output_path, on_progress=None):
+        return transfer.download(self.session, url, output_path, self.buffer_size, self.retries,
+                                 self.timeout, on_progress)
+
+    # ---- alto nível ---------------------------------------------------------
+
+    def convert_file(self, input_path, outputformat, options=None, output_path=None, on_event=None):
+        """Converte um arquivo de ponta a ponta e devolve o caminho da saída."""
+        log = (lambda msg: on_event(input_path, msg)) if on_event else (lambda msg: None)
+        output_path = output_path or default_output_path(input_path, outputformat)
+        key = None
+        if self.cache:
+            key = self.cache.key_for(input_path, outputformat, options)
+            if self.cache.get(key, output_path):
+                log(f"Resultado servido do cache: {output_path}")
+                return output_path
+        with self._slots:
+            log("Iniciando conversão...")
+            cid = self.start(outputformat, options)
+            log(f"Conversion ID: {cid}")
+            self.upload(cid, input_path, on_progress=lambda done, total, mbps: log(_progress_msg("Enviando", done, total, mbps)))
+            log("Arquivo enviado...")
+            st = self.wait(cid, on_status=lambda s: log(f"[{s['step']}] {s.get('step_percent', 0)}%"))
+        log(f"Baixando para {output_path}...")
+        self.download(st["output"]["url"], output_path,
+                      on_progress=lambda done, total, mbps: log(_progress_msg("Baixando", done, total, mbps)))
+        if key:
+            try: self.cache.put(key, output_path, os.path.basename(input_path), outputformat)
+            except OSError as e: log(f"Aviso: não foi possível gravar no cache ({e})")
+        log("Concluído com sucesso!")
+        return output_path
+
+    def convert_many(self, input_paths, outputformat, options=None, output_dir=None, on_event=None):
+        """
+        Converte vários arquivos, até `max_concurrency` ao mesmo tempo.
+        Retorna [(input, output ou None, erro ou None)] na ordem de entrada.
+        """
+        def job(path):
+            try:
+                out = self.convert_file(path, outputformat, options,
+                                        default_output_path(path, outputformat, output_dir), on_event)
+                return path, out, None
+            except Exception as e:
+                if on_event: on_event(path, f"❌ Erro: {e}")
+                return path, None, e
+
+        if output_dir: os.makedirs(output_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            return list(pool.map(job, input_paths))
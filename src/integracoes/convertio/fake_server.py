@@ -0,0 +1,186 @@
+"""
+Servidor HTTP local que imita a API Convertio, para testar o cliente sem rede
+nem consumo de cota.
+
+Endpoints: POST /convert, PUT /convert/{id}/{arquivo}, GET /convert/{id}/status
+e GET /download/{id}. A "conversão" devolve o próprio arquivo enviado e leva
+`convert_seconds` para terminar. Acima de `max_concurrent` conversões abertas
+responde erro, como a API real. O download aceita `Range` (206) e
+`drop_download_at=N` corta a próxima resposta de download após N bytes, para
+testar a retomada.
+
+Uso:
+  python -m src.integracoes.convertio.fake_server --port 8765
+  (no código) server = FakeConvertioServer(); server.start(); ... server.base_url
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        if self.server.fake.verbose: super().log_message(fmt, *args)
+
+    def _send(self, code, body=b"", content_type="application/json", headers=None):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items(): self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, payload, code=200):
+        self._send(code, json.dumps(payload).encode())
+
+    def _error(self, msg, code=422):
+        self._json({"code": code, "status": "error", "error": msg}, code)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def do_POST(self):
+        fake = self.server.fake
+        fake.count("convert")
+        if urlparse(self.path).path != "/convert":
+            return self._error("Not found", 404)
+        data = json.loads(self._read_body() or b"{}")
+        if data.get("apikey") != fake.apikey:
+            return self._error("Invalid API Key", 401)
+        with fake.lock:
+            active = sum(1 for j in fake.jobs.values() if j["finished_at"] is None)
+            if active >= fake.max_concurrent:
+                return self._error("Too many concurrent conversions", 422)
+            cid = uuid.uuid4().hex
+            fake.jobs[cid] = {"format": data.get("outputformat"), "options": data.get("options"),
+                              "content": None, "uploaded_at": None, "finished_at": None}
+            fake.peak_concurrent = max(fake.peak_concurrent, active + 1)
+        self._json({"code": 200, "status": "ok", "data": {"id": cid, "minutes": 0}})
+
+    def do_PUT(self):
+        fake = self.server.fake
+        fake.count("upload")
+        m = re.fullmatch(r"/convert/(\w+)/(.+)", urlparse(self.path).path)
+        job = m and fake.jobs.get(m.group(1))
+        if not job:
+            return self._error("Conversion not found", 404)
+        content = self._read_body()
+        job["content"] = content; job["uploaded_at"] = time.monotonic()
+        self._json({"code": 200, "status": "ok", "data": {"id": m.group(1), "file": m.group(2), "size": len(content)}})
+
+    def do_GET(self):
+        fake = self.server.fake
+        path = urlparse(self.path).path
+        m = re.fullmatch(r"/convert/(\w+)/status", path)
+        if m:
+            fake.count("status")
+            job = fake.jobs.get(m.group(1))
+            if not job:
+                return self._error("Conversion not found", 404)
+            if job["uploaded_at"] is None:
+                return self._json({"code": 200, "status": "ok", "data": {"id": m.group(1), "step": "wait", "step_percent": 0}})
+            pct = min(100, int((time.monotonic() - job["uploaded_at"]) / fake.convert_seconds * 100)) if fake.convert_seconds else 100
+            data = {"id": m.group(1), "step": "convert", "step_percent": pct, "minutes": 0}
+            if pct >= 100:
+                with fake.lock:
+                    if job["finished_at"] is None: job["finished_at"] = time.monotonic()
+                data.update(step="finish", output={"url": f"{fake.base_url}/download/{m.group(1)}",
+                                                   "size": str(len(job["content"]))})
+            return self._json({"code": 200, "status": "ok", "data": data})
+        m = re.fullmatch(r"/download/(\w+)", path)
+        if m:
+            fake.count("download")
+            job = fake.jobs.get(m.group(1))
+            if not job or job["finished_at"] is None:
+                return self._send(404, b"not found", "text/plain")
+            content = job["content"]; start = 0
+            rng = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+            if rng:
+                start = int(rng.group(1))
+                if start >= len(content):
+                    return self._send(416, b"", headers={"Content-Range": f"bytes */{len(content)}"})
+            body = content[start:]
+            code = 206 if rng else 200
+            headers = {"Content-Range": f"bytes {start}-{len(content) - 1}/{len(content)}"} if rng else {}
+            with fake.lock:
+                drop, fake.drop_download_at = fake.drop_download_at, None
+            if drop is not None and drop < len(body):
+                # anuncia o corpo inteiro mas corta a conexão no meio
+                self.send_response(code)
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in headers.items(): self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body[:drop]); self.wfile.flush()
+                self.close_connection = True
+                return
+            return self._send(code, body, "application/octet-stream", headers)
+        self._error("Not found", 404)
+
+
+class FakeConvertioServer:
+    def __init__(self, host="127.0.0.1", port=0, apikey="teste", convert_seconds=0.5,
+                 max_concurrent=10, verbose=False):
+        self.apikey = apikey
+        self.convert_seconds = convert_seconds
+        self.max_concurrent = max_concurrent
+        self.verbose = verbose
+        self.jobs = {}
+        self.requests = {}
+        self.peak_concurrent = 0
+        self.drop_download_at = None
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, endpoint):
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown(); self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API Convertio.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--apikey", default="teste")
+    parser.add_argument("--convert-seconds", type=float, default=2.0)
+    parser.add_argument("--max-concurrent", type=int, default=10)
+    args = parser.parse_args(argv)
+    server = FakeConvertioServer(args.host, args.port, args.apikey, args.convert_seconds,
+                                 args.max_concurrent, verbose=True)
+    print(f"API Convertio falsa em {server.base_url} (apikey={args.apikey})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
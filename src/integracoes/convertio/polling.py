@@ -0,0 +1,214 @@
+"""
+Polling de status das conversões Convertio
+
+Estratégias plugáveis para decidir quando consultar `/status` de novo:
+ - FixedInterval: intervalo fixo (comportamento antigo, 1s)
+ - ExponentialBackoff: intervalo crescente com jitter
+ - AdaptiveEta: estima o tempo restante pela velocidade do `step_percent`
+   e consulta perto do fim previsto; sem progresso, cai no backoff
+
+Todas as conversões em andamento são consultadas por um único PollScheduler
+(uma thread e uma fila por horário), em vez de uma thread dormindo por job.
+Cada job tem prazo opcional e o scheduler expõe métricas (polls por job e
+tempo até terminar, sobre os últimos METRICS_WINDOW jobs) para calibrar as
+estratégias.
+"""
+import collections
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+METRICS_WINDOW = 1000  # jobs encerrados guardados para metrics()
+
+
+class ConvertioTimeout(Exception):
+    pass
+
+
+class PollJob:
+    def __init__(self, cid, on_status=None, deadline=None):
+        self.cid = cid
+        self.on_status = on_status
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + deadline if deadline else None
+        self.finished_at = None
+        self.polls = 0
+        self.errors = 0
+        self.samples = []  # (instante, step_percent)
+        self.future = Future()
+
+
+class FixedInterval:
+    def __init__(self, interval=1.0):
+        self.interval = interval
+
+    def next_interval(self, job):
+        return self.interval
+
+
+class ExponentialBackoff:
+    def __init__(self, initial=1.0, factor=1.5, max_interval=30.0, jitter=0.2):
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+        self.jitter = jitter
+
+    def _jitter(self, interval):
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def next_interval(self, job):
+        return self._jitter(min(self.max_interval, self.initial * self.factor ** max(job.polls - 1, 0)))
+
+
+class AdaptiveEta(ExponentialBackoff):
+    """
+    Usa as últimas amostras de `step_percent` para estimar a taxa de progresso
+    e agenda a próxima consulta para `eta_fraction` do tempo restante previsto.
+    """
+
+    def __init__(self, min_interval=0.5, eta_fraction=0.5, window=5, **backoff):
+        super().__init__(**backoff)
+        self.min_interval = min_interval
+        self.eta_fraction = eta_fraction
+        self.window = window
+
+    def estimate_remaining(self, job):
+        samples = job.samples[-self.window:]
+        if len(samples) < 2:
+            return None
+        (t0, p0), (t1, p1) = samples[0], samples[-1]
+        if p1 <= p0 or t1 <= t0:
+            return None
+        return (100 - p1) / ((p1 - p0) / (t1 - t0))
+
+    def next_interval(self, job):
+        remaining = self.estimate_remaining(job)
+        if remaining is None:
+            return super().next_interval(job)
+        interval = max(self.min_interval, min(self.max_interval, remaining * self.eta_fraction))
+        return self._jitter(interval)
+
+
+class PollScheduler:
+    """
+    Consulta o status de vários jobs numa única thread.
+
+    status_fn(cid) -> dict com `step` e `step_percent` (ConvertioClient.status).
+    submit() devolve um Future resolvido com o status final ("finish"),
+    ou com exceção em "failed", prazo estourado ou `max_errors` falhas seguidas.
+    Depois de stop(), os Futures pendentes são cancelados e submit() falha.
+    """
+
+    def __init__(self, status_fn, strategy=None, max_errors=3, failed_exc=RuntimeError):
+        self.status_fn = status_fn
+        self.strategy = strategy or AdaptiveEta()
+        self.max_errors = max_errors
+        self.failed_exc = failed_exc
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self._done = collections.deque(maxlen=METRICS_WINDOW)
+
+    def submit(self, cid, on_status=None, deadline=None):
+        job = PollJob(cid, on_status, deadline)
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("PollScheduler encerrado: não aceita novos jobs.")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="convertio-poller", daemon=True)
+                self._thread.start()
+            heapq.heappush(self._heap, (time.monotonic(), next(self._seq), job))
+            self._cond.notify()
+        return job.future
+
+    def stop(self):
+        """Encerra a thread; ela mesma cancela os jobs pendentes (inclusive o que estiver sendo consultado)."""
+        with self._cond:
+            self._stopped = True
+            thread = self._thread
+            self._cond.notify()
+        if thread: thread.join(timeout=5)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    for _, _, pending in self._heap: pending.future.cancel()
+                    self._heap.clear()
+                    return
+                _, _, job = heapq.heappop(self._heap)
+            if self._poll(job):
+                with self._cond:
+                    if self._stopped:   # stop() chegou durante a consulta: não volta para a fila
+                        job.future.cancel()
+                        continue
+                    delay = self.strategy.next_interval(job)
+                    if job.deadline:
+                        delay = min(delay, max(0.0, job.deadline - time.monotonic()))
+                    heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), job))
+
+    def _finish(self, job, result=None, exc=None):
+        job.finished_at = time.monotonic()
+        with self._cond:
+            self._done.append(job)
+        if exc is not None: job.future.set_exception(exc)
+        else: job.future.set_result(result)
+
+    def _poll(self, job):
+        """Consulta um job; devolve True se ele deve voltar para a fila."""
+        if job.deadline and time.monotonic() >= job.deadline:
+            self._finish(job, exc=ConvertioTimeout(f"Conversão {job.cid} excedeu o prazo."))
+            return False
+        job.polls += 1
+        try:
+            st = self.status_fn(job.cid)
+        except Exception as e:
+            job.errors += 1
+            if job.errors >= self.max_errors:
+                self._finish(job, exc=e)
+                return False
+            return True
+        job.errors = 0
+        job.samples.append((time.monotonic(), float(st.get("step_percent") or 0)))
+        if job.on_status:
+            try: job.on_status(st)
+            except Exception: pass
+        if st.get("step") == "finish":
+            self._finish(job, result=st)
+            return False
+        if st.get("step") == "failed":
+            self._finish(job, exc=self.failed_exc("Conversão falhou."))
+            return False
+        return True
+
+    def metrics(self):
+        """Resumo dos jobs encerrados: polls por job e tempo até terminar (s)."""
+        with self._cond:
+            done = list(self._done)
+        if not done:
+            return {"jobs": 0}
+        polls = sorted(j.polls for j in done)
+        durations = sorted(j.finished_at - j.started_at for j in done)
+
+        def pct(values, p):
+            return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+        return {
+            "jobs": len(done),
+            "polls_total": sum(polls),
+            "polls_per_job": sum(polls) / len(done),
+            "polls_max": polls[-1],
+            "time_to_finish_p50": pct(durations, 50),
+            "time_to_finish_p95": pct(durations, 95),
+            "time_to_finish_max": durations[-1],
+            "per_job": [{"cid": j.cid, "polls": j.polls, "seconds": j.finished_at - j.started_at,
+                         "ok": not j.future.exception()} for j in done],
+        }
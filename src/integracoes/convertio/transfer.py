@@ -0,0 +1,138 @@
+"""
+Camada de E/S do cliente Convertio: upload e download com buffers grandes,
+retentativas com retomada e progresso em MB/s.
+
+ - Download: grava em `<saida>.part`; se a conexão cair, retoma do byte onde
+   parou com `Range: bytes=N-` (206). Se o servidor ignorar o Range (200),
+   recomeça do zero. No fim confere o tamanho e renomeia atomicamente.
+ - Upload: o PUT da Convertio não aceita envio parcial, então a retomada é
+   reenviar o arquivo desde o início, com backoff. O arquivo é lido em blocos
+   de `buffer_size`, sem carregá-lo inteiro em memória.
+"""
+import os
+import time
+
+import requests
+
+DEFAULT_BUFFER = 4 * 1024 * 1024
+RETRY_STATUS = (429, 500, 502, 503, 504)
+RETRY_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout)
+
+
+class TransferError(Exception):
+    pass
+
+
+class Throughput:
+    """Acumula bytes transferidos e chama on_progress(feito, total, MB/s) no máximo a cada `interval`."""
+
+    def __init__(self, total=None, on_progress=None, interval=1.0, done=0):
+        self.total = total
+        self.on_progress = on_progress
+        self.interval = interval
+        self.done = done
+        self._start_done = done
+        self.started = time.monotonic()
+        self._last = 0.0
+
+    @property
+    def mb_per_s(self):
+        elapsed = time.monotonic() - self.started
+        return (self.done - self._start_done) / elapsed / 1024 ** 2 if elapsed > 0 else 0.0
+
+    def add(self, n):
+        self.done += n
+        now = time.monotonic()
+        if self.on_progress and now - self._last >= self.interval:
+            self._last = now
+            self.on_progress(self.done, self.total, self.mb_per_s)
+
+    def finish(self):
+        if self.on_progress: self.on_progress(self.done, self.total, self.mb_per_s)
+
+
+class _ProgressReader:
+    """
+    Envolve o arquivo de upload: informa o tamanho (Content-Length) e lê em
+    blocos de pelo menos `buffer_size`, contabilizando o progresso.
+    """
+
+    def __init__(self, f, size, buffer_size, progress):
+        self._f = f
+        self._size = size
+        self.buffer_size = buffer_size
+        self.progress = progress
+
+    def __len__(self):
+        return self._size - self._f.tell()
+
+    def read(self, size=-1):
+        data = self._f.read(max(size, self.buffer_size) if size and size > 0 else -1)
+        self.progress.add(len(data))
+        return data
+
+
+def _backoff(attempt):
+    time.sleep(min(30, 2 ** attempt))
+
+
+def upload(session, url, path, buffer_size=DEFAULT_BUFFER, retries=3, timeout=60, on_progress=None):
+    """PUT do arquivo em `url`, reenviando do início em caso de falha. Devolve a resposta."""
+    size = os.path.getsize(path)
+    for attempt in range(retries + 1):
+        progress = Throughput(size, on_progress)
+        try:
+            with open(path, "rb", buffering=0) as f:
+                r = session.put(url, data=_ProgressReader(f, size, buffer_size, progress), timeout=timeout)
+            if r.status_code in RETRY_STATUS and attempt < retries:
+                _backoff(attempt); continue
+            progress.finish()
+            return r
+        except RETRY_ERRORS:
+            if attempt == retries: raise
+            _backoff(attempt)
+
+
+def _expected_total(response, offset):
+    content_range = response.headers.get("Content-Range")  # bytes 100-999/1000
+    if content_range and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get("Content-Length")
+    return offset + int(length) if length and length.isdigit() else None
+
+
+def download(session, url, output_path, buffer_size=DEFAULT_BUFFER, retries=3, timeout=60, on_progress=None):
+    """Baixa `url` para `output_path` retomando via Range; renomeia atomicamente no fim."""
+    part = output_path + ".part"
+    if os.path.exists(part): os.remove(part)
+    total = None
+    for attempt in range(retries + 1):
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=timeout) as r:
+                if r.status_code == 416 and total is not None and offset == total:
+                    break  # já estava completo
+                if r.status_code in RETRY_STATUS and attempt < retries:
+                    _backoff(attempt); continue
+                r.raise_for_status()
+                if offset and r.status_code != 206:
+                    offset = 0  # servidor ignorou o Range: recomeça
+                total = _expected_total(r, offset)
+                progress = Throughput(total, on_progress, done=offset)
+                with open(part, "ab" if offset else "wb", buffering=buffer_size) as f:
+                    for chunk in r.iter_content(buffer_size):
+                        f.write(chunk); progress.add(len(chunk))
+                progress.finish()
+            if total is None or os.path.getsize(part) == total:
+                break
+            if attempt == retries:
+                raise TransferError(f"Download incompleto: {os.path.getsize(part)} de {total} bytes.")
+            _backoff(attempt)
+        except RETRY_ERRORS:
+            if attempt == retries: raise
+            _backoff(attempt)
+    os.replace(part, output_path)
+    return output_path
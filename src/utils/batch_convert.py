@@ -0,0 +1,182 @@
+"""
+Conversão em lote com pool de processos
+
+Recebe uma pasta ou um glob e um tipo de conversão, converte os arquivos em
+paralelo (um processo por núcleo por padrão), pula arquivos cuja saída já é
+mais nova que a entrada e grava um manifesto JSON com o resultado de cada um.
+Com --output-dir, as subpastas das entradas (relativas à pasta comum a
+todas, ex.: a raiz de um glob recursivo) são recriadas na saída, então
+a/rel.csv e b/rel.csv não disputam o mesmo rel.xlsx.
+
+Uso:
+  python -m src.utils.batch_convert csv_to_xlsx "A:/entrada/*.csv" --output-dir A:/saida
+  python -m src.utils.batch_convert "PDF → DOCX" A:/contratos --workers 4
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from src.utils.file_converters import convert, resolve
+
+MANIFEST_NAME = "manifesto_conversao.json"
+
+
+def collect_inputs(source, kind):
+    """Lista os arquivos de uma pasta (filtrando pela extensão de entrada) ou de um glob."""
+    src_ext = resolve(kind)[1]
+    if os.path.isdir(source):
+        files = [os.path.join(source, f) for f in os.listdir(source)
+                 if f.lower().endswith(src_ext) and os.path.isfile(os.path.join(source, f))]
+    else:
+        files = [f for f in glob.glob(source, recursive=True) if os.path.isfile(f)]
+    return sorted(files)
+
+
+def input_root(inputs):
+    """Pasta comum a todas as entradas (None se não houver, ex.: drives diferentes no Windows)."""
+    try:
+        return os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in inputs]) if inputs else None
+    except ValueError:
+        return None
+
+
+def output_path_for(input_path, kind, output_dir=None, root=None):
+    """Saída junto da entrada ou, com output_dir, na mesma subpasta relativa a `root`."""
+    dst_ext = resolve(kind)[2]
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    if not output_dir:
+        return os.path.join(os.path.dirname(input_path), stem + dst_ext)
+    rel = os.path.relpath(os.path.dirname(os.path.abspath(input_path)), root) if root else ""
+    return os.path.normpath(os.path.join(output_dir, rel, stem + dst_ext))
+
+
+def is_up_to_date(input_path, output_path):
+    return os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(input_path)
+
+
+def _convert_one(kind, input_path, output_path):
+    """Executado no pool: converte um arquivo e devolve o registro do manifesto."""
+    started = time.perf_counter()
+    result = {"input": input_path, "output": output_path, "status": "ok", "error": None}
+    try:
+        convert(kind, input_path, output_path)
+    except Exception as e:
+        result["status"] = "error"; result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(inputs, kind, output_dir=None, workers=None, force=False,
+              on_result=None, manifest_path=None):
+    """
+    Converte `inputs` com a conversão `kind` e grava o manifesto.
+
+    on_result: callback chamado com (registro, concluídos, total) a cada arquivo.
+    force: converte mesmo quando a saída já está atualizada.
+
+    Retorna o dict do manifesto. ValueError se duas entradas gerariam a mesma saída.
+    """
+    resolve(kind)
+    root = input_root(inputs) if output_dir else None
+    targets = {}
+    for input_path in inputs:
+        output_path = output_path_for(input_path, kind, output_dir, root)
+        key = os.path.normcase(os.path.abspath(output_path))
+        if key in targets:
+            raise ValueError(f"{targets[key]} e {input_path} gerariam a mesma saída: {output_path}")
+        targets[key] = input_path
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    total = len(inputs)
+    results = []; done = 0
+    started = time.perf_counter()
+
+    def finish(result):
+        nonlocal done
+        done += 1
+        results.append(result)
+        if on_result: on_result(result, done, total)
+
+    jobs = []
+    for input_path in inputs:
+        output_path = output_path_for(input_path, kind, output_dir, root)
+        if not force and is_up_to_date(input_path, output_path):
+            finish({"input": input_path, "output": output_path, "status": "skipped",
+                    "error": None, "seconds": 0.0})
+        else:
+            if output_dir: os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            jobs.append((input_path, output_path))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = [pool.submit(_convert_one, kind, inp, out) for inp, out in jobs]
+            for future in as_completed(futures):
+                finish(future.result())
+
+    manifest = {
+        "conversion": resolve(kind)[0],
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(time.perf_counter() - started, 3),
+        "workers": workers,
+        "total": total,
+        "ok": sum(r["status"] == "ok" for r in results),
+        "skipped": sum(r["status"] == "skipped" for r in results),
+        "errors": sum(r["status"] == "error" for r in results),
+        "files": sorted(results, key=lambda r: r["input"]),
+    }
+    if manifest_path is None:
+        base = output_dir or (os.path.dirname(inputs[0]) if inputs else os.getcwd())
+        manifest_path = os.path.join(base, MANIFEST_NAME)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    manifest["manifest_path"] = manifest_path
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converte vários arquivos em paralelo.")
+    parser.add_argument("kind", help="conversão, ex.: csv_to_xlsx ou 'CSV → XLSX'")
+    parser.add_argument("source", help="pasta ou glob de entrada")
+    parser.add_argument("--output-dir", default=None, help="pasta de saída (padrão: junto da entrada)")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos da máquina)")
+    parser.add_argument("--force", action="store_true", help="reconverte mesmo se a saída estiver atualizada")
+    parser.add_argument("--manifest", default=None, help="caminho do manifesto JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        inputs = collect_inputs(args.source, args.kind)
+    except ValueError as e:
+        print(f"❌ Erro: {e}", file=sys.stderr)
+        return 2
+    if not inputs:
+        print("Nenhum arquivo encontrado.")
+        return 0
+
+    def on_result(result, done, total):
+        name = os.path.basename(result["input"])
+        if result["status"] == "error":
+            print(f"[{done}/{total}] ❌ {name}: {result['error']}")
+        elif result["status"] == "skipped":
+            print(f"[{done}/{total}] ⏭ {name} (saída atualizada)")
+        else:
+            print(f"[{done}/{total}] ✔ {name} ({result['seconds']:.1f}s)")
+
+    try:
+        manifest = run_batch(inputs, args.kind, args.output_dir, args.workers, args.force,
+                             on_result, args.manifest)
+    except ValueError as e:
+        print(f"❌ Erro: {e}", file=sys.stderr)
+        return 2
+    print(f"Concluído: {manifest['ok']} ok, {manifest['skipped']} pulados, "
+          f"{manifest['errors']} erros em {manifest['seconds']:.1f}s. Manifesto: {manifest['manifest_path']}")
+    return 1 if manifest["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
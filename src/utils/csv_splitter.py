@@ -0,0 +1,284 @@
+"""
+Divisor de CSV em streaming (memória constante)
+
+Lê o CSV de entrada linha a linha e grava cada parte à medida que avança,
+repetindo o cabeçalho em todas elas. A divisão pode ser por quantidade de
+linhas, por tamanho em bytes ou pelos dois (o que estourar primeiro).
+
+Formatos de saída: csv, csv.gz e parquet (parquet requer `pip install pyarrow`).
+Com --workers N as partes são codificadas e gravadas em paralelo por um pool
+de processos; no máximo 2*N partes ficam em memória ao mesmo tempo.
+
+Uso:
+  python -m src.utils.csv_splitter entrada.csv --rows-per-part 10000 --output-prefix SAIDA_PT_
+  python -m src.utils.csv_splitter entrada.csv --max-bytes 200MB --output-prefix SAIDA_PT_
+  python -m src.utils.csv_splitter entrada.csv --format parquet --workers 8
+"""
+import argparse
+import collections
+import csv
+import gzip
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.utils.sizes import parse_size
+
+READ_BUFFER = 1024 * 1024
+PARQUET_BATCH = 65536
+FORMATS = {"csv": ".csv", "csv.gz": ".csv.gz", "parquet": ".parquet"}
+
+
+class _RowEncoder:
+    """Serializa uma linha no formato CSV de saída e devolve os bytes."""
+
+    def __init__(self, encoding="utf-8", delimiter=","):
+        self.encoding = encoding
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf, delimiter=delimiter, lineterminator="\n")
+
+    def encode(self, row):
+        self._buf.seek(0); self._buf.truncate()
+        self._writer.writerow(row)
+        return self._buf.getvalue().encode(self.encoding)
+
+
+def _part_path(output_prefix, index, fmt="csv"):
+    return f"{output_prefix}{index}{FORMATS[fmt]}"
+
+
+class _CsvPartWriter:
+    """Grava uma parte em CSV puro a partir das linhas já serializadas."""
+
+    def __init__(self, path, header, encoder):
+        self.path = path
+        self.encoder = encoder
+        self._f = self._open(path)
+        self._f.write(encoder.encode(header))
+
+    def _open(self, path):
+        return open(path, "wb", buffering=READ_BUFFER)
+
+    def write(self, row, data=None):
+        self._f.write(data if data is not None else self.encoder.encode(row))
+
+    def close(self):
+        self._f.close()
+
+
+class _GzipCsvPartWriter(_CsvPartWriter):
+    def _open(self, path):
+        return gzip.open(path, "wb", compresslevel=6)
+
+
+class _ParquetPartWriter:
+    """Grava uma parte em Parquet (todas as colunas como texto), em lotes de PARQUET_BATCH linhas."""
+
+    def __init__(self, path, header, encoder):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Formato parquet requer pyarrow: pip install pyarrow")
+        self._pa = pa
+        self.path = path
+        self.header = list(header)
+        self._schema = pa.schema([(str(col), pa.string()) for col in self.header])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._batch = []
+
+    def write(self, row, data=None):
+        width = len(self.header)
+        if len(row) != width:
+            row = (list(row) + [None] * width)[:width]
+        self._batch.append(row)
+        if len(self._batch) >= PARQUET_BATCH:
+            self._flush()
+
+    def _flush(self):
+        if not self._batch: return
+        columns = [list(col) for col in zip(*self._batch)]
+        self._writer.write_table(self._pa.Table.from_arrays(columns, schema=self._schema))
+        self._batch = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+_WRITERS = {"csv": _CsvPartWriter, "csv.gz": _GzipCsvPartWriter, "parquet": _ParquetPartWriter}
+
+
+def _part_info(path, rows, started):
+    return {
+        "path": path, "rows": rows, "bytes": os.path.getsize(path),
+        "seconds": time.perf_counter() - started, "worker": os.getpid(),
+    }
+
+
+def _write_part(path, header, rows, fmt, encoding, delimiter):
+    """Executado no pool: codifica e grava uma parte inteira."""
+    started = time.perf_counter()
+    writer = _WRITERS[fmt](path, header, _RowEncoder(encoding, delimiter))
+    for row in rows:
+        writer.write(row)
+    writer.close()
+    return _part_info(path, len(rows), started)
+
+
+def _iter_parts(reader, header, encoder, rows_per_part, max_bytes):
+    """Agrupa as linhas lidas em partes (listas), respeitando os limites de linhas/bytes."""
+    header_size = len(encoder.encode(header)) if max_bytes else 0
+    rows = []; size = header_size
+    for row in reader:
+        data_size = len(encoder.encode(row)) if max_bytes else 0
+        if rows and (
+            (rows_per_part and len(rows) >= rows_per_part)
+            or (max_bytes and size + data_size > max_bytes)
+        ):
+            yield rows
+            rows = []; size = header_size
+        rows.append(row)
+        size += data_size
+    if rows:
+        yield rows
+
+
+def _split_serial(reader, header, encoder, output_prefix, rows_per_part, max_bytes, fmt, on_part):
+    parts = []
+    writer = None; rows = 0; size = 0; started = 0.0
+    header_size = len(encoder.encode(header))
+
+    def close_part():
+        writer.close()
+        parts.append(_part_info(writer.path, rows, started))
+        if on_part: on_part(writer.path, rows)
+
+    for row in reader:
+        data = encoder.encode(row)
+        if writer is not None and (
+            (rows_per_part and rows >= rows_per_part)
+            or (max_bytes and size + len(data) > max_bytes)
+        ):
+            close_part(); writer = None
+        if writer is None:
+            started = time.perf_counter()
+            writer = _WRITERS[fmt](_part_path(output_prefix, len(parts) + 1, fmt), header, encoder)
+            rows = 0; size = header_size
+        writer.write(row, data)
+        rows += 1; size += len(data)
+
+    if writer is not None:
+        close_part()
+    return parts
+
+
+def _split_parallel(reader, header, encoder, output_prefix, rows_per_part, max_bytes, fmt,
+                    on_part, workers, encoding, delimiter):
+    parts = []
+    pending = collections.deque()
+    max_pending = workers * 2
+
+    def collect():
+        info = pending.popleft().result()
+        parts.append(info)
+        if on_part: on_part(info["path"], info["rows"])
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for index, rows in enumerate(_iter_parts(reader, header, encoder, rows_per_part, max_bytes), 1):
+            # fila limitada: espera a parte mais antiga antes de ler mais
+            while len(pending) >= max_pending:
+                collect()
+            path = _part_path(output_prefix, index, fmt)
+            pending.append(pool.submit(_write_part, path, header, rows, fmt, encoding, delimiter))
+        while pending:
+            collect()
+    return parts
+
+
+def split_csv(input_path, rows_per_part=10000, output_prefix=None, max_bytes=None,
+              encoding="utf-8", delimiter=",", on_part=None, fmt="csv", workers=None):
+    """
+    Divide `input_path` em partes `{output_prefix}{n}.{ext}` (n começa em 1).
+
+    rows_per_part: máximo de linhas de dados por parte (None = sem limite).
+    max_bytes: tamanho máximo de cada parte, medido no CSV sem compressão e com
+               cabeçalho (None = sem limite). Toda parte recebe ao menos uma linha.
+    on_part: callback chamado com (caminho, linhas) quando uma parte é fechada.
+    fmt: "csv", "csv.gz" ou "parquet".
+    workers: > 1 grava as partes em paralelo num pool de processos.
+
+    Retorna uma lista de dicts (path, rows, bytes, seconds, worker), na ordem das partes.
+    """
+    if not rows_per_part and not max_bytes:
+        raise ValueError("Informe rows_per_part e/ou max_bytes.")
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato inválido: {fmt} (use {', '.join(FORMATS)})")
+    if output_prefix is None:
+        output_prefix = os.path.splitext(input_path)[0] + "_PT_"
+
+    encoder = _RowEncoder(encoding, delimiter)
+    with open(input_path, "r", encoding=encoding, newline="", buffering=READ_BUFFER) as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return []
+        if workers and workers > 1:
+            return _split_parallel(reader, header, encoder, output_prefix, rows_per_part, max_bytes,
+                                   fmt, on_part, workers, encoding, delimiter)
+        return _split_serial(reader, header, encoder, output_prefix, rows_per_part, max_bytes,
+                             fmt, on_part)
+
+
+def throughput_report(parts, elapsed):
+    """Monta o relatório de vazão (linhas/s e MB/s) por worker e total."""
+    per_worker = {}
+    for info in parts:
+        stats = per_worker.setdefault(info["worker"], [0, 0, 0, 0.0])
+        stats[0] += 1; stats[1] += info["rows"]; stats[2] += info["bytes"]; stats[3] += info["seconds"]
+
+    lines = ["Worker      Partes      Linhas     Linhas/s     MB/s"]
+    for worker, (count, rows, size, secs) in sorted(per_worker.items()):
+        secs = secs or 1e-9
+        lines.append(f"{worker:<10} {count:>7} {rows:>11} {rows / secs:>12.0f} {size / secs / 1024 ** 2:>8.2f}")
+    total_rows = sum(info["rows"] for info in parts)
+    total_bytes = sum(info["bytes"] for info in parts)
+    elapsed = elapsed or 1e-9
+    lines.append(f"{'TOTAL':<10} {len(parts):>7} {total_rows:>11} {total_rows / elapsed:>12.0f} "
+                 f"{total_bytes / elapsed / 1024 ** 2:>8.2f}  ({elapsed:.2f}s)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Divide um CSV grande em partes, em streaming.")
+    parser.add_argument("input", help="CSV de entrada")
+    parser.add_argument("--rows-per-part", type=int, default=None, help="linhas de dados por parte")
+    parser.add_argument("--max-bytes", type=parse_size, default=None, help="tamanho máximo por parte (ex.: 200MB)")
+    parser.add_argument("--output-prefix", default=None, help="prefixo dos arquivos de saída")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--delimiter", default=",")
+    parser.add_argument("--format", dest="fmt", choices=list(FORMATS), default="csv", help="formato das partes")
+    parser.add_argument("--workers", type=int, default=None, help="processos gravando partes em paralelo")
+    args = parser.parse_args(argv)
+
+    rows_per_part = args.rows_per_part
+    if rows_per_part is None and args.max_bytes is None:
+        rows_per_part = 10000
+
+    started = time.perf_counter()
+    try:
+        parts = split_csv(args.input, rows_per_part, args.output_prefix, args.max_bytes,
+                          args.encoding, args.delimiter,
+                          on_part=lambda path, rows: print(f"Arquivo {path} salvo com sucesso ({rows} linhas)."),
+                          fmt=args.fmt, workers=args.workers)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"❌ Erro: {e}", file=sys.stderr)
+        return 1
+    print(throughput_report(parts, time.perf_counter() - started))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
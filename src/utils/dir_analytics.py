@@ -0,0 +1,212 @@
+"""
+Análise de uso de disco sobre a varredura do dir_scanner
+
+ - maiores arquivos e pastas (top-N com heap limitado, sem ordenar tudo)
+ - histograma de tamanho por extensão
+ - arquivos duplicados, em etapas: agrupa por tamanho; nos grupos com mais
+   de um arquivo, hash dos primeiros PARTIAL_SIZE bytes; só os que ainda
+   coincidem têm o arquivo inteiro lido
+ - exportação do relatório em JSON ou CSV (um arquivo por seção)
+
+Pode partir de uma varredura nova (que já reaproveita o índice) ou só do
+índice salvo, sem tocar no disco (--from-index).
+
+Uso:
+  python -m src.utils.dir_analytics D:/robos --top 20 --duplicates
+  python -m src.utils.dir_analytics D:/robos --from-index --json relatorio.json --csv relatorio/
+"""
+import argparse
+import collections
+import csv
+import hashlib
+import heapq
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from src.utils.dir_scanner import DEFAULT_INDEX, DEFAULT_WORKERS, ScanIndex, scan
+from src.utils.sizes import format_size
+
+PARTIAL_SIZE = 64 * 1024
+HASH_CHUNK = 1024 * 1024
+
+
+def top_files(result, n=20):
+    """Os `n` maiores arquivos: [(tamanho, caminho)]."""
+    return heapq.nlargest(n, ((size, path) for path, size, _ in result.iter_files()))
+
+
+def top_dirs(result, n=20):
+    """As `n` pastas com maior tamanho acumulado (incluindo subpastas): [(tamanho, caminho)]."""
+    return heapq.nlargest(n, ((result.total_size(path), path) for path in result.dirs))
+
+
+def extension_histogram(result):
+    """{extensão: [quantidade, bytes]}, da que ocupa mais para a que ocupa menos."""
+    hist = collections.defaultdict(lambda: [0, 0])
+    for path, size, _ in result.iter_files():
+        ext = os.path.splitext(path)[1].lower() or "(sem extensão)"
+        hist[ext][0] += 1; hist[ext][1] += size
+    return dict(sorted(hist.items(), key=lambda kv: kv[1][1], reverse=True))
+
+
+def _hash(path, limit=None):
+    h = hashlib.sha256()
+    remaining = limit
+    try:
+        with open(path, "rb") as f:
+            while remaining is None or remaining > 0:
+                block = f.read(HASH_CHUNK if remaining is None else min(HASH_CHUNK, remaining))
+                if not block: break
+                h.update(block)
+                if remaining is not None: remaining -= len(block)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _regroup(groups, hash_fn, pool):
+    """Subdivide cada grupo pelo hash dos arquivos; descarta os que ficaram sozinhos ou ilegíveis."""
+    paths = [p for group in groups for p in group]
+    digests = dict(zip(paths, pool.map(hash_fn, paths)))
+    out = []
+    for group in groups:
+        by_hash = collections.defaultdict(list)
+        for p in group:
+            if digests[p] is not None: by_hash[digests[p]].append(p)
+        out.extend((h, g) for h, g in by_hash.items() if len(g) > 1)
+    return out
+
+
+def find_duplicates(files, workers=8, min_size=1, partial_size=PARTIAL_SIZE):
+    """
+    files: iterável de (caminho, tamanho). Devolve (grupos, estatísticas), com os
+    grupos [{size, sha256, paths, wasted}] ordenados pelo espaço desperdiçado.
+    """
+    by_size = collections.defaultdict(list)
+    for path, size in files:
+        if size >= min_size: by_size[size].append(path)
+    candidates = {size: paths for size, paths in by_size.items() if len(paths) > 1}
+    stats = {"size_candidates": sum(len(p) for p in candidates.values())}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        partial = _regroup(list(candidates.values()), lambda p: _hash(p, partial_size), pool)
+        stats["partial_candidates"] = sum(len(g) for _, g in partial)
+        sizes = {p: size for size, paths in candidates.items() for p in paths}
+        # arquivos que cabem na amostra já foram lidos inteiros: o hash parcial é o hash completo
+        complete = [(h, g) for h, g in partial if sizes[g[0]] <= partial_size]
+        to_hash = [g for h, g in partial if sizes[g[0]] > partial_size]
+        stats["full_hashed"] = sum(len(g) for g in to_hash)
+        full = _regroup(to_hash, _hash, pool)
+
+    groups = [{"size": sizes[g[0]], "sha256": h, "paths": sorted(g), "wasted": sizes[g[0]] * (len(g) - 1)}
+              for h, g in complete + full]
+    groups.sort(key=lambda g: g["wasted"], reverse=True)
+    stats["groups"] = len(groups)
+    stats["wasted"] = sum(g["wasted"] for g in groups)
+    return groups, stats
+
+
+def analyze(result, top=20, duplicates=False, workers=8, min_dup_size=1):
+    """Relatório completo de um ScanResult, pronto para JSON."""
+    started = time.perf_counter()
+    report = {
+        "root": result.root,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "files": sum(len(s.files) for s in result.dirs.values()),
+        "dirs": len(result.dirs),
+        "bytes": result.total_size(result.root),
+        "top_files": [{"path": p, "size": s} for s, p in top_files(result, top)],
+        "top_dirs": [{"path": p, "size": s} for s, p in top_dirs(result, top)],
+        "extensions": [{"ext": ext, "count": c, "bytes": b} for ext, (c, b) in extension_histogram(result).items()],
+    }
+    if duplicates:
+        groups, stats = find_duplicates(((p, s) for p, s, _ in result.iter_files()), workers, min_dup_size)
+        report["duplicates"] = groups
+        report["duplicate_stats"] = stats
+    report["seconds"] = time.perf_counter() - started
+    return report
+
+
+def export_json(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def export_csv(report, folder):
+    """Um CSV por seção em `folder`. Devolve os caminhos gravados."""
+    os.makedirs(folder, exist_ok=True)
+    sections = {
+        "maiores_arquivos.csv": (["path", "size"], report["top_files"]),
+        "maiores_pastas.csv": (["path", "size"], report["top_dirs"]),
+        "extensoes.csv": (["ext", "count", "bytes"], report["extensions"]),
+    }
+    if "duplicates" in report:
+        rows = [{"group": i, "size": g["size"], "sha256": g["sha256"], "path": p}
+                for i, g in enumerate(report["duplicates"], 1) for p in g["paths"]]
+        sections["duplicados.csv"] = (["group", "size", "sha256", "path"], rows)
+    written = []
+    for name, (fields, rows) in sections.items():
+        path = os.path.join(folder, name)
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, delimiter=";")
+            writer.writeheader(); writer.writerows(rows)
+        written.append(path)
+    return written
+
+
+def print_report(report, top):
+    print(f"{report['root']}: {report['files']} arquivos em {report['dirs']} pastas, {format_size(report['bytes'])}")
+    print("\nMaiores arquivos:")
+    for row in report["top_files"][:top]: print(f"  {format_size(row['size']):>10}  {row['path']}")
+    print("\nMaiores pastas:")
+    for row in report["top_dirs"][:top]: print(f"  {format_size(row['size']):>10}  {row['path']}")
+    print("\nPor extensão:")
+    for row in report["extensions"][:top]:
+        print(f"  {format_size(row['bytes']):>10}  {row['count']:>8}  {row['ext']}")
+    if "duplicates" in report:
+        st = report["duplicate_stats"]
+        print(f"\nDuplicados: {st['groups']} grupos, {format_size(st['wasted'])} desperdiçados "
+              f"(mesmo tamanho: {st['size_candidates']}, hash parcial: {st['partial_candidates']}, "
+              f"hash completo: {st['full_hashed']})")
+        for g in report["duplicates"][:top]:
+            print(f"  {format_size(g['wasted']):>10}  {len(g['paths'])}x {format_size(g['size'])}")
+            for p in g["paths"]: print(f"              {p}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maiores arquivos/pastas, extensões e duplicados de uma pasta.")
+    parser.add_argument("folder")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--duplicates", action="store_true", help="procura arquivos duplicados")
+    parser.add_argument("--min-dup-size", type=int, default=1, help="ignora duplicados menores que N bytes")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--index", default=DEFAULT_INDEX, help="arquivo SQLite do índice")
+    parser.add_argument("--from-index", action="store_true", help="usa só o índice salvo, sem varrer o disco")
+    parser.add_argument("--json", help="grava o relatório em JSON")
+    parser.add_argument("--csv", help="pasta onde gravar um CSV por seção")
+    args = parser.parse_args(argv)
+
+    if args.from_index:
+        index = ScanIndex(args.index)
+        try: result = index.load(args.folder)
+        finally: index.close()
+        if not result.dirs:
+            print(f"{args.folder} não está no índice {args.index}; rode sem --from-index.", file=sys.stderr)
+            return 1
+    else:
+        result = scan(args.folder, args.workers, args.index)
+    report = analyze(result, args.top, args.duplicates, args.workers, args.min_dup_size)
+    print_report(report, args.top)
+    if args.json:
+        export_json(report, args.json); print(f"\nJSON: {args.json}")
+    if args.csv:
+        for path in export_csv(report, args.csv): print(f"CSV: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
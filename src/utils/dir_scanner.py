@@ -0,0 +1,254 @@
+"""
+Varredura rápida de diretórios com índice persistente
+
+ - os.scandir: tipo da entrada vem do próprio DirEntry (sem isdir/getsize
+   por arquivo) e o tamanho de `entry.stat()`, que no Windows já vem em cache
+ - iterativa: nenhuma recursão, então não há limite de profundidade
+ - cada diretório é uma tarefa num pool de threads; em compartilhamentos de
+   rede a latência de vários diretórios se sobrepõe
+ - índice em SQLite (caminho, tamanho, mtime): numa nova varredura, um
+   diretório cujo mtime não mudou reaproveita a listagem do índice e só os
+   subdiretórios são visitados
+
+O mtime de um diretório muda quando entradas são criadas, removidas ou
+renomeadas, mas não quando um arquivo existente cresce. Use full=True
+(--full) para reler tudo quando os tamanhos precisarem estar exatos.
+
+Uso:
+  python -m src.utils.dir_scanner C:/dados
+  python -m src.utils.dir_scanner //servidor/share --workers 32 --full
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.utils.sizes import format_size
+
+DEFAULT_INDEX = os.environ.get(
+    "ESTRUTURA_PASTAS_INDEX",
+    os.path.join(os.path.expanduser("~"), ".cache", "rpa-utilitarios", "estrutura_pastas", "index.sqlite3"))
+DEFAULT_WORKERS = 16
+
+
+class DirScan:
+    """Conteúdo de um diretório: arquivos [(nome, tamanho, mtime_ns)] e nomes dos subdiretórios."""
+
+    __slots__ = ("path", "mtime_ns", "files", "subdirs", "error", "reused")
+
+    def __init__(self, path, mtime_ns=0, files=None, subdirs=None, error=None, reused=False):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.files = files or []
+        self.subdirs = subdirs or []
+        self.error = error
+        self.reused = reused
+
+    @property
+    def size(self):
+        return sum(size for _, size, _ in self.files)
+
+
+class ScanResult:
+    """
+    Diretórios varridos. Os tamanhos acumulados são atualizados a cada add(),
+    então podem ser lidos enquanto a varredura ainda chega (parciais até o fim).
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.dirs = {}
+        self.totals = {}
+        self.seconds = 0.0
+
+    def add(self, scan):
+        old = self.dirs.get(scan.path)
+        delta = scan.size - (old.size if old else 0)
+        self.dirs[scan.path] = scan
+        path = scan.path
+        while True:
+            self.totals[path] = self.totals.get(path, 0) + delta
+            if path == self.root or not path.startswith(self.root):
+                break
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+
+    def children(self, path):
+        """(subdiretórios, arquivos) de `path`, em ordem alfabética."""
+        scan = self.dirs.get(path)
+        if scan is None:
+            return [], []
+        return sorted(scan.subdirs), sorted(scan.files)
+
+    def total_size(self, path):
+        """Tamanho acumulado de `path` e de tudo abaixo dele."""
+        return self.totals.get(path, 0)
+
+    def iter_files(self):
+        """(caminho completo, tamanho, mtime_ns) de todos os arquivos."""
+        for path, scan in self.dirs.items():
+            for name, size, mtime_ns in scan.files:
+                yield os.path.join(path, name), size, mtime_ns
+
+    @property
+    def stats(self):
+        scans = self.dirs.values()
+        return {"dirs": len(self.dirs), "reused": sum(1 for s in scans if s.reused),
+                "files": sum(len(s.files) for s in scans), "bytes": self.total_size(self.root),
+                "errors": sum(1 for s in scans if s.error), "seconds": self.seconds}
+
+
+class ScanIndex:
+    """Índice persistente das varreduras, um registro por diretório e por arquivo."""
+
+    def __init__(self, path=DEFAULT_INDEX):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY,
+                parent TEXT,
+                mtime_ns INTEGER NOT NULL,
+                error TEXT
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                dir TEXT NOT NULL,
+                name TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+        """)
+
+    def close(self):
+        self._db.close()
+
+    @staticmethod
+    def _subtree(root):
+        # todos os caminhos abaixo de root: intervalo [root + sep, root + (sep+1))
+        prefix = root.rstrip(os.sep) + os.sep
+        return root, prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+    def load(self, root):
+        """ScanResult com o que o índice sabe de `root` (vazio se nunca foi varrido)."""
+        root, low, high = self._subtree(os.path.abspath(root))
+        dirs = {}
+        where = "(path = ? OR (path >= ? AND path < ?))"
+        for path, parent, mtime_ns, error in self._db.execute(
+                f"SELECT path, parent, mtime_ns, error FROM dirs WHERE {where}", (root, low, high)):
+            dirs[path] = DirScan(path, mtime_ns, error=error, reused=True)
+        for path in dirs:
+            parent = os.path.dirname(path)
+            if path != root and parent in dirs:
+                dirs[parent].subdirs.append(os.path.basename(path))
+        for dir_, name, size, mtime_ns in self._db.execute(
+                "SELECT dir, name, size, mtime_ns FROM files WHERE (dir = ? OR (dir >= ? AND dir < ?))",
+                (root, low, high)):
+            scan = dirs.get(dir_)
+            if scan is not None: scan.files.append((name, size, mtime_ns))
+        result = ScanResult(root)
+        for scan in dirs.values():
+            result.add(scan)
+        return result
+
+    def save(self, result):
+        """Substitui no índice tudo que estiver sob result.root."""
+        root, low, high = self._subtree(result.root)
+        with self._db:
+            self._db.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (root, low, high))
+            self._db.execute("DELETE FROM files WHERE dir = ? OR (dir >= ? AND dir < ?)", (root, low, high))
+            self._db.executemany("INSERT INTO dirs VALUES (?, ?, ?, ?)",
+                                 ((s.path, os.path.dirname(s.path), s.mtime_ns, s.error)
+                                  for s in result.dirs.values()))
+            self._db.executemany("INSERT INTO files VALUES (?, ?, ?, ?)",
+                                 ((s.path, name, size, mtime_ns)
+                                  for s in result.dirs.values() for name, size, mtime_ns in s.files))
+
+
+def scan_dir(path, previous=None):
+    """Lê um diretório. Se `previous` (DirScan do índice) tiver o mesmo mtime, reaproveita a listagem."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError as e:
+        return DirScan(path, error=e.strerror or str(e))
+    if previous is not None and previous.mtime_ns == mtime_ns and not previous.error:
+        return DirScan(path, mtime_ns, list(previous.files), list(previous.subdirs), reused=True)
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    else:
+                        st = entry.stat(follow_symlinks=False)
+                        files.append((entry.name, st.st_size, st.st_mtime_ns))
+                except OSError:
+                    files.append((entry.name, 0, 0))
+    except PermissionError:
+        return DirScan(path, mtime_ns, error="Acesso negado")
+    except OSError as e:
+        return DirScan(path, mtime_ns, error=e.strerror or str(e))
+    return DirScan(path, mtime_ns, files, subdirs)
+
+
+def scan(root, workers=DEFAULT_WORKERS, index=None, full=False, on_dir=None, stop=None):
+    """
+    Varre `root` e devolve um ScanResult.
+    index: ScanIndex (ou caminho do índice) para reaproveitar e gravar a varredura; None não usa índice.
+    full: ignora o que estiver no índice (mas grava o resultado).
+    on_dir(DirScan): chamado a cada diretório concluído, na thread que chamou scan().
+    stop: threading.Event; se ligado, descarta o que falta e devolve o resultado parcial (sem gravar o índice).
+    """
+    started = time.perf_counter()
+    root = os.path.abspath(root)
+    own_index = isinstance(index, str)
+    if own_index:
+        index = ScanIndex(index)
+    try:
+        previous = index.load(root).dirs if index is not None and not full else {}
+        result = ScanResult(root)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(scan_dir, root, previous.get(root))}
+            while pending:
+                if stop is not None and stop.is_set():
+                    for future in pending: future.cancel()
+                    return result
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    d = future.result()
+                    result.add(d)
+                    if on_dir: on_dir(d)
+                    for name in d.subdirs:
+                        path = os.path.join(d.path, name)
+                        pending.add(pool.submit(scan_dir, path, previous.get(path)))
+        result.seconds = time.perf_counter() - started
+        if index is not None:
+            index.save(result)
+        return result
+    finally:
+        if own_index: index.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Varre uma pasta (scandir + pool de threads) e atualiza o índice.")
+    parser.add_argument("folder")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--index", default=DEFAULT_INDEX, help="arquivo SQLite do índice")
+    parser.add_argument("--no-index", action="store_true", help="não lê nem grava o índice")
+    parser.add_argument("--full", action="store_true", help="relê todos os diretórios")
+    args = parser.parse_args(argv)
+    result = scan(args.folder, args.workers, None if args.no_index else args.index, args.full)
+    st = result.stats
+    print(f"{st['dirs']} diretórios ({st['reused']} do índice), {st['files']} arquivos, "
+          f"{format_size(st['bytes'])} em {st['seconds']:.2f}s, {st['errors']} erro(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
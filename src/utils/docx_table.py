@@ -0,0 +1,97 @@
+"""
+Montagem rápida de tabelas DOCX a partir de DataFrame
+
+O `table.add_row().cells` do python-docx recria a lista de células a cada
+chamada e o custo cresce mais que linearmente. Aqui o XML das linhas (<w:tr>)
+é gerado como texto em uma única passada sobre o DataFrame e anexado à tabela
+em lotes, reaproveitando as propriedades de célula da linha de cabeçalho.
+
+Tabelas muito grandes podem ser divididas em seções (uma tabela por página,
+cabeçalho repetido) ou em vários documentos.
+
+# pip install pandas python-docx
+"""
+import os
+import re
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+ROWS_PER_BATCH = 2000
+# caracteres de controle que o XML não aceita
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _cell_text(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return _INVALID_XML.sub("", str(value))
+
+
+def _row_xml(values, tc_prs):
+    cells = []
+    for value, tc_pr in zip(values, tc_prs):
+        text = escape(_cell_text(value))
+        run = f'<w:r><w:t xml:space="preserve">{text}</w:t></w:r>' if text else ""
+        cells.append(f"<w:tc>{tc_pr}<w:p>{run}</w:p></w:tc>")
+    return "<w:tr>" + "".join(cells) + "</w:tr>"
+
+
+def build_table(doc, header, rows, style=None):
+    """
+    Adiciona ao `doc` uma tabela com `header` e as linhas do iterável `rows`.
+    As linhas são convertidas em XML e anexadas em lotes de ROWS_PER_BATCH.
+    """
+    table = doc.add_table(rows=1, cols=len(header))
+    if style: table.style = style
+    for i, col in enumerate(header): table.cell(0, i).text = str(col)
+
+    tbl = table._tbl
+    tc_prs = [cell._tc.tcPr.xml if cell._tc.tcPr is not None else "" for cell in table.rows[0].cells]
+    # tcPr.xml traz a declaração de namespace; o wrapper abaixo já declara w:
+    tc_prs = [re.sub(r'\s+xmlns:\w+="[^"]*"', "", xml) for xml in tc_prs]
+
+    batch = []
+    def flush():
+        wrapper = parse_xml(f"<w:tbl {nsdecls('w')}>{''.join(batch)}</w:tbl>")
+        tbl.extend(list(wrapper))
+        batch.clear()
+
+    for values in rows:
+        batch.append(_row_xml(values, tc_prs))
+        if len(batch) >= ROWS_PER_BATCH: flush()
+    if batch: flush()
+    return table
+
+
+def _chunks(df, size):
+    if not size or len(df) == 0:
+        yield df; return
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
+
+
+def dataframe_to_docx(df, output_path, rows_per_section=None, rows_per_document=None, style=None):
+    """
+    Grava `df` como tabela em `output_path`.
+
+    rows_per_section: divide em várias tabelas, uma por página (cabeçalho repetido).
+    rows_per_document: divide em vários arquivos `nome_1.docx`, `nome_2.docx`, ...
+
+    Retorna a lista de documentos gravados.
+    """
+    header = list(df.columns)
+    documents = list(_chunks(df, rows_per_document)) if rows_per_document else [df]
+    base, ext = os.path.splitext(output_path)
+    paths = []
+    for n, part in enumerate(documents, 1):
+        doc = Document()
+        for s, section in enumerate(_chunks(part, rows_per_section)):
+            if s: doc.add_page_break()
+            build_table(doc, header, section.itertuples(index=False, name=None), style)
+        path = output_path if len(documents) == 1 else f"{base}_{n}{ext}"
+        doc.save(path)
+        paths.append(path)
+    return paths
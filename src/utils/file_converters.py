@@ -0,0 +1,85 @@
+"""
+Funções de conversão de arquivos usadas pelo ConverterApp e pelo modo em lote.
+
+Cada conversão recebe (input_path, output_path). Os imports pesados (pandas,
+docx, pdf2docx...) ficam dentro das funções para que processos do pool só
+carreguem o que a conversão escolhida precisa.
+
+# pip install pandas openpyxl xlwt python-docx docx2pdf pdf2docx
+"""
+import os
+
+# acima deste tamanho o CSV → XLSX usa o caminho em streaming (xlsx_streaming)
+XLSX_STREAMING_THRESHOLD = 20 * 1024 * 1024
+
+# rótulo da interface -> (função, extensão de entrada, extensão de saída)
+CONVERSIONS = {
+    "CSV → XLSX": ("csv_to_xlsx", ".csv", ".xlsx"),
+    "CSV → DOCX": ("csv_to_docx", ".csv", ".docx"),
+    "DOCX → PDF": ("docx_to_pdf", ".docx", ".pdf"),
+    "XLSX → XLS": ("xlsx_to_xls", ".xlsx", ".xls"),
+    "XLS → XLSX": ("xls_to_xlsx", ".xls", ".xlsx"),
+    "PDF → DOCX": ("pdf_to_docx", ".pdf", ".docx"),
+}
+
+
+def resolve(kind):
+    """Aceita o rótulo ("CSV → XLSX") ou o nome da função ("csv_to_xlsx")."""
+    if kind in CONVERSIONS:
+        return CONVERSIONS[kind]
+    for spec in CONVERSIONS.values():
+        if spec[0] == kind:
+            return spec
+    raise ValueError(f"Conversão desconhecida: {kind}")
+
+
+def convert(kind, input_path, output_path):
+    func_name = resolve(kind)[0]
+    globals()[func_name](input_path, output_path)
+
+
+def csv_to_xlsx(input_path, output_path):
+    if os.path.getsize(input_path) >= XLSX_STREAMING_THRESHOLD:
+        from src.utils.xlsx_streaming import csv_to_xlsx_streaming
+        csv_to_xlsx_streaming(input_path, output_path)
+    else:
+        csv_to_xlsx_pandas(input_path, output_path)
+
+
+def csv_to_xlsx_pandas(input_path, output_path):
+    """Caminho original: DataFrame inteiro + workbook inteiro em memória."""
+    import pandas as pd
+    df = pd.read_csv(input_path); df.to_excel(output_path, index=False)
+
+
+def csv_to_docx(input_path, output_path, rows_per_section=None, rows_per_document=None):
+    import pandas as pd
+    from src.utils.docx_table import dataframe_to_docx
+    df = pd.read_csv(input_path)
+    dataframe_to_docx(df, output_path, rows_per_section, rows_per_document)
+
+
+def docx_to_pdf(input_path, output_path):
+    from docx2pdf import convert as docx2pdf_convert
+    docx2pdf_convert(input_path, output_path)
+
+
+def xlsx_to_xls(input_path, output_path):
+    import pandas as pd
+    from src.utils.xls_writer import write_dataframe_xls
+    df = pd.read_excel(input_path)
+    write_dataframe_xls(df, output_path)
+
+
+def xls_to_xlsx(input_path, output_path):
+    import pandas as pd
+    df = pd.read_excel(input_path); df.to_excel(output_path, index=False)
+
+
+def pdf_to_docx(input_path, output_path, pages=None, workers=1):
+    """pages: "1-3,5" (a partir de 1); workers > 1 analisa as páginas em paralelo."""
+    if pages or (workers and workers > 1):
+        from src.utils.pdf_parallel import pdf_to_docx_parallel
+        return pdf_to_docx_parallel(input_path, output_path, pages=pages, workers=workers)
+    from pdf2docx import Converter as PDF2DOCXConverter
+    cv = PDF2DOCXConverter(input_path); cv.convert(output_path); cv.close()
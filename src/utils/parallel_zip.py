@@ -0,0 +1,412 @@
+"""
+Compactação ZIP paralela
+
+Os arquivos são divididos em blocos de `chunk_size`; cada bloco é comprimido
+(deflate bruto) por uma thread do pool — o zlib libera o GIL durante a
+compressão, então os núcleos trabalham de fato em paralelo. Como no pigz, cada
+bloco usa os 32 KB anteriores do arquivo como dicionário e termina com
+Z_SYNC_FLUSH, de modo que os blocos concatenados formam um único fluxo deflate
+válido; os CRC32 dos blocos são combinados (crc32_combine).
+
+O método de cada arquivo (store, deflate, bzip2, lzma) vem da política de
+src.utils.zip_policy. Store e deflate são divididos em blocos; bzip2 e lzma
+não concatenam, então cada arquivo grande vira uma tarefa única, comprimida
+num temporário em disco.
+
+Um único escritor recebe os blocos na ordem e monta o ZIP (com ZIP64 quando
+necessário), legível por qualquer ferramenta padrão. No máximo
+`workers * 4` blocos ficam em memória ao mesmo tempo.
+
+Uso:
+  python -m src.utils.parallel_zip C:/evidencias evidencias.zip --workers 16
+  python -m src.utils.parallel_zip C:/logs logs.zip --profile smallest -v
+"""
+import argparse
+import bz2
+import collections
+import os
+import struct
+import sys
+import tempfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import ZIP_BZIP2, ZIP_DEFLATED, ZIP_LZMA, ZIP_STORED
+
+from src.utils.sizes import format_size
+from src.utils.zip_policy import METHOD_NAMES, PROFILES, CompressionPolicy, Decision, get_policy
+
+CHUNK_SIZE = 4 * 1024 * 1024
+DICT_SIZE = 32 * 1024
+ZIP64_LIMIT = (1 << 31) - 1
+# versão mínima do leitor por método (APPNOTE 4.4.3)
+METHOD_VERSIONS = {ZIP_STORED: 10, ZIP_DEFLATED: 20, ZIP_BZIP2: 46, ZIP_LZMA: 63}
+
+# ---- CRC32 ------------------------------------------------------------------
+
+_ZEROS = memoryview(bytes(CHUNK_SIZE))
+
+
+def crc32_combine(crc1, crc2, len2):
+    """
+    CRC32 de A+B a partir de crc(A), crc(B) e len(B). Avançar crc(A) por len(B)
+    bytes zero é linear, então basta descontar o CRC dos mesmos zeros partindo de 0.
+    """
+    if len2 <= 0:
+        return crc1
+    if not crc1:
+        return crc2
+    shifted, base = crc1, 0
+    while len2:
+        zeros = _ZEROS[:min(len2, len(_ZEROS))]
+        shifted, base = zlib.crc32(zeros, shifted), zlib.crc32(zeros, base)
+        len2 -= len(zeros)
+    return shifted ^ base ^ crc2
+
+
+# ---- escritor ZIP -----------------------------------------------------------
+
+def _dos_datetime(mtime):
+    t = time.localtime(mtime)
+    year = min(max(t.tm_year, 1980), 2107)
+    return ((year - 1980) << 9 | t.tm_mon << 5 | t.tm_mday,
+            t.tm_hour << 11 | t.tm_min << 5 | t.tm_sec // 2)
+
+
+class ZipEntry:
+    def __init__(self, name, size, mtime, mode, method, header_offset):
+        self.name = name
+        self.size = size
+        self.mtime = mtime
+        self.mode = mode
+        self.method = method
+        self.header_offset = header_offset
+        self.crc = 0
+        self.compressed_size = 0
+        # como zipfile: ZIP64 no cabeçalho local se o tamanho puder passar do limite
+        self.zip64 = size * 1.05 > ZIP64_LIMIT
+
+    @property
+    def encoded_name(self):
+        return self.name.encode("utf-8")
+
+    @property
+    def flags(self):
+        flags = 0x800 if not self.name.isascii() else 0  # nome em UTF-8
+        if self.method == ZIP_LZMA:
+            flags |= 0x02  # fluxo LZMA com marcador de fim, como o zipfile
+        return flags
+
+    def version(self, zip64):
+        return max(METHOD_VERSIONS.get(self.method, 20), 45 if zip64 else 20)
+
+
+class ZipWriter:
+    """
+    Monta um ZIP a partir de dados já comprimidos. Uso:
+      entry = w.begin(...); w.write(dados)...; w.end(entry, crc, tamanho_comprimido)
+    O cabeçalho local é reescrito no fim de cada membro (a saída precisa ser seekable).
+    """
+
+    create_system = 0 if sys.platform == "win32" else 3
+
+    def __init__(self, path):
+        self._f = open(path, "wb", buffering=CHUNK_SIZE)
+        self._pos = 0  # evita tell(), que força flush do buffer
+        self.entries = []
+
+    def _local_header(self, e):
+        date, tm = _dos_datetime(e.mtime)
+        extra = b""
+        csize, usize = e.compressed_size, e.size
+        if e.zip64:
+            extra = struct.pack("<HHQQ", 0x0001, 16, e.size, e.compressed_size)
+            csize = usize = 0xFFFFFFFF
+        return struct.pack("<IHHHHHIIIHH", 0x04034B50, e.version(e.zip64), e.flags, e.method, tm, date,
+                           e.crc, csize, usize, len(e.encoded_name), len(extra)) + e.encoded_name + extra
+
+    def write(self, data):
+        self._f.write(data)
+        self._pos += len(data)
+
+    def begin(self, name, size, mtime, mode, method=ZIP_DEFLATED):
+        e = ZipEntry(name.replace(os.sep, "/"), size, mtime, mode, method, self._pos)
+        self.write(self._local_header(e))
+        return e
+
+    def _finish(self, e, crc, compressed_size):
+        e.crc = crc & 0xFFFFFFFF
+        e.compressed_size = compressed_size
+        if not e.zip64 and (compressed_size > ZIP64_LIMIT or e.size > ZIP64_LIMIT):
+            raise ValueError(f"{e.name}: tamanho passou do limite sem ZIP64 reservado.")
+        self.entries.append(e)
+
+    def end(self, e, crc, compressed_size):
+        self._finish(e, crc, compressed_size)
+        self._f.seek(e.header_offset)
+        self._f.write(self._local_header(e))
+        self._f.seek(self._pos)
+
+    def add(self, name, size, mtime, mode, data, crc, method=ZIP_DEFLATED):
+        """Membro já inteiro em memória: cabeçalho com os valores finais, sem reescrita."""
+        return self.add_raw(name, size, mtime, mode, [data], crc, len(data), method)
+
+    def add_raw(self, name, size, mtime, mode, blocks, crc, compressed_size, method):
+        """Membro com CRC e tamanhos conhecidos; `blocks` são os dados já comprimidos."""
+        e = ZipEntry(name.replace(os.sep, "/"), size, mtime, mode, method, self._pos)
+        self._finish(e, crc, compressed_size)
+        self.write(self._local_header(e))
+        for block in blocks:
+            self.write(block)
+        return e
+
+    def close(self):
+        f = self._f
+        cd_start = self._pos
+        for e in self.entries:
+            date, tm = _dos_datetime(e.mtime)
+            fields = []
+            usize, csize, offset = e.size, e.compressed_size, e.header_offset
+            if usize > ZIP64_LIMIT: fields.append(usize); usize = 0xFFFFFFFF
+            if csize > ZIP64_LIMIT: fields.append(csize); csize = 0xFFFFFFFF
+            if offset > ZIP64_LIMIT: fields.append(offset); offset = 0xFFFFFFFF
+            extra = struct.pack("<HH" + "Q" * len(fields), 0x0001, 8 * len(fields), *fields) if fields else b""
+            version = e.version(fields or e.zip64)
+            f.write(struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, self.create_system << 8 | version, version,
+                                e.flags, e.method, tm, date, e.crc, csize, usize, len(e.encoded_name),
+                                len(extra), 0, 0, 0, (e.mode & 0xFFFF) << 16, offset))
+            f.write(e.encoded_name + extra)
+            self._pos += 46 + len(e.encoded_name) + len(extra)
+        cd_end = self._pos
+        count, cd_size = len(self.entries), cd_end - cd_start
+        if count >= 0xFFFF or cd_size > ZIP64_LIMIT or cd_start > ZIP64_LIMIT:
+            f.write(struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, cd_size, cd_start))
+            f.write(struct.pack("<IIQI", 0x07064B50, 0, cd_end, 1))
+            f.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, 0xFFFF, 0xFFFF, 0xFFFFFFFF, 0xFFFFFFFF, 0))
+        else:
+            f.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, cd_size, cd_start, 0))
+        f.close()
+
+
+# ---- compressão paralela ----------------------------------------------------
+
+def _compress_chunk(path, offset, length, method, level, last):
+    """Executado no pool: lê e comprime (deflate ou store) um bloco. Devolve (dados, crc, tamanho original)."""
+    with open(path, "rb") as f:
+        zdict = b""
+        if offset and method == ZIP_DEFLATED:
+            start = max(0, offset - DICT_SIZE)
+            f.seek(start)
+            zdict = f.read(offset - start)
+        else:
+            f.seek(offset)
+        data = f.read(length)
+    if method == ZIP_STORED:
+        return data, zlib.crc32(data), len(data)
+    comp = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=zdict) if zdict else \
+        zlib.compressobj(level, zlib.DEFLATED, -15)
+    out = comp.compress(data) + comp.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+    return out, zlib.crc32(data), len(data)
+
+
+def _compressor(method, level):
+    if method == ZIP_DEFLATED:
+        return zlib.compressobj(level, zlib.DEFLATED, -15)
+    if method == ZIP_BZIP2:
+        return bz2.BZ2Compressor(level or 9)
+    return zipfile.LZMACompressor()  # cabeçalho de propriedades no formato do ZIP
+
+
+def _compress_small(path, name, policy):
+    """Arquivo que cabe num bloco: decide o método e comprime numa tarefa só."""
+    with open(path, "rb") as f:
+        data = f.read()
+    decision = policy.decide(name, data)
+    out = data
+    if decision.method != ZIP_STORED:
+        comp = _compressor(decision.method, decision.level)
+        out = comp.compress(data) + comp.flush()
+        if data and len(out) >= len(data):
+            out, decision = data, decision._replace(method=ZIP_STORED, level=0,
+                                                    reason=decision.reason + ", sem ganho")
+    return decision, out, zlib.crc32(data), len(data)
+
+
+def _compress_stream(path, method, level, chunk_size):
+    """bzip2/lzma de um arquivo grande, em fluxo para um temporário. Devolve (temp, crc, tamanho)."""
+    comp = _compressor(method, level)
+    spool = tempfile.SpooledTemporaryFile(max_size=chunk_size)
+    crc = size = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            crc = zlib.crc32(block, crc); size += len(block)
+            spool.write(comp.compress(block))
+    spool.write(comp.flush())
+    return spool, crc, size
+
+
+def _read_head(path, size):
+    with open(path, "rb") as f:
+        return f.read(size)
+
+
+def raw_member(archive, info, block_size=CHUNK_SIZE):
+    """Gera os bytes comprimidos de `info` (ZipInfo) lidos direto de `archive`, sem descomprimir."""
+    archive.seek(info.header_offset)
+    header = archive.read(30)
+    if header[:4] != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"{info.filename}: cabeçalho local inválido.")
+    name_len, extra_len = struct.unpack("<HH", header[26:30])
+    archive.seek(info.header_offset + 30 + name_len + extra_len)
+    remaining = info.compress_size
+    while remaining:
+        block = archive.read(min(block_size, remaining))
+        if not block:
+            raise zipfile.BadZipFile(f"{info.filename}: dados truncados.")
+        remaining -= len(block)
+        yield block
+
+
+def scan_folder(folder):
+    """Lista (caminho absoluto, caminho relativo, stat) dos arquivos, como o os.walk do compactador."""
+    files = []
+    for root, dirs, names in os.walk(folder):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            files.append((path, os.path.relpath(path, folder), os.stat(path)))
+    return files
+
+
+def compress_files(files, out_path, workers=None, policy=None, chunk_size=CHUNK_SIZE, on_file=None,
+                   reuse_from=None, reuse=None):
+    """
+    Compacta `files` [(caminho, nome no zip, stat)] em `out_path`.
+    policy: CompressionPolicy ou nome do perfil (padrão "balanced").
+    on_file: callback chamado com (ZipEntry, Decision) a cada arquivo gravado.
+    reuse_from/reuse: ZIP anterior e {nome: ZipInfo} dos membros a copiar dele
+    byte a byte, sem recomprimir (modo incremental).
+    Retorna um dict com arquivos, bytes_in, bytes_out, seconds e a contagem por método.
+    """
+    workers = workers or os.cpu_count() or 1
+    policy = get_policy(policy)
+    reuse = reuse or {}
+    started = time.perf_counter()
+    source = open(reuse_from, "rb") if reuse else None
+    writer = ZipWriter(out_path)
+    pending = collections.deque()
+    state = {"entry": None, "decision": None, "crc": 0, "csize": 0, "bytes_in": 0}
+    methods = collections.Counter()
+
+    def done(e, decision):
+        methods[METHOD_NAMES[e.method]] += 1
+        if on_file: on_file(e, decision)
+
+    def consume():
+        kind, payload, future = pending.popleft()
+        if kind == "begin":
+            name, st, decision = payload
+            state.update(entry=writer.begin(name, st.st_size, st.st_mtime, st.st_mode, decision.method),
+                         decision=decision, crc=0, csize=0)
+        elif kind == "small":
+            name, st = payload
+            decision, data, crc, length = future.result()
+            state["bytes_in"] += length
+            done(writer.add(name, st.st_size, st.st_mtime, st.st_mode, data, crc, decision.method), decision)
+        elif kind == "copy":
+            name, st, info = payload
+            e = writer.add_raw(name, st.st_size, st.st_mtime, st.st_mode, raw_member(source, info, chunk_size),
+                               info.CRC, info.compress_size, info.compress_type)
+            state["bytes_in"] += st.st_size
+            done(e, Decision(info.compress_type, 0, "inalterado, copiado"))
+        elif kind == "stream":
+            name, st, decision = payload
+            spool, crc, length = future.result()
+            with spool:
+                csize = spool.tell(); spool.seek(0)
+                e = writer.begin(name, st.st_size, st.st_mtime, st.st_mode, decision.method)
+                for block in iter(lambda: spool.read(chunk_size), b""):
+                    writer.write(block)
+            writer.end(e, crc, csize)
+            state["bytes_in"] += length
+            done(e, decision)
+        else:
+            data, crc, length = future.result()
+            writer.write(data)
+            state["crc"] = crc32_combine(state["crc"], crc, length)
+            state["csize"] += len(data); state["bytes_in"] += length
+            if kind == "last":
+                writer.end(state["entry"], state["crc"], state["csize"])
+                done(state["entry"], state["decision"])
+
+    def push(kind, payload, future=None):
+        while len(pending) >= workers * 4:
+            consume()
+        pending.append((kind, payload, future))
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for path, name, st in files:
+                size = st.st_size
+                info = reuse.get(name.replace(os.sep, "/"))
+                if info is not None:
+                    push("copy", (name, st, info))
+                    continue
+                if size <= chunk_size:
+                    push("small", (name, st), pool.submit(_compress_small, path, name, policy))
+                    continue
+                decision = policy.decide(name, _read_head(path, policy.sample_size))
+                if decision.method in (ZIP_BZIP2, ZIP_LZMA):
+                    push("stream", (name, st, decision),
+                         pool.submit(_compress_stream, path, decision.method, decision.level, chunk_size))
+                    continue
+                push("begin", (name, st, decision))
+                for offset in range(0, size, chunk_size):
+                    last = offset + chunk_size >= size
+                    push("last" if last else "chunk", None,
+                         pool.submit(_compress_chunk, path, offset, min(chunk_size, size - offset),
+                                     decision.method, decision.level, last))
+            while pending:
+                consume()
+    finally:
+        writer.close()
+        if source: source.close()
+    return {"files": len(writer.entries), "bytes_in": state["bytes_in"], "bytes_out": os.path.getsize(out_path),
+            "seconds": time.perf_counter() - started, "methods": dict(methods)}
+
+
+def compress_folder(folder, out_path, workers=None, policy=None, chunk_size=CHUNK_SIZE, on_file=None):
+    return compress_files(scan_folder(folder), out_path, workers, policy, chunk_size, on_file)
+
+
+def describe(entry, decision):
+    """Linha de log de um membro: método, motivo da escolha e taxa de compressão."""
+    ratio = entry.compressed_size / entry.size if entry.size else 1.0
+    return (f"{entry.name}: {METHOD_NAMES[entry.method]} ({decision.reason}) "
+            f"{format_size(entry.size)} → {format_size(entry.compressed_size)} ({ratio:.0%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compacta uma pasta em ZIP usando vários núcleos.")
+    parser.add_argument("folder")
+    parser.add_argument("output")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--profile", default="balanced", choices=list(PROFILES))
+    parser.add_argument("--level", type=int, default=None, choices=range(1, 10), help="nível do deflate/bzip2")
+    parser.add_argument("--text-method", choices=["deflate", "lzma", "bzip2"], default=None,
+                        help="método para arquivos de texto (muito compressíveis)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="mostra a decisão de cada arquivo")
+    args = parser.parse_args(argv)
+    policy = CompressionPolicy(args.profile, args.level, args.text_method)
+    on_file = (lambda e, d: print(describe(e, d))) if args.verbose else None
+    stats = compress_folder(args.folder, args.output, args.workers, policy, on_file=on_file)
+    secs = stats["seconds"] or 1e-9
+    print(f"{stats['files']} arquivos, {format_size(stats['bytes_in'])} → {format_size(stats['bytes_out'])} "
+          f"em {secs:.1f}s ({stats['bytes_in'] / secs / 1024 ** 2:.1f} MB/s) — {policy}, "
+          + ", ".join(f"{m}: {n}" for m, n in sorted(stats["methods"].items())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+PDF → DOCX paralelo por páginas
+
+Divide as páginas pedidas em blocos, cada processo do pool analisa (parse) o
+seu bloco com o pdf2docx e devolve o resultado serializado (`Converter.store`).
+O processo principal junta tudo (`restore`) e monta um único DOCX na ordem
+das páginas. O tempo de análise de cada página é medido para achar as lentas.
+Página que falha na análise é tratada como no Converter.parse_pages:
+registrada no log e pulada (ignore_page_error), ou ConversionException
+(debug / ignore_page_error=False), ou a exceção original (raw_exceptions).
+
+Uso:
+  python -m src.utils.pdf_parallel contrato.pdf contrato.docx --workers 8
+  python -m src.utils.pdf_parallel contrato.pdf trecho.docx --pages 1-10,15,40-
+
+# pip install pdf2docx
+"""
+import argparse
+import logging
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pdf2docx import Converter
+from pdf2docx.converter import ConversionException
+
+log = logging.getLogger(__name__)
+
+
+def parse_page_range(text, page_count):
+    """
+    Converte "1-3,5,10-" (páginas a partir de 1) em índices a partir de 0.
+    "10-" vai até a última página e "-3" começa na primeira.
+    """
+    indexes = []
+    for part in str(text).replace(" ", "").split(","):
+        if not part: continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            first = int(first) if first else 1
+            last = int(last) if last else page_count
+        else:
+            first = last = int(part)
+        if first < 1 or last > page_count or first > last:
+            raise ValueError(f"Intervalo de páginas inválido: {part} (documento tem {page_count} páginas)")
+        indexes.extend(range(first - 1, last))
+    return sorted(set(indexes))
+
+
+def _parse_chunk(pdf_path, password, page_indexes, settings):
+    """Executado no pool: analisa um bloco de páginas e devolve (dados, tempos por página)."""
+    cv = Converter(pdf_path, password)
+    try:
+        cv.load_pages(pages=page_indexes)
+        cv.parse_document(**settings)
+        timings = []
+        for page in cv.pages:
+            if page.skip_parsing: continue
+            started = time.perf_counter()
+            try:
+                page.parse(**settings)
+            except Exception as e:
+                # mesmo tratamento do Converter.parse_pages (conversão serial)
+                if settings.get("raw_exceptions"): raise
+                if not settings.get("debug") and settings.get("ignore_page_error", True):
+                    log.error("Página %d ignorada por erro na análise: %s", page.id + 1, e)
+                    continue
+                raise ConversionException(f"Erro ao analisar a página {page.id + 1}: {e}")
+            timings.append((page.id + 1, time.perf_counter() - started))
+        return cv.store(), timings
+    finally:
+        cv.close()
+
+
+def pdf_to_docx_parallel(input_path, output_path, pages=None, workers=None, password=None,
+                         chunk_size=None, on_page=None, **settings):
+    """
+    Converte `input_path` em `output_path` analisando as páginas em paralelo.
+
+    pages: "1-3,5" ou lista de páginas (a partir de 1); None = todas.
+    workers: processos do pool (padrão: núcleos da máquina).
+    chunk_size: páginas por tarefa (padrão: ~2 tarefas por processo).
+    on_page: callback chamado com (página, segundos) conforme os blocos terminam.
+    settings: parâmetros repassados ao pdf2docx (ver Converter.default_settings).
+
+    Retorna a lista [(página, segundos)] em ordem de página.
+    """
+    cv = Converter(input_path, password)
+    try:
+        page_count = len(cv.fitz_doc)
+        if pages is None:
+            indexes = list(range(page_count))
+        elif isinstance(pages, str):
+            indexes = parse_page_range(pages, page_count)
+        else:
+            indexes = parse_page_range(",".join(str(p) for p in pages), page_count)
+        if not indexes:
+            raise ValueError("Nenhuma página selecionada.")
+
+        options = cv.default_settings
+        options.update(settings)
+        workers = max(1, min(workers or os.cpu_count() or 1, len(indexes)))
+        chunk_size = chunk_size or math.ceil(len(indexes) / (workers * 2))
+        chunks = [indexes[i:i + chunk_size] for i in range(0, len(indexes), chunk_size)]
+
+        timings = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_parse_chunk, input_path, password, chunk, options) for chunk in chunks]
+            for future in as_completed(futures):
+                data, chunk_timings = future.result()
+                cv.restore(data)
+                timings.extend(chunk_timings)
+                if on_page:
+                    for page, secs in chunk_timings: on_page(page, secs)
+
+        # make_docx percorre as páginas na ordem do documento
+        cv.make_docx(output_path, **options)
+    finally:
+        cv.close()
+    return sorted(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converte PDF em DOCX analisando páginas em paralelo.")
+    parser.add_argument("input", help="PDF de entrada")
+    parser.add_argument("output", help="DOCX de saída")
+    parser.add_argument("--pages", default=None, help="páginas, ex.: 1-10,15,40-")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos da máquina)")
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--slowest", type=int, default=10, help="quantas páginas mais lentas listar")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        timings = pdf_to_docx_parallel(args.input, args.output, args.pages, args.workers, args.password,
+                                       on_page=lambda page, secs: print(f"Página {page}: {secs:.2f}s"))
+    except Exception as e:
+        print(f"❌ Erro: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    print(f"\n{len(timings)} páginas em {elapsed:.1f}s ({sum(s for _, s in timings):.1f}s de análise somada)")
+    print("Páginas mais lentas:")
+    for page, secs in sorted(timings, key=lambda t: t[1], reverse=True)[:args.slowest]:
+        print(f"  {page:>5}  {secs:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+"""Conversão entre tamanhos legíveis ("500MB") e bytes."""
+
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+
+def parse_size(text):
+    """Converte '500MB', '2GB' ou '1048576' em bytes."""
+    value = str(text).strip().upper()
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if value.endswith(unit):
+            return int(float(value[:-len(unit)].strip()) * SIZE_UNITS[unit])
+    return int(value)
+
+
+def format_size(num):
+    """Converte bytes em texto legível: 1536 -> '1.50 KB'."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num) < 1024:
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.2f} {unit}"
+        num /= 1024
+    return f"{num:.2f} TB"
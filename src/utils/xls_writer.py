@@ -0,0 +1,123 @@
+"""
+Gravação em lote de DataFrame → XLS (xlwt)
+
+Cada coluna é convertida uma única vez para um tipo compatível com XLS (número,
+texto, booleano ou data como número serial do Excel) e gravada com um método
+de célula específico, sem o despacho por tipo de `ws.write` a cada célula.
+Os estilos de data/número são criados uma vez e seu índice XF é resolvido uma
+vez por aba, em vez de a cada célula como faz o xlwt. O cabeçalho é
+gravado e, passando do limite de 65.536 linhas do XLS, os dados continuam em
+novas abas (Sheet1, Sheet1_2, ...).
+
+# pip install pandas xlwt
+"""
+import datetime
+import math
+
+import pandas as pd
+import xlwt
+from xlwt.Cell import BooleanCell, NumberCell, StrCell
+
+XLS_MAX_ROWS = 65536
+XLS_MAX_COLS = 256
+XLS_MAX_TEXT = 32767
+EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+
+# estilos criados uma única vez e compartilhados por todas as células
+HEADER_STYLE = xlwt.easyxf("font: bold on")
+DATE_STYLE = xlwt.easyxf(num_format_str="YYYY-MM-DD")
+DATETIME_STYLE = xlwt.easyxf(num_format_str="YYYY-MM-DD HH:MM:SS")
+DEFAULT_STYLE = xlwt.Style.default_style
+
+
+def _prepare_column(series):
+    """Converte a coluna inteira de uma vez e devolve (tipo, valores, estilo)."""
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool", series.tolist(), DEFAULT_STYLE
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "number", series.astype(float).tolist(), DEFAULT_STYLE
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        if getattr(dtype, "tz", None) is not None:
+            series = series.dt.tz_localize(None)
+        has_time = bool((series.dropna() != series.dropna().dt.normalize()).any())
+        serials = ((series - EXCEL_EPOCH) / pd.Timedelta(days=1)).tolist()
+        return "number", serials, DATETIME_STYLE if has_time else DATE_STYLE
+    return "mixed", series.tolist(), DEFAULT_STYLE
+
+
+def _write_mixed(row, c, v, style):
+    """Grava uma célula pelos métodos públicos do xlwt. Retorna False se ela ficou vazia."""
+    if v is None or (isinstance(v, float) and math.isnan(v)) or v is pd.NaT or (isinstance(v, str) and not v):
+        return False
+    if isinstance(v, str):
+        row.set_cell_text(c, v[:XLS_MAX_TEXT], style)
+    elif isinstance(v, bool):
+        row.set_cell_boolean(c, v, style)
+    elif isinstance(v, (int, float)):
+        row.set_cell_number(c, v, style)
+    elif isinstance(v, datetime.datetime):
+        row.set_cell_date(c, v.replace(tzinfo=None), DATETIME_STYLE)
+    elif isinstance(v, datetime.date):
+        row.set_cell_date(c, v, DATE_STYLE)
+    else:
+        row.set_cell_text(c, str(v)[:XLS_MAX_TEXT], style)
+    return True
+
+
+def _write_block(ws, columns, start, stop, header):
+    """Grava as linhas [start, stop) dos dados numa aba, coluna a coluna."""
+    wb = ws.get_parent()
+    header_row = ws.row(0)
+    for c, name in enumerate(header):
+        header_row.set_cell_text(c, name, HEADER_STYLE)
+
+    rows = [ws.row(r) for r in range(1, stop - start + 1)]
+    if not columns: return
+    # só a última coluna usa set_cell_* (que ajusta os limites da linha); vazia, recebe uma
+    # célula em branco. As demais entram direto com insert_cell: os estilos usados têm a
+    # fonte padrão, então a altura da linha não muda.
+    last_col = len(columns) - 1
+    _, values, style = columns[last_col]
+    for row, v in zip(rows, values[start:stop]):
+        if not _write_mixed(row, last_col, v, style): row.set_cell_blank(last_col)
+
+    for c, (kind, values, style) in enumerate(columns[:last_col]):
+        block = values[start:stop]
+        xf_idx = wb.add_style(style)
+        if kind == "number":
+            for r, (row, v) in enumerate(zip(rows, block), 1):
+                if v == v: row.insert_cell(c, NumberCell(r, c, xf_idx, v))
+        elif kind == "bool":
+            for r, (row, v) in enumerate(zip(rows, block), 1):
+                row.insert_cell(c, BooleanCell(r, c, xf_idx, v))
+        else:
+            add_str = wb.add_str
+            for r, (row, v) in enumerate(zip(rows, block), 1):
+                if type(v) is str:
+                    if v: row.insert_cell(c, StrCell(r, c, xf_idx, add_str(v[:XLS_MAX_TEXT])))
+                else:
+                    _write_mixed(row, c, v, style)
+
+
+def write_dataframe_xls(df, output_path, sheet_name="Sheet1", max_rows=XLS_MAX_ROWS):
+    """
+    Grava `df` em `output_path` (.xls) com cabeçalho, dividindo em abas a cada
+    `max_rows` linhas (cabeçalho incluso). Retorna o número de abas criadas.
+    """
+    if len(df.columns) > XLS_MAX_COLS:
+        raise ValueError(f"XLS suporta no máximo {XLS_MAX_COLS} colunas ({len(df.columns)} informadas).")
+    header = [str(col) for col in df.columns]
+    columns = [_prepare_column(df.iloc[:, i]) for i in range(len(df.columns))]
+    per_sheet = max_rows - 1
+
+    wb = xlwt.Workbook()
+    sheets = 0
+    for start in range(0, max(len(df), 1), per_sheet):
+        sheets += 1
+        name = sheet_name if sheets == 1 else f"{sheet_name}_{sheets}"
+        ws = wb.add_sheet(name[:31])
+        _write_block(ws, columns, start, min(start + per_sheet, len(df)), header)
+        ws.flush_row_data()
+    wb.save(output_path)
+    return sheets
@@ -0,0 +1,50 @@
+"""
+CSV → XLSX em streaming
+
+Lê o CSV em blocos com pandas e grava as linhas por um workbook write-only do
+openpyxl, que não mantém o modelo de objetos da planilha em memória. Quando a
+entrada passa do limite de linhas do Excel, abre uma nova aba automaticamente
+(Sheet1, Sheet2, ...) repetindo o cabeçalho.
+
+# pip install pandas openpyxl
+"""
+import pandas as pd
+from openpyxl import Workbook
+
+EXCEL_MAX_ROWS = 1048576
+CHUNK_ROWS = 50000
+
+
+def csv_to_xlsx_streaming(input_path, output_path, chunk_rows=CHUNK_ROWS, max_rows=EXCEL_MAX_ROWS,
+                          **read_csv_kwargs):
+    """
+    Converte `input_path` em `output_path` com memória limitada a um bloco de `chunk_rows`.
+
+    max_rows: linhas por aba, cabeçalho incluso (padrão: limite do Excel).
+    read_csv_kwargs: repassados ao pd.read_csv (sep, encoding...).
+
+    Retorna o total de linhas de dados gravadas.
+    """
+    wb = Workbook(write_only=True)
+    ws = None; header = None; sheet_rows = 0; total = 0
+
+    for chunk in pd.read_csv(input_path, chunksize=chunk_rows, **read_csv_kwargs):
+        if header is None:
+            header = [str(col) for col in chunk.columns]
+        # NaN vira célula vazia; object evita tipos numpy por célula
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            if ws is None or sheet_rows >= max_rows:
+                ws = wb.create_sheet(f"Sheet{len(wb.worksheets) + 1}")
+                ws.append(header)
+                sheet_rows = 1
+            ws.append(row)
+            sheet_rows += 1; total += 1
+
+    if ws is None:
+        # CSV só com cabeçalho: gera uma aba apenas com ele
+        ws = wb.create_sheet("Sheet1")
+        header = header or [str(col) for col in pd.read_csv(input_path, nrows=0, **read_csv_kwargs).columns]
+        ws.append(header)
+    wb.save(output_path)
+    return total
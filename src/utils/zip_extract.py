@@ -0,0 +1,215 @@
+"""
+Extração ZIP paralela e seletiva
+
+ - Cada thread do pool abre seu próprio handle do ZIP, então membros
+   diferentes são descomprimidos ao mesmo tempo (o zlib libera o GIL).
+   Os maiores membros vão primeiro, para equilibrar a carga.
+ - Filtros glob de inclusão/exclusão (fnmatch sobre o caminho no ZIP):
+   tirar um arquivo de um ZIP de 20 GB só lê aquele membro.
+ - O CRC32 é conferido durante a cópia; o membro é gravado em `.part` e
+   só renomeado se o CRC bater.
+ - Membros com caminho absoluto, `..` ou que resolvam para fora da pasta
+   de destino (zip-slip) fazem a extração ser recusada antes de gravar
+   qualquer arquivo.
+
+Uso:
+  python -m src.utils.zip_extract evidencias.zip C:/destino --include "*.pdf" --exclude "tmp/*"
+  python -m src.utils.zip_extract evidencias.zip C:/destino --list
+"""
+import argparse
+import fnmatch
+import os
+import sys
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.utils.sizes import format_size
+
+BLOCK_SIZE = 1024 * 1024
+
+
+class UnsafeMemberError(Exception):
+    """O ZIP contém membros que seriam gravados fora da pasta de destino."""
+
+
+def parse_filters(text):
+    """'*.pdf; docs/*; !*.tmp' → (['*.pdf', 'docs/*'], ['*.tmp'])."""
+    include, exclude = [], []
+    for pattern in (p.strip() for p in (text or "").replace(",", ";").split(";")):
+        if pattern.startswith("!"): exclude.append(pattern[1:].strip())
+        elif pattern: include.append(pattern)
+    return include, exclude
+
+
+def select_members(infos, include=None, exclude=None):
+    """Membros cujo caminho casa com algum `include` (todos, se vazio) e com nenhum `exclude`."""
+    def matches(name, patterns):
+        base = name.rstrip("/").rsplit("/", 1)[-1]
+        return any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(base, p) for p in patterns)
+
+    return [i for i in infos
+            if (not include or matches(i.filename, include)) and not (exclude and matches(i.filename, exclude))]
+
+
+def safe_target(out_dir, name):
+    """Caminho de destino do membro, ou None se ele escapar de `out_dir`."""
+    normalized = name.replace("\\", "/")
+    parts = normalized.split("/")
+    if normalized.startswith("/") or ".." in parts or (parts[0].endswith(":") and len(parts[0]) == 2):
+        return None
+    root = os.path.realpath(out_dir)
+    target = os.path.realpath(os.path.join(root, *[p for p in parts if p]))
+    if os.path.commonpath([root, target]) != root:
+        return None
+    return target
+
+
+class _Progress:
+    """Bytes extraídos no total, com callback limitado a um por `interval` segundos."""
+
+    def __init__(self, total, on_progress, interval=0.5):
+        self.total = total
+        self.on_progress = on_progress
+        self.interval = interval
+        self.done = 0
+        self.started = time.monotonic()
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def mb_per_s(self):
+        elapsed = time.monotonic() - self.started
+        return self.done / elapsed / 1024 ** 2 if elapsed > 0 else 0.0
+
+    def add(self, n):
+        with self._lock:
+            self.done += n
+            now = time.monotonic()
+            if not self.on_progress or now - self._last < self.interval:
+                return
+            self._last = now
+        self.on_progress(self.done, self.total, self.mb_per_s)
+
+
+class _Handles:
+    """Um ZipFile aberto por thread, fechados todos juntos no fim."""
+
+    def __init__(self, zip_path):
+        self.zip_path = zip_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all = []
+
+    def get(self):
+        zf = getattr(self._local, "zf", None)
+        if zf is None:
+            zf = self._local.zf = zipfile.ZipFile(self.zip_path)
+            with self._lock: self._all.append(zf)
+        return zf
+
+    def close(self):
+        for zf in self._all: zf.close()
+
+
+def _extract_one(handles, info, target, progress):
+    """Executado no pool: descomprime um membro para `target`, conferindo o CRC."""
+    zf = handles.get()
+    started = time.perf_counter()
+    if info.is_dir():
+        os.makedirs(target, exist_ok=True)
+        return time.perf_counter() - started
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    part = target + ".part"
+    crc = 0
+    try:
+        with zf.open(info) as src, open(part, "wb") as dst:
+            for block in iter(lambda: src.read(BLOCK_SIZE), b""):
+                crc = zlib.crc32(block, crc)
+                dst.write(block)
+                progress.add(len(block))
+        if crc != info.CRC:
+            raise zipfile.BadZipFile(f"CRC inválido em {info.filename}")
+        os.replace(part, target)
+    except BaseException:
+        if os.path.exists(part): os.remove(part)
+        raise
+    return time.perf_counter() - started
+
+
+def extract_archive(zip_path, out_dir, workers=None, include=None, exclude=None, on_member=None, on_progress=None):
+    """
+    Extrai de `zip_path` para `out_dir` os membros selecionados pelos filtros.
+    on_member(ZipInfo, segundos, erro|None) a cada membro concluído;
+    on_progress(bytes feitos, bytes totais, MB/s) periodicamente.
+    Retorna um dict com members, bytes, seconds e errors [(nome, mensagem)].
+    """
+    workers = workers or os.cpu_count() or 1
+    with zipfile.ZipFile(zip_path) as zf:
+        members = select_members(zf.infolist(), include, exclude)
+    targets = [(info, safe_target(out_dir, info.filename)) for info in members]
+    unsafe = [info.filename for info, target in targets if target is None]
+    if unsafe:
+        raise UnsafeMemberError(f"{len(unsafe)} membro(s) com caminho inseguro: " + ", ".join(unsafe[:5]))
+
+    total = sum(info.file_size for info in members)
+    progress = _Progress(total, on_progress)
+    handles = _Handles(zip_path)
+    errors = []
+    started = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_extract_one, handles, info, target, progress): info
+                       for info, target in sorted(targets, key=lambda t: t[0].file_size, reverse=True)}
+            for future in as_completed(futures):
+                info = futures[future]
+                try:
+                    seconds, error = future.result(), None
+                except Exception as e:
+                    seconds, error = 0.0, str(e)
+                    errors.append((info.filename, error))
+                if on_member: on_member(info, seconds, error)
+    finally:
+        handles.close()
+    if on_progress: on_progress(progress.done, total, progress.mb_per_s)
+    return {"members": len(members), "bytes": progress.done, "seconds": time.perf_counter() - started,
+            "errors": errors}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extrai um ZIP em paralelo, com filtros glob.")
+    parser.add_argument("zip")
+    parser.add_argument("output", nargs="?", default=".")
+    parser.add_argument("--include", action="append", default=[], help="glob a incluir (repetível)")
+    parser.add_argument("--exclude", action="append", default=[], help="glob a excluir (repetível)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--list", action="store_true", help="só lista os membros selecionados")
+    parser.add_argument("-v", "--verbose", action="store_true", help="mostra cada membro extraído")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        with zipfile.ZipFile(args.zip) as zf:
+            for info in select_members(zf.infolist(), args.include, args.exclude):
+                print(f"{format_size(info.file_size):>10}  {info.filename}")
+        return 0
+
+    def on_member(info, seconds, error):
+        if error: print(f"ERRO {info.filename}: {error}", file=sys.stderr)
+        elif args.verbose: print(f"{info.filename} ({format_size(info.file_size)}, {seconds:.2f}s)")
+
+    try:
+        stats = extract_archive(args.zip, args.output, args.workers, args.include, args.exclude, on_member)
+    except UnsafeMemberError as e:
+        print(f"Extração recusada: {e}", file=sys.stderr)
+        return 2
+    secs = stats["seconds"] or 1e-9
+    print(f"{stats['members']} membros, {format_size(stats['bytes'])} em {secs:.1f}s "
+          f"({stats['bytes'] / secs / 1024 ** 2:.1f} MB/s), {len(stats['errors'])} erro(s)")
+    return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Atualização incremental de um ZIP
+
+Ao lado do ZIP fica um manifesto (`<zip>.manifest.json`) com tamanho, mtime
+e CRC32 de cada membro. Numa nova execução:
+ - mesmo tamanho e mtime → membro copiado byte a byte do ZIP anterior
+ - mesmo tamanho, mtime diferente → CRC32 do arquivo recalculado (em
+   paralelo); se bater, também é copiado
+ - arquivos novos ou alterados → comprimidos pela política normal
+ - arquivos que sumiram da pasta → ficam de fora do novo ZIP
+
+O novo ZIP é montado em `<zip>.tmp` e só substitui o anterior no fim, junto
+com o manifesto. Sem ZIP ou manifesto anteriores (ou com full=True) a
+compactação é completa.
+
+Uso:
+  python -m src.utils.zip_incremental C:/evidencias evidencias.zip
+  python -m src.utils.zip_incremental C:/evidencias evidencias.zip --full
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from src.utils.parallel_zip import CHUNK_SIZE, compress_files, scan_folder
+from src.utils.sizes import format_size
+from src.utils.zip_policy import PROFILES, CompressionPolicy
+
+MANIFEST_VERSION = 1
+# membros que sabemos copiar sem descomprimir (nada criptografado)
+COPYABLE_METHODS = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA)
+
+
+def manifest_path_for(zip_path):
+    return zip_path + ".manifest.json"
+
+
+def file_crc32(path, block_size=CHUNK_SIZE):
+    crc = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            crc = zlib.crc32(block, crc)
+    return crc
+
+
+def load_manifest(zip_path):
+    """Manifesto anterior ({nome: {size, mtime_ns, crc32}}), ou {} se não houver ou for inválido."""
+    try:
+        with open(manifest_path_for(zip_path), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get("files", {}) if data.get("version") == MANIFEST_VERSION else {}
+
+
+def save_manifest(zip_path, folder, files):
+    payload = {"version": MANIFEST_VERSION, "folder": os.path.abspath(folder),
+               "created_at": datetime.now().isoformat(timespec="seconds"), "files": files}
+    tmp = manifest_path_for(zip_path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, manifest_path_for(zip_path))
+
+
+def plan_update(files, zip_path, manifest, workers=None):
+    """
+    Separa os arquivos atuais em reaproveitáveis e a comprimir.
+    Devolve ({nome: ZipInfo} a copiar, nomes novos, nomes alterados, nomes removidos).
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        infos = {i.filename: i for i in zf.infolist()}
+    reuse, suspects, added, changed = {}, [], [], []
+    for path, name, st in files:
+        key = name.replace(os.sep, "/")
+        prev, info = manifest.get(key), infos.get(key)
+        if prev is None or info is None:
+            added.append(key)
+        elif (st.st_size != prev["size"] or info.file_size != prev["size"] or info.CRC != prev["crc32"]
+              or info.flag_bits & 0x1 or info.compress_type not in COPYABLE_METHODS):
+            changed.append(key)
+        elif st.st_mtime_ns == prev["mtime_ns"]:
+            reuse[key] = info
+        else:
+            suspects.append((path, key, info))
+    # mtime mudou mas o tamanho não: confere o conteúdo pelo CRC32
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        crcs = pool.map(file_crc32, [path for path, _, _ in suspects])
+        for (path, key, info), crc in zip(suspects, crcs):
+            if crc == info.CRC: reuse[key] = info
+            else: changed.append(key)
+    current = {name.replace(os.sep, "/") for _, name, _ in files}
+    removed = sorted(set(manifest) - current)
+    return reuse, added, changed, removed
+
+
+def update_archive(folder, zip_path, workers=None, policy=None, full=False, on_file=None):
+    """
+    Cria ou atualiza `zip_path` com o conteúdo de `folder`, reaproveitando os
+    membros inalterados do ZIP anterior. Retorna as estatísticas de
+    compress_files acrescidas de reused, added, changed e removed.
+    """
+    started = time.perf_counter()
+    files = scan_folder(folder)
+    manifest = {} if full or not os.path.exists(zip_path) else load_manifest(zip_path)
+    reuse, added, changed, removed = {}, [], [], []
+    if manifest:
+        try:
+            reuse, added, changed, removed = plan_update(files, zip_path, manifest, workers)
+        except zipfile.BadZipFile:
+            manifest = {}
+    if not manifest:
+        added = [name.replace(os.sep, "/") for _, name, _ in files]
+
+    entries = {}
+
+    def collect(entry, decision):
+        entries[entry.name] = entry
+        if on_file: on_file(entry, decision)
+
+    tmp = zip_path + ".tmp"
+    try:
+        stats = compress_files(files, tmp, workers, policy, on_file=collect,
+                               reuse_from=zip_path if reuse else None, reuse=reuse)
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+    os.replace(tmp, zip_path)
+    save_manifest(zip_path, folder, {
+        name.replace(os.sep, "/"): {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                    "crc32": entries[name.replace(os.sep, "/")].crc}
+        for _, name, st in files})
+    stats.update(reused=len(reuse), added=len(added), changed=len(changed), removed=len(removed),
+                 seconds=time.perf_counter() - started)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cria ou atualiza um ZIP recomprimindo só o que mudou.")
+    parser.add_argument("folder")
+    parser.add_argument("output")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--profile", default="balanced", choices=list(PROFILES))
+    parser.add_argument("--full", action="store_true", help="ignora o manifesto e recomprime tudo")
+    args = parser.parse_args(argv)
+    stats = update_archive(args.folder, args.output, args.workers, CompressionPolicy(args.profile), args.full)
+    print(f"{stats['files']} arquivos ({stats['reused']} copiados, {stats['added']} novos, "
+          f"{stats['changed']} alterados, {stats['removed']} removidos) → {format_size(stats['bytes_out'])} "
+          f"em {stats['seconds']:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Política de compressão por arquivo para o compactador
+
+Decide método e nível de cada membro do ZIP:
+ 1. extensão de formato já comprimido (jpg, pdf, xlsx, zip...) → store
+ 2. assinatura (magic bytes) do início do arquivo → store
+ 3. amostra: comprime os primeiros KB com zlib nível 1; se quase não reduz → store;
+    se reduz muito (texto) e houver `text_method`, usa LZMA/BZIP2
+ 4. demais → deflate no nível do perfil
+
+Perfis:
+  fastest  - deflate 1, sem amostra (só extensão e assinatura)
+  balanced - deflate 6 com amostra (padrão)
+  smallest - deflate 9 com amostra; texto em LZMA
+"""
+import collections
+import os
+import zlib
+from zipfile import ZIP_BZIP2, ZIP_DEFLATED, ZIP_LZMA, ZIP_STORED
+
+METHOD_NAMES = {ZIP_STORED: "store", ZIP_DEFLATED: "deflate", ZIP_BZIP2: "bzip2", ZIP_LZMA: "lzma"}
+METHODS = {name: method for method, name in METHOD_NAMES.items()}
+
+COMPRESSED_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".mp3", ".mp4", ".m4a", ".avi", ".mkv", ".mov",
+    ".zip", ".7z", ".rar", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".jar",
+    ".docx", ".xlsx", ".xlsm", ".pptx", ".odt", ".ods", ".pdf",
+}
+
+# (deslocamento, assinatura, nome)
+SIGNATURES = [
+    (0, b"PK\x03\x04", "zip/office"), (0, b"\xff\xd8\xff", "jpeg"), (0, b"\x89PNG", "png"),
+    (0, b"GIF8", "gif"), (0, b"%PDF", "pdf"), (0, b"\x1f\x8b", "gzip"), (0, b"BZh", "bzip2"),
+    (0, b"\xfd7zXZ", "xz"), (0, b"7z\xbc\xaf", "7z"), (0, b"Rar!", "rar"), (0, b"\x28\xb5\x2f\xfd", "zstd"),
+    (0, b"ID3", "mp3"), (4, b"ftyp", "mp4"), (8, b"WEBP", "webp"),
+]
+
+PROFILES = {
+    "fastest": {"level": 1, "trial": False, "text_method": None},
+    "balanced": {"level": 6, "trial": True, "text_method": None},
+    "smallest": {"level": 9, "trial": True, "text_method": ZIP_LZMA},
+}
+
+Decision = collections.namedtuple("Decision", "method level reason")
+
+
+def sniff(head):
+    """Nome do formato comprimido reconhecido pela assinatura, ou None."""
+    for offset, magic, name in SIGNATURES:
+        if head[offset:offset + len(magic)] == magic:
+            return name
+    return None
+
+
+class CompressionPolicy:
+    """
+    profile: "fastest", "balanced" ou "smallest".
+    level: sobrescreve o nível do deflate/bzip2 do perfil.
+    text_method: ZIP_LZMA/ZIP_BZIP2 (ou "lzma"/"bzip2") para arquivos muito compressíveis.
+    """
+
+    def __init__(self, profile="balanced", level=None, text_method=None, sample_size=64 * 1024,
+                 store_ratio=0.9, text_ratio=0.4):
+        if profile not in PROFILES:
+            raise ValueError(f"Perfil inválido: {profile!r}. Use: {', '.join(PROFILES)}")
+        base = PROFILES[profile]
+        self.profile = profile
+        self.level = level if level is not None else base["level"]
+        text_method = METHODS.get(text_method, text_method) if text_method is not None else base["text_method"]
+        self.text_method = None if text_method == ZIP_DEFLATED else text_method
+        self.trial = base["trial"] or self.text_method is not None
+        self.sample_size = sample_size
+        self.store_ratio = store_ratio
+        self.text_ratio = text_ratio
+
+    def __repr__(self):
+        text = f", texto={METHOD_NAMES[self.text_method]}" if self.text_method else ""
+        return f"{self.profile} (nível {self.level}{text})"
+
+    def decide(self, name, head):
+        """Escolhe o método a partir do nome e dos primeiros bytes (`head`) do arquivo."""
+        if not head:
+            return Decision(ZIP_STORED, 0, "vazio")
+        ext = os.path.splitext(name)[1].lower()
+        if ext in COMPRESSED_EXTENSIONS:
+            return Decision(ZIP_STORED, 0, f"extensão {ext}")
+        kind = sniff(head)
+        if kind:
+            return Decision(ZIP_STORED, 0, f"assinatura {kind}")
+        sample = head[:self.sample_size]
+        if self.trial:
+            ratio = len(zlib.compress(sample, 1)) / len(sample)
+            if ratio >= self.store_ratio:
+                return Decision(ZIP_STORED, 0, f"amostra {ratio:.0%}")
+            if self.text_method is not None and ratio <= self.text_ratio:
+                return Decision(self.text_method, self.level, f"texto (amostra {ratio:.0%})")
+            return Decision(ZIP_DEFLATED, self.level, f"amostra {ratio:.0%}")
+        return Decision(ZIP_DEFLATED, self.level, "padrão")
+
+
+def get_policy(policy):
+    """Aceita uma CompressionPolicy, o nome de um perfil ou None (balanced)."""
+    if isinstance(policy, CompressionPolicy):
+        return policy
+    return CompressionPolicy(policy or "balanced")
@@ -0,0 +1,26 @@
+from src.app.metrics import MetricsStore
+
+
+def run(started, wall, peak_rss, returncode, status):
+    return {"started": started, "finished": started + wall, "wall_seconds": wall, "cpu_seconds": wall / 2,
+            "peak_rss": peak_rss}, returncode, status
+
+
+def test_summary_last_returncode_comes_from_newest_run(tmp_path):
+    store = MetricsStore(str(tmp_path / "metrics.sqlite3"))
+    # a execução com mais memória é a antiga; a mais recente falhou
+    for metrics, returncode, status in (run(100, 1.0, 900, 0, "sucesso"),
+                                        run(200, 2.0, 300, 0, "sucesso"),
+                                        run(300, 3.0, 100, 2, "erro")):
+        store.record("a.py", metrics, returncode, status)
+    store.record("b.py", *run(150, 1.0, 0, 0, "sucesso"))
+
+    a, b = store.summary()
+    assert a["script"] == "a.py"
+    assert a["last_started"] == 300
+    assert a["last_returncode"] == 2
+    assert a["peak_rss"] == 900
+    assert (a["runs"], a["failures"]) == (3, 1)
+    assert a["p50_seconds"] == 2.0
+    assert b["peak_rss"] is None
+    assert b["last_returncode"] == 0
@@ -0,0 +1,64 @@
+import multiprocessing
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+pytest.importorskip("pdf2docx")
+
+from pdf2docx import Converter
+from pdf2docx.converter import ConversionException
+from pdf2docx.page.Page import Page
+
+from src.utils import pdf_parallel
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "tres_paginas.pdf"
+    doc = fitz.open()
+    for i in range(3):
+        doc.new_page().insert_text((72, 72), f"Página {i + 1}")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def broken_page_2(monkeypatch):
+    original = Page.parse
+
+    def parse(self, **settings):
+        if self.id == 1: raise RuntimeError("página quebrada")
+        return original(self, **settings)
+
+    monkeypatch.setattr(Page, "parse", parse)
+
+
+def settings(**overrides):
+    options = Converter.__new__(Converter).default_settings
+    options.update(overrides)
+    return options
+
+
+def test_page_with_parse_error_is_skipped(pdf_path, broken_page_2):
+    data, timings = pdf_parallel._parse_chunk(pdf_path, None, [0, 1, 2], settings())
+    assert [page for page, _ in timings] == [1, 3]
+    assert [p["id"] for p in data["pages"]] == [0, 2]
+
+
+def test_page_with_parse_error_raises_without_ignore_page_error(pdf_path, broken_page_2):
+    with pytest.raises(ConversionException, match="página 2"):
+        pdf_parallel._parse_chunk(pdf_path, None, [0, 1, 2], settings(ignore_page_error=False))
+
+
+def test_page_with_parse_error_raw_exceptions(pdf_path, broken_page_2):
+    with pytest.raises(RuntimeError, match="página quebrada"):
+        pdf_parallel._parse_chunk(pdf_path, None, [0, 1, 2], settings(raw_exceptions=True))
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="o Page.parse trocado só chega ao pool com fork")
+def test_conversion_continues_past_broken_page(pdf_path, broken_page_2, tmp_path):
+    output = tmp_path / "saida.docx"
+    timings = pdf_parallel.pdf_to_docx_parallel(pdf_path, str(output), workers=2, chunk_size=1)
+    assert [page for page, _ in timings] == [1, 3]
+    assert output.exists()